@@ -1,5 +1,6 @@
 from datetime import timedelta
 from fastapi import APIRouter, HTTPException, status, Depends, Request
+from app.api.routing import TimedRoute
 from app.models.auth import (
     AdminLogin, AdminLoginSecure, Token, AdminUser, AdminUserCreate, 
     PasswordResetRequest, PasswordResetConfirm, AdminCreationRequest
@@ -13,7 +14,7 @@ from app.middleware.security import track_failed_login, is_login_blocked, verify
 from app.config.settings import settings
 from app.services.auth import hash_password_with_salt
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], route_class=TimedRoute)
 
 @router.post("/login", response_model=Token)
 async def login(admin_login: AdminLogin, request: Request):
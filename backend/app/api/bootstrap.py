@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Request
+from app.api.routing import TimedRoute
+from app.services.bootstrap import bootstrap_service
+from app.services.frontend import asset_response
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"], route_class=TimedRoute)
+
+@router.get("")
+async def get_bootstrap(request: Request):
+    """Homepage content, current litters, available puppies and business schema in one response (public endpoint)"""
+    return asset_response(request, await bootstrap_service.get_asset())
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from typing import Optional, Tuple
 from bson import ObjectId
-from app.models.contact import ContactFormSubmission, ContactFormResponse, ContactInquiry
+from app.api.routing import TimedRoute
+from app.models.contact import ContactFormSubmission, ContactFormResponse, ContactInquiry, ContactInquiryPage
 from app.models.auth import AdminUser
 from app.services.auth import get_current_admin
 from app.services.database import get_database
 from app.services.email import email_service
+from app.services.inquiry_inbox import inquiry_inbox_service, InvalidCursor
+from app.services.contact_filter import contact_filter, ContactRateLimited
+from app.middleware.security import get_client_ip
 from datetime import datetime
-import uuid
+import logging
 
-router = APIRouter(prefix="/contact", tags=["contact"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/contact", tags=["contact"], route_class=TimedRoute)
 
 def serialize_contact(contact_doc) -> dict:
     """Convert MongoDB document to dict with proper ID handling"""
@@ -18,22 +24,26 @@ def serialize_contact(contact_doc) -> dict:
         del contact_doc["_id"]
     return contact_doc
 
-@router.post("/", response_model=ContactFormResponse)
-async def submit_contact_form(contact_form: ContactFormSubmission):
-    """Submit contact form (public endpoint)"""
+async def save_contact_submission(contact_form: ContactFormSubmission) -> Tuple[str, bool]:
+    """Store a submission and send its notification email, returning (id, email_sent)"""
     db = get_database()
     
+    contact_doc = contact_form.dict()
+    contact_doc["submitted_at"] = datetime.now()
+    contact_doc["responded"] = False
     try:
-        # Save to database
-        contact_doc = contact_form.dict()
-        contact_doc["submitted_at"] = datetime.now()
-        contact_doc["responded"] = False
-        
         result = await db.contacts.insert_one(contact_doc)
-        contact_id = str(result.inserted_id)
-        
-        # Send email notification
-        email_sent = False
+    except Exception as e:
+        logger.error(f"Failed to save contact submission: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to process your request. Please try again later."
+        )
+    contact_id = str(result.inserted_id)
+    
+    # The inquiry is saved; a failed notification must not fail (or re-save) it
+    email_sent = False
+    try:
         if contact_form.puppy_name and contact_form.litter_name:
             email_sent = await email_service.send_puppy_inquiry(
                 contact_form.name,
@@ -51,45 +61,70 @@ async def submit_contact_form(contact_form: ContactFormSubmission):
                 contact_form.message,
                 contact_form.puppy_name
             )
-        
-        return ContactFormResponse(
-            id=contact_id,
-            success=True,
-            message="Thank you for your message! We'll get back to you soon." + 
-                   ("" if email_sent else " (Note: Email notification may be delayed.)")
-        )
-        
     except Exception as e:
-        # Still save to database even if email fails
-        try:
-            contact_doc = contact_form.dict()
-            contact_doc["submitted_at"] = datetime.now()
-            contact_doc["responded"] = False
-            result = await db.contacts.insert_one(contact_doc)
-            contact_id = str(result.inserted_id)
-            
-            return ContactFormResponse(
-                id=contact_id,
-                success=True,
-                message="Thank you for your message! We'll get back to you soon."
-            )
-        except:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unable to process your request. Please try again later."
-            )
-
-@router.get("/inquiries", response_model=List[ContactInquiry])
-async def get_contact_inquiries(current_admin: AdminUser = Depends(get_current_admin)):
-    """Get all contact inquiries (admin only)"""
-    db = get_database()
+        logger.error(f"Failed to send contact notification for {contact_id}: {e}")
     
-    contacts_cursor = db.contacts.find().sort("submitted_at", -1)
-    contacts = []
-    async for contact_doc in contacts_cursor:
-        contacts.append(serialize_contact(contact_doc))
+    return contact_id, email_sent
+
+@router.post("/", response_model=ContactFormResponse)
+async def submit_contact_form(contact_form: ContactFormSubmission, request: Request):
+    """Submit contact form (public endpoint).
+
+    Repeats of a recent submission are merged into it, and each email
+    address and client IP may only submit a limited number of new messages
+    per window; neither reaches the database or SMTP.
+    """
+    try:
+        contact_id, email_sent = await contact_filter.submit(
+            contact_form.email,
+            contact_form.message,
+            get_client_ip(request),
+            lambda: save_contact_submission(contact_form)
+        )
+    except ContactRateLimited as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many messages sent recently. Please try again later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     
-    return contacts
+    return ContactFormResponse(
+        id=contact_id,
+        success=True,
+        message="Thank you for your message! We'll get back to you soon." + 
+               ("" if email_sent else " (Note: Email notification may be delayed.)")
+    )
+
+@router.get("/inquiries", response_model=ContactInquiryPage)
+async def get_contact_inquiries(
+    responded: Optional[bool] = None,
+    puppy_name: Optional[str] = None,
+    litter_name: Optional[str] = None,
+    submitted_after: Optional[datetime] = None,
+    submitted_before: Optional[datetime] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(25, ge=1, le=100),
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Page through contact inquiries, newest first (admin only).
+
+    Summaries carry a short message preview; fetch an inquiry by id for the
+    full message. Pass `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        return await inquiry_inbox_service.list(
+            limit=limit,
+            responded=responded,
+            puppy_name=puppy_name,
+            litter_name=litter_name,
+            submitted_after=submitted_after,
+            submitted_before=submitted_before,
+            q=q,
+            cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @router.get("/inquiries/{contact_id}", response_model=ContactInquiry)
 async def get_contact_inquiry(contact_id: str, current_admin: AdminUser = Depends(get_current_admin)):
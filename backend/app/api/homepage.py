@@ -1,20 +1,27 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Request
 from typing import List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
+from app.api.routing import TimedRoute
 from app.models.homepage import (
     HomepageContent, HeroImage, HomepageSection,
     HeroImageCreate, HeroImageUpdate, HomepageSectionCreate, 
-    HomepageSectionUpdate, HomepageContentUpdate
+    HomepageSectionUpdate, HomepageContentUpdate, HeroImageReorder
 )
 from app.models.auth import AdminUser
+from app.models.media import MediaListRemove, MediaListReorder
 from app.services.auth import get_current_admin
 from app.services.database import get_database
-from app.services.cloudflare_r2 import r2_service
+from app.services.frontend import asset_response
+from app.services.homepage_publisher import homepage_publisher, DEFAULT_HOMEPAGE_CONTENT
+from app.services.media import media_service
+from app.services.media_gc import media_gc
+from app.services.media_lists import update_nested_list, without_index, permutation_filter
 from datetime import datetime
 import uuid
 import os
 
-router = APIRouter(prefix="/homepage", tags=["homepage"])
+router = APIRouter(prefix="/homepage", tags=["homepage"], route_class=TimedRoute)
 
 def serialize_homepage_content(doc) -> dict:
     """Convert homepage document to dict"""
@@ -26,71 +33,64 @@ def serialize_homepage_content(doc) -> dict:
     return {}
 
 @router.get("/content")
-async def get_homepage_content():
-    """Get current homepage content (public endpoint)"""
+async def get_homepage_content(request: Request):
+    """Get the published homepage content (public endpoint)"""
+    # Served from the in-memory snapshot; no database read or serialization
+    return asset_response(request, homepage_publisher.asset)
+
+@router.get("/draft")
+async def get_homepage_draft(current_admin: AdminUser = Depends(get_current_admin)):
+    """Get the editable homepage draft with its publish state (admin only)"""
     db = get_database()
-    content_doc = await db.homepage.find_one()
-    
-    if not content_doc:
-        # Return default content if none exists
-        default_content = {
-            "hero_images": [],
-            "sections": [],
-            "meta_title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado | Golden Doodles Near Me | Denver, Utah, Texas",
-            "meta_description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies. Golden doodles near me - Double J's Doodles La Junta CO.",
-            "meta_keywords": "goldendoodle breeder, golden doodles near me, goldendoodle puppies Colorado, goldendoodle breeder Colorado, goldendoodle puppies Denver, goldendoodle Utah, goldendoodle Texas, La Junta Colorado breeder, health tested goldendoodle, home raised puppies",
-            "canonical_url": "https://doublejsdoodles.com",
-            "og_title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado",
-            "og_description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies ready for loving homes.",
-            "og_image": "https://doublejsdoodles.com/logo512.png",
-            "twitter_title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado",
-            "twitter_description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies.",
-            "schema_org": {
-                "@context": "https://schema.org",
-                "@type": "LocalBusiness",
-                "name": "Double J's Doodles",
-                "description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas.",
-                "address": {
-                    "@type": "PostalAddress",
-                    "addressLocality": "La Junta",
-                    "addressRegion": "CO",
-                    "addressCountry": "US"
-                },
-                "areaServed": ["Colorado", "Utah", "Texas", "Denver", "Colorado Springs"]
-            }
-        }
-        return default_content
-    
-    return serialize_homepage_content(content_doc)
+    draft_doc = await db.homepage.find_one()
+    if not draft_doc:
+        return {**DEFAULT_HOMEPAGE_CONTENT, "published_version": homepage_publisher.version, "has_unpublished_changes": False}
+    
+    draft = serialize_homepage_content(draft_doc)
+    published_at = draft_doc.get("published_at")
+    updated_at = draft_doc.get("updated_at")
+    draft["has_unpublished_changes"] = published_at is None or (updated_at is not None and updated_at > published_at)
+    return draft
+
+@router.post("/publish")
+async def publish_homepage(current_admin: AdminUser = Depends(get_current_admin)):
+    """Publish the current draft as a new homepage version (admin only)"""
+    published = await homepage_publisher.publish(current_admin.username)
+    return {**published, "message": f"Homepage version {published['version']} published"}
+
+@router.get("/versions")
+async def get_homepage_versions(limit: int = 20, current_admin: AdminUser = Depends(get_current_admin)):
+    """List published homepage versions, newest first (admin only)"""
+    return await homepage_publisher.list_versions(min(max(limit, 1), 100))
 
 @router.put("/content")
 async def update_homepage_content(
     content_update: HomepageContentUpdate,
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    """Update homepage meta content"""
+    """Update homepage meta content in the draft"""
     db = get_database()
     
     update_data = content_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
     update_data["updated_by"] = current_admin.username
     
-    result = await db.homepage.update_one(
+    updated_doc = await db.homepage.find_one_and_update(
         {},
         {"$set": update_data},
-        upsert=True
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count == 0 and result.upserted_id is None:
+    if not updated_doc:
         raise HTTPException(status_code=500, detail="Failed to update homepage content")
     
-    # Get updated content
-    updated_doc = await db.homepage.find_one()
     return serialize_homepage_content(updated_doc)
 
 @router.post("/hero-images")
 async def upload_hero_image(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    content_hash: Optional[str] = Form(None),
     title: Optional[str] = Form(None),
     subtitle: Optional[str] = Form(None),
     alt_text: str = Form(...),
@@ -102,26 +102,22 @@ async def upload_hero_image(
     
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file and file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed."
         )
     
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    unique_filename = f"homepage/hero/{uuid.uuid4()}{file_extension}"
+    # Store by content hash (reuses an existing object when the same photo was uploaded before)
+    media_doc = await media_service.store_upload_object(file, content_hash, allowed_types)
     
-    # Upload to R2
-    file_content = await file.read()
-    image_url = await r2_service.upload_file(file_content, unique_filename, file.content_type)
-    
-    if not image_url:
+    if not media_doc:
         raise HTTPException(status_code=500, detail="Failed to upload image")
     
     # Create hero image object
     hero_image = HeroImage(
-        image_url=image_url,
+        image_url=media_doc["url"],
+        image_meta=media_service.image_metadata(media_doc),
         title=title,
         subtitle=subtitle,
         alt_text=alt_text,
@@ -143,6 +139,41 @@ async def upload_hero_image(
     
     return {"hero_image": hero_image.dict(), "message": "Hero image uploaded successfully"}
 
+@router.put("/hero-images/order")
+async def reorder_hero_images(
+    reorder: HeroImageReorder,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Set hero image order from a list of ids; unlisted images keep their order after them"""
+    db = get_database()
+    
+    # One pipeline update: each hero's order becomes its position in `ids`
+    updated_doc = await db.homepage.find_one_and_update(
+        {},
+        [{"$set": {
+            "hero_images": {"$map": {
+                "input": "$hero_images",
+                "as": "hero",
+                "in": {"$mergeObjects": ["$$hero", {"order": {"$let": {
+                    "vars": {"position": {"$indexOfArray": [reorder.ids, "$$hero.id"]}},
+                    "in": {"$cond": [
+                        {"$gte": ["$$position", 0]},
+                        "$$position",
+                        {"$add": [len(reorder.ids), {"$ifNull": ["$$hero.order", 0]}]}
+                    ]}
+                }}}]}
+            }},
+            "updated_at": datetime.utcnow(),
+            "updated_by": current_admin.username
+        }}],
+        projection={"hero_images.id": 1, "hero_images.order": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_doc:
+        raise HTTPException(status_code=404, detail="Homepage content not found")
+    
+    return {"hero_images": updated_doc.get("hero_images", []), "message": "Hero images reordered successfully"}
+
 @router.put("/hero-images/{hero_id}")
 async def update_hero_image(
     hero_id: str,
@@ -178,34 +209,26 @@ async def delete_hero_image(
     """Delete hero image"""
     db = get_database()
     
-    # Find and remove the hero image
-    homepage_doc = await db.homepage.find_one({"hero_images.id": hero_id})
-    
-    if not homepage_doc:
-        raise HTTPException(status_code=404, detail="Hero image not found")
-    
-    # Find the specific hero image to get the URL for deletion
-    hero_image = next((img for img in homepage_doc["hero_images"] if img["id"] == hero_id), None)
-    
-    if hero_image and hero_image["image_url"]:
-        # Extract filename from URL for R2 deletion
-        if "/homepage/hero/" in hero_image["image_url"]:
-            filename = hero_image["image_url"].split("/")[-1]
-            filename = f"homepage/hero/{filename}"
-            await r2_service.delete_file(filename)
-    
-    # Remove from database
-    result = await db.homepage.update_one(
-        {},
+    # Remove from database, returning only the removed hero image
+    previous_doc = await db.homepage.find_one_and_update(
+        {"hero_images.id": hero_id},
         {
             "$pull": {"hero_images": {"id": hero_id}},
             "$set": {
                 "updated_at": datetime.utcnow(),
                 "updated_by": current_admin.username
             }
-        }
+        },
+        projection={"hero_images": {"$elemMatch": {"id": hero_id}}}
     )
     
+    if not previous_doc:
+        raise HTTPException(status_code=404, detail="Hero image not found")
+    
+    # R2 object is removed in the background once nothing references it
+    for hero_image in previous_doc.get("hero_images", []):
+        media_gc.schedule_delete(hero_image.get("image_url"))
+    
     return {"message": "Hero image deleted successfully"}
 
 @router.post("/sections")
@@ -267,26 +290,32 @@ async def delete_homepage_section(
     """Delete homepage section"""
     db = get_database()
     
-    result = await db.homepage.update_one(
-        {},
+    previous_doc = await db.homepage.find_one_and_update(
+        {"sections.id": section_id},
         {
             "$pull": {"sections": {"id": section_id}},
             "$set": {
                 "updated_at": datetime.utcnow(),
                 "updated_by": current_admin.username
             }
-        }
+        },
+        projection={"sections": {"$elemMatch": {"id": section_id}}}
     )
     
-    if result.matched_count == 0:
+    if not previous_doc:
         raise HTTPException(status_code=404, detail="Homepage section not found")
     
+    # Section images are removed in the background
+    for section in previous_doc.get("sections", []):
+        media_gc.schedule_delete(*section.get("images", []))
+    
     return {"message": "Homepage section deleted successfully"}
 
 @router.post("/sections/{section_id}/images")
 async def upload_section_image(
     section_id: str,
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    content_hash: Optional[str] = Form(None),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Upload image to homepage section"""
@@ -294,28 +323,23 @@ async def upload_section_image(
     
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file and file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed."
         )
     
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    unique_filename = f"homepage/sections/{section_id}/{uuid.uuid4()}{file_extension}"
-    
-    # Upload to R2
-    file_content = await file.read()
-    image_url = await r2_service.upload_file(file_content, unique_filename, file.content_type)
+    # Store by content hash (reuses an existing object when the same photo was uploaded before)
+    image_url = await media_service.store_upload(file, content_hash, allowed_types)
     
     if not image_url:
         raise HTTPException(status_code=500, detail="Failed to upload image")
     
     # Add image to section
     result = await db.homepage.update_one(
-        {"sections.id": section_id},
+        {"sections": {"$elemMatch": {"id": section_id, "images": {"$ne": image_url}}}},
         {
-            "$push": {"sections.$.images": image_url},
+            "$addToSet": {"sections.$.images": image_url},
             "$set": {
                 "updated_at": datetime.utcnow(),
                 "updated_by": current_admin.username
@@ -324,7 +348,10 @@ async def upload_section_image(
     )
     
     if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Homepage section not found")
+        # Already in the section (or no such section), so the upload's reference is not needed
+        await media_service.release(image_url)
+        if not await db.homepage.find_one({"sections.id": section_id}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Homepage section not found")
     
     return {"image_url": image_url, "message": "Image uploaded successfully"}
 
@@ -332,45 +359,87 @@ async def upload_section_image(
 async def delete_section_image(
     section_id: str,
     image_index: int,
+    url: Optional[str] = None,
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    """Delete image from homepage section"""
+    """Delete image from homepage section.
+
+    Pass `url` to only delete when that image is still at `image_index`.
+    """
     db = get_database()
     
-    # Find the section and validate image index
-    homepage_doc = await db.homepage.find_one({"sections.id": section_id})
-    
-    if not homepage_doc:
-        raise HTTPException(status_code=404, detail="Homepage section not found")
-    
-    section = next((s for s in homepage_doc["sections"] if s["id"] == section_id), None)
+    if image_index < 0:
+        raise HTTPException(status_code=404, detail="Image not found")
     
-    if not section or image_index >= len(section["images"]) or image_index < 0:
+    # Remove the image in one pipeline update, returning the section as it was
+    previous_doc = await db.homepage.find_one_and_update(
+        {"sections": {"$elemMatch": {"id": section_id, f"images.{image_index}": url if url else {"$exists": True}}}},
+        [
+            *update_nested_list("sections", section_id, "images", lambda images: without_index(images, image_index)),
+            {"$set": {"updated_at": datetime.utcnow(), "updated_by": current_admin.username}}
+        ],
+        projection={"sections": {"$elemMatch": {"id": section_id}}}
+    )
+    if not previous_doc:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Get the image URL to delete from R2
-    image_url = section["images"][image_index]
+    image_url = previous_doc["sections"][0]["images"][image_index]
     
-    # Extract filename from URL for R2 deletion
-    if f"/homepage/sections/{section_id}/" in image_url:
-        filename = image_url.split("/")[-1]
-        filename = f"homepage/sections/{section_id}/{filename}"
-        await r2_service.delete_file(filename)
+    # R2 object is removed in the background once nothing references it
+    media_gc.schedule_delete(image_url)
     
-    # Remove image from array
-    await db.homepage.update_one(
+    return {"message": "Image deleted successfully"}
+
+@router.post("/sections/{section_id}/images/remove")
+async def remove_section_images(
+    section_id: str,
+    removal: MediaListRemove,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Remove one or more images from a homepage section by URL"""
+    db = get_database()
+    
+    previous_doc = await db.homepage.find_one_and_update(
         {"sections.id": section_id},
-        {"$unset": {f"sections.$.images.{image_index}": 1}}
+        {
+            "$pull": {"sections.$.images": {"$in": removal.urls}},
+            "$set": {
+                "updated_at": datetime.utcnow(),
+                "updated_by": current_admin.username
+            }
+        },
+        projection={"sections": {"$elemMatch": {"id": section_id}}}
     )
-    await db.homepage.update_one(
-        {"sections.id": section_id},
+    if not previous_doc:
+        raise HTTPException(status_code=404, detail="Homepage section not found")
+    
+    removed = [url for url in previous_doc["sections"][0].get("images", []) if url in removal.urls]
+    media_gc.schedule_delete(*removed)
+    
+    return {"removed": removed, "message": f"Removed {len(removed)} image(s)"}
+
+@router.put("/sections/{section_id}/images/order")
+async def reorder_section_images(
+    section_id: str,
+    reorder: MediaListReorder,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Reorder a section's images; `urls` must list exactly the current images"""
+    db = get_database()
+    
+    result = await db.homepage.update_one(
+        {"sections": {"$elemMatch": {"id": section_id, **permutation_filter("images", reorder.urls)}}},
         {
-            "$pull": {"sections.$.images": None},
             "$set": {
+                "sections.$.images": reorder.urls,
                 "updated_at": datetime.utcnow(),
                 "updated_by": current_admin.username
             }
         }
     )
+    if result.matched_count == 0:
+        if not await db.homepage.find_one({"sections.id": section_id}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Homepage section not found")
+        raise HTTPException(status_code=409, detail="Images changed since they were loaded; reload and try again")
     
-    return {"message": "Image deleted successfully"} 
\ No newline at end of file
+    return {"images": reorder.urls, "message": "Images reordered successfully"}
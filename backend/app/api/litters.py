@@ -1,16 +1,20 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from typing import List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
+from app.api.routing import TimedRoute
 from app.models.litter import Litter, LitterCreate, LitterUpdate, Puppy, PuppyCreate, PuppyUpdate
 from app.models.auth import AdminUser
 from app.services.auth import get_current_admin
 from app.services.database import get_database
-from app.services.cloudflare_r2 import r2_service
+from app.services.media import media_service
+from app.services.media_gc import media_gc, collect_litter_media_urls, LITTER_MEDIA_PROJECTION
+from app.services.active_litter import active_litter_service, ActiveLitterConflict
 from datetime import datetime
 import uuid
 import os
 
-router = APIRouter(prefix="/litters", tags=["litters"])
+router = APIRouter(prefix="/litters", tags=["litters"], route_class=TimedRoute)
 
 def serialize_litter(litter_doc) -> dict:
     """Convert MongoDB document to dict with proper ID handling"""
@@ -24,6 +28,20 @@ def serialize_litter(litter_doc) -> dict:
                 del puppy["_id"]
     return litter_doc
 
+def active_litter_conflict(conflict: ActiveLitterConflict) -> HTTPException:
+    """409 response naming the litter that is already current"""
+    existing = conflict.existing_litter
+    return HTTPException(
+        status_code=409, 
+        detail={
+            "message": "A current/active litter already exists",
+            "existing_litter": {
+                "id": str(existing["_id"]),
+                "name": existing["name"]
+            } if existing else None
+        }
+    )
+
 @router.get("/", response_model=List[Litter])
 async def get_all_litters():
     """Get all litters (public endpoint)"""
@@ -37,27 +55,14 @@ async def get_all_litters():
 @router.get("/current", response_model=List[Litter])
 async def get_current_litters():
     """Get only current litters (public endpoint)"""
-    db = get_database()
-    litters_cursor = db.litters.find({"is_current": True})
-    litters = []
-    async for litter_doc in litters_cursor:
-        litters.append(serialize_litter(litter_doc))
-    return litters
-
-@router.get("/{litter_id}", response_model=Litter)
-async def get_litter(litter_id: str):
-    """Get specific litter by ID (public endpoint)"""
-    db = get_database()
-    litter_doc = await db.litters.find_one({"_id": ObjectId(litter_id)})
-    if not litter_doc:
-        raise HTTPException(status_code=404, detail="Litter not found")
-    return serialize_litter(litter_doc)
+    # The unique partial index guarantees at most one result
+    litter_doc = await active_litter_service.find_active()
+    return [serialize_litter(litter_doc)] if litter_doc else []
 
 @router.get("/check-active")
 async def check_active_litter():
     """Check if an active litter exists (public endpoint)"""
-    db = get_database()
-    existing_current = await db.litters.find_one({"is_current": True})
+    existing_current = await active_litter_service.find_active({"name": 1})
     if existing_current:
         return {
             "has_active_litter": True,
@@ -68,84 +73,42 @@ async def check_active_litter():
         }
     return {"has_active_litter": False}
 
+@router.get("/{litter_id}", response_model=Litter)
+async def get_litter(litter_id: str):
+    """Get specific litter by ID (public endpoint)"""
+    db = get_database()
+    litter_doc = await db.litters.find_one({"_id": ObjectId(litter_id)})
+    if not litter_doc:
+        raise HTTPException(status_code=404, detail="Litter not found")
+    return serialize_litter(litter_doc)
+
 @router.post("/make-active/{litter_id}")
 async def make_litter_active(litter_id: str, force: bool = False, current_admin: AdminUser = Depends(get_current_admin)):
     """Make a litter active, optionally deactivating others"""
-    db = get_database()
-    
-    # Check if litter exists
-    target_litter = await db.litters.find_one({"_id": ObjectId(litter_id)})
-    if not target_litter:
+    # One write: the unique index rejects it if another litter is current
+    try:
+        updated_litter = await active_litter_service.activate(ObjectId(litter_id), force=force)
+    except ActiveLitterConflict as conflict:
+        raise active_litter_conflict(conflict)
+    if not updated_litter:
         raise HTTPException(status_code=404, detail="Litter not found")
     
-    # If force is True, deactivate all other litters first
-    if force:
-        await db.litters.update_many(
-            {"_id": {"$ne": ObjectId(litter_id)}},
-            {"$set": {"is_current": False, "updated_at": datetime.now()}}
-        )
-    else:
-        # Check if another current litter exists
-        existing_current = await db.litters.find_one({
-            "is_current": True, 
-            "_id": {"$ne": ObjectId(litter_id)}
-        })
-        if existing_current:
-            raise HTTPException(
-                status_code=409, 
-                detail={
-                    "message": "A current/active litter already exists",
-                    "existing_litter": {
-                        "id": str(existing_current["_id"]),
-                        "name": existing_current["name"]
-                    }
-                }
-            )
-    
-    # Make the target litter active
-    await db.litters.update_one(
-        {"_id": ObjectId(litter_id)},
-        {"$set": {"is_current": True, "updated_at": datetime.now()}}
-    )
-    
-    # Return updated litter
-    updated_litter = await db.litters.find_one({"_id": ObjectId(litter_id)})
     return serialize_litter(updated_litter)
 
 @router.post("/", response_model=Litter)
 async def create_litter(litter: LitterCreate, force_active: bool = False, current_admin: AdminUser = Depends(get_current_admin)):
     """Create new litter (admin only)"""
-    db = get_database()
-    
-    # If creating a current litter, check if another current litter exists
-    if litter.is_current and not force_active:
-        existing_current = await db.litters.find_one({"is_current": True})
-        if existing_current:
-            raise HTTPException(
-                status_code=409, 
-                detail={
-                    "message": "A current/active litter already exists",
-                    "existing_litter": {
-                        "id": str(existing_current["_id"]),
-                        "name": existing_current["name"]
-                    }
-                }
-            )
-    
-    # If force_active is True, deactivate all other litters
-    if litter.is_current and force_active:
-        await db.litters.update_many(
-            {},
-            {"$set": {"is_current": False, "updated_at": datetime.now()}}
-        )
-    
     litter_doc = litter.dict()
     litter_doc["created_at"] = datetime.now()
     litter_doc["updated_at"] = datetime.now()
     litter_doc["puppies"] = []
     
-    result = await db.litters.insert_one(litter_doc)
-    litter_doc["id"] = str(result.inserted_id)
+    # A current litter is rejected by the unique index unless force_active clears the old one
+    try:
+        inserted_id = await active_litter_service.insert(litter_doc, force=force_active)
+    except ActiveLitterConflict as conflict:
+        raise active_litter_conflict(conflict)
+    litter_doc["id"] = str(inserted_id)
     del litter_doc["_id"]
     
     return litter_doc
@@ -155,48 +118,28 @@ async def update_litter(litter_id: str, litter_update: LitterUpdate, force_activ
     """Update litter (admin only)"""
     db = get_database()
     
-    # Check if litter exists
-    existing_litter = await db.litters.find_one({"_id": ObjectId(litter_id)})
-    if not existing_litter:
-        raise HTTPException(status_code=404, detail="Litter not found")
-    
     # Prepare update data
     update_data = {k: v for k, v in litter_update.dict(exclude_unset=True).items() if v is not None}
     update_data["updated_at"] = datetime.now()
     
-    # If updating to current, check if another current litter exists
-    if update_data.get("is_current") == True and not force_active:
-        existing_current = await db.litters.find_one({
-            "is_current": True, 
-            "_id": {"$ne": ObjectId(litter_id)}
-        })
-        if existing_current:
-            raise HTTPException(
-                status_code=409, 
-                detail={
-                    "message": "A current/active litter already exists",
-                    "existing_litter": {
-                        "id": str(existing_current["_id"]),
-                        "name": existing_current["name"]
-                    }
-                }
+    if update_data.get("is_current") == True:
+        # Activation goes through the unique index instead of a scan for other current litters
+        try:
+            updated_litter = await active_litter_service.activate(
+                ObjectId(litter_id), force=force_active, update=update_data
             )
-    
-    # If force_active is True and making this litter current, deactivate all others
-    if update_data.get("is_current") == True and force_active:
-        await db.litters.update_many(
-            {"_id": {"$ne": ObjectId(litter_id)}},
-            {"$set": {"is_current": False, "updated_at": datetime.now()}}
+        except ActiveLitterConflict as conflict:
+            raise active_litter_conflict(conflict)
+    else:
+        # Update litter; a missing litter matches nothing
+        updated_litter = await db.litters.find_one_and_update(
+            {"_id": ObjectId(litter_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
         )
+    if not updated_litter:
+        raise HTTPException(status_code=404, detail="Litter not found")
     
-    # Update litter
-    await db.litters.update_one(
-        {"_id": ObjectId(litter_id)},
-        {"$set": update_data}
-    )
-    
-    # Return updated litter
-    updated_litter = await db.litters.find_one({"_id": ObjectId(litter_id)})
     return serialize_litter(updated_litter)
 
 @router.delete("/{litter_id}")
@@ -204,10 +147,16 @@ async def delete_litter(litter_id: str, current_admin: AdminUser = Depends(get_c
     """Delete litter (admin only)"""
     db = get_database()
     
-    result = await db.litters.delete_one({"_id": ObjectId(litter_id)})
-    if result.deleted_count == 0:
+    deleted_litter = await db.litters.find_one_and_delete(
+        {"_id": ObjectId(litter_id)},
+        projection=LITTER_MEDIA_PROJECTION
+    )
+    if not deleted_litter:
         raise HTTPException(status_code=404, detail="Litter not found")
     
+    # Parent and puppy media are removed from R2 in the background
+    media_gc.schedule_delete(*collect_litter_media_urls(deleted_litter))
+    
     return {"message": "Litter deleted successfully"}
 
 @router.post("/{litter_id}/puppies", response_model=Puppy)
@@ -224,6 +173,7 @@ async def add_puppy_to_litter(litter_id: str, puppy: PuppyCreate, current_admin:
     puppy_doc = puppy.dict()
     puppy_doc["id"] = str(uuid.uuid4())
     puppy_doc["images"] = []
+    puppy_doc["image_meta"] = []
     puppy_doc["videos"] = []
     
     # Add puppy to litter
@@ -247,43 +197,45 @@ async def update_puppy(litter_id: str, puppy_id: str, puppy_update: PuppyUpdate,
     for key, value in update_data.items():
         update_query[f"puppies.$.{key}"] = value
     
-    # Update puppy
-    result = await db.litters.update_one(
+    update_query["updated_at"] = datetime.now()
+    
+    # Update puppy, returning only the updated puppy
+    updated_litter = await db.litters.find_one_and_update(
         {"_id": ObjectId(litter_id), "puppies.id": puppy_id},
-        {"$set": update_query}
+        {"$set": update_query},
+        projection={"puppies": {"$elemMatch": {"id": puppy_id}}},
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count == 0:
+    if not updated_litter:
         raise HTTPException(status_code=404, detail="Litter or puppy not found")
     
-    # Return updated puppy
-    litter = await db.litters.find_one({"_id": ObjectId(litter_id)})
-    puppy = next((p for p in litter["puppies"] if p["id"] == puppy_id), None)
-    
-    if not puppy:
-        raise HTTPException(status_code=404, detail="Puppy not found")
-    
-    return puppy
+    return updated_litter["puppies"][0]
 
 @router.delete("/{litter_id}/puppies/{puppy_id}")
 async def delete_puppy(litter_id: str, puppy_id: str, current_admin: AdminUser = Depends(get_current_admin)):
     """Delete puppy from litter (admin only)"""
     db = get_database()
     
-    result = await db.litters.update_one(
+    previous_litter = await db.litters.find_one_and_update(
         {"_id": ObjectId(litter_id)},
-        {"$pull": {"puppies": {"id": puppy_id}}, "$set": {"updated_at": datetime.now()}}
+        {"$pull": {"puppies": {"id": puppy_id}}, "$set": {"updated_at": datetime.now()}},
+        projection={"puppies": {"$elemMatch": {"id": puppy_id}}}
     )
     
-    if result.matched_count == 0:
+    if not previous_litter:
         raise HTTPException(status_code=404, detail="Litter not found")
     
+    # The removed puppy's media is cleaned up in the background
+    media_gc.schedule_delete(*collect_litter_media_urls(previous_litter))
+    
     return {"message": "Puppy deleted successfully"}
 
 @router.post("/{litter_id}/mother/image")
 async def upload_mother_image(
     litter_id: str,
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    content_hash: Optional[str] = Form(None),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Upload image for litter's mother"""
@@ -296,35 +248,41 @@ async def upload_mother_image(
     
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file and file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed."
         )
     
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    unique_filename = f"parents/{litter_id}/mother_{uuid.uuid4()}{file_extension}"
+    # Store by content hash (reuses an existing object when the same photo was uploaded before)
+    media_doc = await media_service.store_upload_object(file, content_hash, allowed_types)
     
-    # Upload to R2
-    file_content = await file.read()
-    image_url = await r2_service.upload_file(file_content, unique_filename, file.content_type)
-    
-    if not image_url:
+    if not media_doc:
         raise HTTPException(status_code=500, detail="Failed to upload image")
+    image_url = media_doc["url"]
+    image_meta = media_service.image_metadata(media_doc)
     
-    # Update mother's image_url
+    # Update mother's image_url and image_meta
     await db.litters.update_one(
         {"_id": ObjectId(litter_id)},
-        {"$set": {"mother.image_url": image_url, "updated_at": datetime.now()}}
+        {"$set": {"mother.image_url": image_url, "mother.image_meta": image_meta, "updated_at": datetime.now()}}
     )
     
-    return {"image_url": image_url, "message": "Mother image uploaded successfully"}
+    # The replaced image is released in the background
+    previous_image_url = existing_litter.get("mother", {}).get("image_url")
+    if previous_image_url and previous_image_url != image_url:
+        media_gc.schedule_delete(previous_image_url)
+    elif previous_image_url == image_url:
+        # The same photo again; the existing reference already covers it
+        await media_service.release(image_url)
+    
+    return {"image_url": image_url, "image_meta": image_meta, "message": "Mother image uploaded successfully"}
 
 @router.post("/{litter_id}/father/image")
 async def upload_father_image(
     litter_id: str,
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    content_hash: Optional[str] = Form(None),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Upload image for litter's father"""
@@ -337,30 +295,35 @@ async def upload_father_image(
     
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file and file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed."
         )
     
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    unique_filename = f"parents/{litter_id}/father_{uuid.uuid4()}{file_extension}"
+    # Store by content hash (reuses an existing object when the same photo was uploaded before)
+    media_doc = await media_service.store_upload_object(file, content_hash, allowed_types)
     
-    # Upload to R2
-    file_content = await file.read()
-    image_url = await r2_service.upload_file(file_content, unique_filename, file.content_type)
-    
-    if not image_url:
+    if not media_doc:
         raise HTTPException(status_code=500, detail="Failed to upload image")
+    image_url = media_doc["url"]
+    image_meta = media_service.image_metadata(media_doc)
     
-    # Update father's image_url
+    # Update father's image_url and image_meta
     await db.litters.update_one(
         {"_id": ObjectId(litter_id)},
-        {"$set": {"father.image_url": image_url, "updated_at": datetime.now()}}
+        {"$set": {"father.image_url": image_url, "father.image_meta": image_meta, "updated_at": datetime.now()}}
     )
     
-    return {"image_url": image_url, "message": "Father image uploaded successfully"}
+    # The replaced image is released in the background
+    previous_image_url = existing_litter.get("father", {}).get("image_url")
+    if previous_image_url and previous_image_url != image_url:
+        media_gc.schedule_delete(previous_image_url)
+    elif previous_image_url == image_url:
+        # The same photo again; the existing reference already covers it
+        await media_service.release(image_url)
+    
+    return {"image_url": image_url, "image_meta": image_meta, "message": "Father image uploaded successfully"}
 
 @router.delete("/{litter_id}/mother/image")
 async def delete_mother_image(
@@ -379,17 +342,16 @@ async def delete_mother_image(
     if not mother_image_url:
         raise HTTPException(status_code=404, detail="Mother image not found")
     
-    # Extract filename from URL for R2 deletion
-    if "/parents/" in mother_image_url:
-        filename = mother_image_url.split("doublejsdoodles/")[-1]  # Get everything after bucket name
-        await r2_service.delete_file(filename)
     
     # Remove image_url from mother
     await db.litters.update_one(
         {"_id": ObjectId(litter_id)},
-        {"$unset": {"mother.image_url": ""}, "$set": {"updated_at": datetime.now()}}
+        {"$unset": {"mother.image_url": "", "mother.image_meta": ""}, "$set": {"updated_at": datetime.now()}}
     )
     
+    # R2 object is removed in the background once nothing references it
+    media_gc.schedule_delete(mother_image_url)
+    
     return {"message": "Mother image deleted successfully"}
 
 @router.delete("/{litter_id}/father/image")
@@ -409,15 +371,14 @@ async def delete_father_image(
     if not father_image_url:
         raise HTTPException(status_code=404, detail="Father image not found")
     
-    # Extract filename from URL for R2 deletion
-    if "/parents/" in father_image_url:
-        filename = father_image_url.split("doublejsdoodles/")[-1]  # Get everything after bucket name
-        await r2_service.delete_file(filename)
     
     # Remove image_url from father
     await db.litters.update_one(
         {"_id": ObjectId(litter_id)},
-        {"$unset": {"father.image_url": ""}, "$set": {"updated_at": datetime.now()}}
+        {"$unset": {"father.image_url": "", "father.image_meta": ""}, "$set": {"updated_at": datetime.now()}}
     )
     
+    # R2 object is removed in the background once nothing references it
+    media_gc.schedule_delete(father_image_url)
+    
     return {"message": "Father image deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from app.api.routing import TimedRoute
+from app.models.auth import AdminUser
+from app.models.media import MediaHashCheck, MediaHashCheckResponse
+from app.services.auth import get_current_admin
+from app.services.media import media_service
+from app.services.media_gc import media_gc
+
+router = APIRouter(prefix="/media", tags=["media"], route_class=TimedRoute)
+
+@router.post("/check", response_model=MediaHashCheckResponse)
+async def check_media_hashes(
+    hash_check: MediaHashCheck,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Report which content hashes are already stored so clients can skip uploading them"""
+    hashes = [h.lower() for h in hash_check.hashes]
+    existing = await media_service.find_existing(hashes)
+    return {
+        "existing": {h: media["url"] for h, media in existing.items()},
+        "missing": [h for h in hashes if h not in existing]
+    }
+
+@router.get("/gc")
+async def get_media_gc_status(current_admin: AdminUser = Depends(get_current_admin)):
+    """Report media garbage collector progress (admin only)"""
+    return media_gc.status()
+
+@router.post("/gc/sweep")
+async def run_media_gc_sweep(current_admin: AdminUser = Depends(get_current_admin)):
+    """Reconcile R2 against stored documents and delete orphans (admin only)"""
+    deleted = await media_gc.sweep()
+    return {"deleted": len(deleted), "message": "Media sweep completed"}
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials
+from app.api.routing import TimedRoute
+from app.config.settings import settings
+from app.models.auth import AdminUser
+from app.services.auth import get_current_admin, security
+from app.services.metrics import registry
+from app.services.slow_query_log import slow_query_log
+import hmac
+
+router = APIRouter(tags=["metrics"], route_class=TimedRoute)
+
+async def authorize_scrape(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Accept the dedicated scrape token when configured, otherwise require an admin session"""
+    if settings.METRICS_TOKEN and hmac.compare_digest(credentials.credentials.encode(), settings.METRICS_TOKEN.encode()):
+        return
+    await get_current_admin(credentials)
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(authorize_scrape)])
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/metrics/slow-queries", response_model=dict)
+async def slow_queries(current_admin: AdminUser = Depends(get_current_admin)):
+    """Recent MongoDB commands over the slow query threshold, newest first, with any plan findings (admin only)"""
+    return {"threshold_ms": slow_query_log.threshold_ms, "queries": slow_query_log.recent()}
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Query
+from typing import List, Literal, Optional
 from bson import ObjectId
-from app.models.litter import Puppy, PuppyCreate, PuppyUpdate, PuppyStatus
+from pymongo import ReturnDocument
+from app.api.routing import TimedRoute
+from app.models.litter import Puppy, PuppyCreate, PuppyUpdate, PuppyStatus, PuppyBulkRequest, PuppyBulkResult
 from app.models.auth import AdminUser
+from app.models.media import MediaListRemove, MediaListReorder
 from app.services.auth import get_current_admin
 from app.services.database import get_database
-from app.services.cloudflare_r2 import r2_service
+from app.services.media import media_service
+from app.services.media_gc import media_gc
+from app.services.media_lists import update_nested_fields, without_index, without_url, permutation_filter
+from app.services.video_processing import video_processing_service
+from app.services.puppy_catalog import puppy_catalog_service, LITTER_SUMMARY_PROJECTION
 from datetime import datetime
 import uuid
 import os
 
-router = APIRouter(prefix="/puppies", tags=["puppies"])
+router = APIRouter(prefix="/puppies", tags=["puppies"], route_class=TimedRoute)
 
 def serialize_puppy_with_litter(puppy_doc, litter_doc) -> dict:
     """Convert puppy document to dict with litter information"""
@@ -30,47 +37,53 @@ async def get_all_puppies(
     limit: int = 50
 ):
     """Get all puppies with optional filtering by status or litter"""
-    db = get_database()
-    
-    # Build match criteria
-    match_criteria = {}
-    if litter_id:
-        match_criteria["_id"] = ObjectId(litter_id)
-    
-    # Aggregation pipeline to flatten puppies from all litters
-    pipeline = [
-        {"$match": match_criteria},
-        {"$unwind": "$puppies"},
-        {"$replaceRoot": {
-            "newRoot": {
-                "$mergeObjects": [
-                    "$puppies",
-                    {
-                        "litter": {
-                            "id": {"$toString": "$_id"},
-                            "name": "$name",
-                            "breed": "$breed",
-                            "generation": "$generation"
-                        }
-                    }
-                ]
-            }
-        }}
-    ]
-    
-    # Add status filter if provided
-    if status:
-        pipeline.append({"$match": {"status": status}})
-    
-    # Add limit
-    pipeline.append({"$limit": limit})
-    
-    cursor = db.litters.aggregate(pipeline)
-    puppies = []
-    async for puppy_doc in cursor:
-        puppies.append(puppy_doc)
-    
-    return puppies
+    return await puppy_catalog_service.list_puppies(status=status, litter_id=litter_id, limit=limit)
+
+@router.get("/search", response_model=dict)
+async def search_puppies(
+    breed: Optional[List[str]] = Query(None),
+    generation: Optional[List[str]] = Query(None),
+    gender: Optional[List[str]] = Query(None),
+    color: Optional[List[str]] = Query(None),
+    status: Optional[List[PuppyStatus]] = Query(None),
+    born_after: Optional[datetime] = None,
+    born_before: Optional[datetime] = None,
+    litter_id: Optional[str] = None,
+    sort_by: Literal["birth_date", "name", "status"] = "birth_date",
+    sort_order: Literal["asc", "desc"] = "desc",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """Faceted puppy search: matching puppies plus per-facet counts.
+
+    Repeat a filter parameter to match any of several values, e.g.
+    `?color=Red&color=Apricot`.
+    """
+    return await puppy_catalog_service.search(
+        breed=breed,
+        generation=generation,
+        gender=gender,
+        color=color,
+        status=[s.value for s in status] if status else None,
+        born_after=born_after,
+        born_before=born_before,
+        litter_id=litter_id,
+        sort_by=sort_by,
+        descending=sort_order == "desc",
+        skip=skip,
+        limit=limit
+    )
+
+@router.post("/bulk", response_model=List[PuppyBulkResult])
+async def bulk_puppy_operations(
+    bulk_request: PuppyBulkRequest,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Create, update and change status of many puppies in one request (admin only).
+
+    Items are applied independently; each gets its own result in request order.
+    """
+    return await puppy_catalog_service.bulk_apply(bulk_request.operations)
 
 @router.get("/available", response_model=List[dict])
 async def get_available_puppies():
@@ -80,15 +93,7 @@ async def get_available_puppies():
 @router.get("/{puppy_id}", response_model=dict)
 async def get_puppy(puppy_id: str):
     """Get specific puppy by ID across all litters"""
-    db = get_database()
-    
-    # Find the litter containing this puppy
-    litter_doc = await db.litters.find_one({"puppies.id": puppy_id})
-    if not litter_doc:
-        raise HTTPException(status_code=404, detail="Puppy not found")
-    
-    # Find the specific puppy
-    puppy = next((p for p in litter_doc["puppies"] if p["id"] == puppy_id), None)
+    litter_doc, puppy = await puppy_catalog_service.find_puppy(puppy_id)
     if not puppy:
         raise HTTPException(status_code=404, detail="Puppy not found")
     
@@ -103,11 +108,6 @@ async def update_puppy(
     """Update puppy across any litter"""
     db = get_database()
     
-    # Find the litter containing this puppy
-    litter_doc = await db.litters.find_one({"puppies.id": puppy_id})
-    if not litter_doc:
-        raise HTTPException(status_code=404, detail="Puppy not found")
-    
     # Prepare update data
     update_data = {k: v for k, v in puppy_update.dict(exclude_unset=True).items() if v is not None}
     
@@ -116,139 +116,213 @@ async def update_puppy(
     for key, value in update_data.items():
         update_query[f"puppies.$.{key}"] = value
     
-    # Update puppy
-    await db.litters.update_one(
-        {"_id": litter_doc["_id"], "puppies.id": puppy_id},
-        {"$set": update_query}
-    )
+    update_query["updated_at"] = datetime.now()
     
-    # Return updated puppy
-    updated_litter = await db.litters.find_one({"_id": litter_doc["_id"]})
-    updated_puppy = next((p for p in updated_litter["puppies"] if p["id"] == puppy_id), None)
+    # Update puppy, returning the litter summary and only the updated puppy
+    updated_litter = await db.litters.find_one_and_update(
+        {"puppies.id": puppy_id},
+        {"$set": update_query},
+        projection={**LITTER_SUMMARY_PROJECTION, "puppies": {"$elemMatch": {"id": puppy_id}}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_litter:
+        raise HTTPException(status_code=404, detail="Puppy not found")
     
-    return serialize_puppy_with_litter(updated_puppy, updated_litter)
+    return serialize_puppy_with_litter(updated_litter["puppies"][0], updated_litter)
 
 @router.post("/{puppy_id}/images")
 async def upload_puppy_image(
     puppy_id: str,
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    content_hash: Optional[str] = Form(None),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Upload image for a specific puppy"""
     db = get_database()
     
     # Find the litter containing this puppy
-    litter_doc = await db.litters.find_one({"puppies.id": puppy_id})
-    if not litter_doc:
+    litter_id = await puppy_catalog_service.find_litter_id(puppy_id)
+    if not litter_id:
         raise HTTPException(status_code=404, detail="Puppy not found")
     
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file and file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed."
         )
     
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    unique_filename = f"puppies/{puppy_id}/{uuid.uuid4()}{file_extension}"
-    
-    # Upload to R2
-    file_content = await file.read()
-    image_url = await r2_service.upload_file(file_content, unique_filename, file.content_type)
+    # Store by content hash (reuses an existing object when the same photo was uploaded before)
+    media_doc = await media_service.store_upload_object(file, content_hash, allowed_types)
     
-    if not image_url:
+    if not media_doc:
         raise HTTPException(status_code=500, detail="Failed to upload image")
-    
-    # Add image URL to puppy's images array
-    await db.litters.update_one(
-        {"_id": litter_doc["_id"], "puppies.id": puppy_id},
-        {"$push": {"puppies.$.images": image_url}}
+    image_url = media_doc["url"]
+    image_meta = media_service.image_metadata(media_doc)
+    
+    # Add image URL (and its metadata) to the puppy; metadata for an object never changes, so $addToSet dedupes it too
+    additions = {"puppies.$.images": image_url}
+    if image_meta:
+        additions["puppies.$.image_meta"] = image_meta
+    result = await db.litters.update_one(
+        {"_id": litter_id, "puppies": {"$elemMatch": {"id": puppy_id, "images": {"$ne": image_url}}}},
+        {"$addToSet": additions}
     )
+    if result.matched_count == 0:
+        # Already on the puppy (or the puppy is gone), so the upload's reference is not needed
+        await media_service.release(image_url)
     
-    return {"image_url": image_url, "message": "Image uploaded successfully"}
+    return {"image_url": image_url, "image_meta": image_meta, "message": "Image uploaded successfully"}
 
 @router.delete("/{puppy_id}/images/{image_index}")
 async def delete_puppy_image(
     puppy_id: str,
     image_index: int,
+    url: Optional[str] = None,
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    """Delete specific image from puppy's images array"""
+    """Delete specific image from puppy's images array.
+
+    Pass `url` to only delete when that image is still at `image_index`.
+    """
     db = get_database()
     
-    # Find the litter containing this puppy
-    litter_doc = await db.litters.find_one({"puppies.id": puppy_id})
-    if not litter_doc:
-        raise HTTPException(status_code=404, detail="Puppy not found")
+    if image_index < 0:
+        raise HTTPException(status_code=404, detail="Image not found")
     
-    # Find the puppy and validate image index
-    puppy = next((p for p in litter_doc["puppies"] if p["id"] == puppy_id), None)
-    if not puppy or image_index >= len(puppy["images"]) or image_index < 0:
+    # Remove the image in one pipeline update, returning the puppy as it was
+    previous_litter = await db.litters.find_one_and_update(
+        {"puppies": {"$elemMatch": {"id": puppy_id, f"images.{image_index}": url if url else {"$exists": True}}}},
+        [
+            *update_nested_fields("puppies", puppy_id, {
+                "images": lambda item: without_index(f"{item}.images", image_index),
+                "image_meta": lambda item: without_url(f"{item}.image_meta", {"$arrayElemAt": [f"{item}.images", image_index]})
+            }),
+            {"$set": {"updated_at": datetime.now()}}
+        ],
+        projection={"puppies": {"$elemMatch": {"id": puppy_id}}}
+    )
+    if not previous_litter:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Get the image URL to delete from R2
-    image_url = puppy["images"][image_index]
+    image_url = previous_litter["puppies"][0]["images"][image_index]
     
-    # Extract filename from URL for R2 deletion
-    if "/puppies/" in image_url:
-        filename = image_url.split("/")[-2:]  # Get last two parts: puppy_id/filename
-        filename = f"puppies/{'/'.join(filename)}"
-        await r2_service.delete_file(filename)
+    # R2 object is removed in the background once nothing references it
+    media_gc.schedule_delete(image_url)
+    
+    return {"message": "Image deleted successfully"}
+
+@router.post("/{puppy_id}/images/remove")
+async def remove_puppy_images(
+    puppy_id: str,
+    removal: MediaListRemove,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Remove one or more images from a puppy by URL"""
+    db = get_database()
     
-    # Remove image from array using $unset and $pull
-    await db.litters.update_one(
-        {"_id": litter_doc["_id"], "puppies.id": puppy_id},
-        {"$unset": {f"puppies.$.images.{image_index}": 1}}
+    previous_litter = await db.litters.find_one_and_update(
+        {"puppies.id": puppy_id},
+        {
+            "$pull": {"puppies.$.images": {"$in": removal.urls}, "puppies.$.image_meta": {"url": {"$in": removal.urls}}},
+            "$set": {"updated_at": datetime.now()}
+        },
+        projection={"puppies": {"$elemMatch": {"id": puppy_id}}}
     )
-    await db.litters.update_one(
-        {"_id": litter_doc["_id"], "puppies.id": puppy_id},
-        {"$pull": {"puppies.$.images": None}}
+    if not previous_litter:
+        raise HTTPException(status_code=404, detail="Puppy not found")
+    
+    removed = [url for url in previous_litter["puppies"][0].get("images", []) if url in removal.urls]
+    media_gc.schedule_delete(*removed)
+    
+    return {"removed": removed, "message": f"Removed {len(removed)} image(s)"}
+
+@router.put("/{puppy_id}/images/order")
+async def reorder_puppy_images(
+    puppy_id: str,
+    reorder: MediaListReorder,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Reorder a puppy's images; `urls` must list exactly the current images"""
+    db = get_database()
+    
+    result = await db.litters.update_one(
+        {"puppies": {"$elemMatch": {"id": puppy_id, **permutation_filter("images", reorder.urls)}}},
+        {"$set": {"puppies.$.images": reorder.urls, "updated_at": datetime.now()}}
     )
+    if result.matched_count == 0:
+        if not await puppy_catalog_service.find_litter_id(puppy_id):
+            raise HTTPException(status_code=404, detail="Puppy not found")
+        raise HTTPException(status_code=409, detail="Images changed since they were loaded; reload and try again")
     
-    return {"message": "Image deleted successfully"}
+    return {"images": reorder.urls, "message": "Images reordered successfully"}
 
 @router.post("/{puppy_id}/videos")
 async def upload_puppy_video(
     puppy_id: str,
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    content_hash: Optional[str] = Form(None),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
     """Upload video for a specific puppy"""
     db = get_database()
     
     # Find the litter containing this puppy
-    litter_doc = await db.litters.find_one({"puppies.id": puppy_id})
-    if not litter_doc:
+    litter_id = await puppy_catalog_service.find_litter_id(puppy_id)
+    if not litter_id:
         raise HTTPException(status_code=404, detail="Puppy not found")
     
     # Validate file type
     allowed_types = ["video/mp4", "video/webm", "video/avi", "video/mov"]
-    if file.content_type not in allowed_types:
+    if file and file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail="Invalid file type. Only MP4, WebM, AVI, and MOV videos are allowed."
         )
     
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    unique_filename = f"puppies/{puppy_id}/videos/{uuid.uuid4()}{file_extension}"
-    
-    # Upload to R2
-    file_content = await file.read()
-    video_url = await r2_service.upload_file(file_content, unique_filename, file.content_type)
+    # Store by content hash (a retried upload reuses the existing object)
+    video_url = await media_service.store_upload(file, content_hash, allowed_types)
     
     if not video_url:
         raise HTTPException(status_code=500, detail="Failed to upload video")
     
-    # Add video URL to puppy's videos array
-    await db.litters.update_one(
-        {"_id": litter_doc["_id"], "puppies.id": puppy_id},
-        {"$push": {"puppies.$.videos": video_url}}
+    # Add video URL to puppy's videos array unless a retry already added it
+    result = await db.litters.update_one(
+        {"_id": litter_id, "puppies": {"$elemMatch": {"id": puppy_id, "videos": {"$ne": video_url}}}},
+        {"$addToSet": {"puppies.$.videos": video_url}}
     )
-    
-    return {"video_url": video_url, "message": "Video uploaded successfully"}
+    if result.matched_count == 0:
+        # Already on the puppy (or the puppy is gone), so the upload's reference is not needed
+        await media_service.release(video_url)
+        if not await puppy_catalog_service.find_litter_id(puppy_id):
+            raise HTTPException(status_code=404, detail="Puppy not found")
+        job = await video_processing_service.latest_job(puppy_id, video_url)
+        return {"video_url": video_url, "job": job, "message": "Video already uploaded"}
+    
+    # Poster frame and streaming renditions are produced in the background
+    job = await video_processing_service.enqueue(puppy_id, video_url)
+    
+    return {"video_url": video_url, "job": job, "message": "Video uploaded successfully"}
+
+@router.get("/{puppy_id}/video-jobs", response_model=List[dict])
+async def get_puppy_video_jobs(
+    puppy_id: str,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """List video processing jobs for a puppy (admin only)"""
+    return await video_processing_service.list_jobs(puppy_id)
+
+@router.get("/video-jobs/{job_id}", response_model=dict)
+async def get_video_job(
+    job_id: str,
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Get a video processing job's status (admin only)"""
+    job = await video_processing_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Video job not found")
+    return job
 
 @router.patch("/{puppy_id}/status")
 async def update_puppy_status(
@@ -259,15 +333,12 @@ async def update_puppy_status(
     """Update puppy status (available, reserved, sold)"""
     db = get_database()
     
-    # Find the litter containing this puppy
-    litter_doc = await db.litters.find_one({"puppies.id": puppy_id})
-    if not litter_doc:
-        raise HTTPException(status_code=404, detail="Puppy not found")
-    
-    # Update puppy status
-    await db.litters.update_one(
-        {"_id": litter_doc["_id"], "puppies.id": puppy_id},
+    # Update puppy status; the puppies.id index finds its litter
+    result = await db.litters.update_one(
+        {"puppies.id": puppy_id},
         {"$set": {"puppies.$.status": status}}
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Puppy not found")
     
     return {"message": f"Puppy status updated to {status}"} 
\ No newline at end of file
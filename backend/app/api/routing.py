@@ -0,0 +1,68 @@
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from app.services.request_context import current_request, span
+import asyncio
+import functools
+import time
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records JSON encoding as the `render` span"""
+
+    def render(self, content) -> bytes:
+        with span("render"):
+            return super().render(content)
+
+def timed_endpoint(endpoint):
+    """Wrap an endpoint to record its run time as the `handler` span and when it returned"""
+    if getattr(endpoint, "is_timed", False):
+        # include_router rebuilds routes from the already wrapped endpoint
+        return endpoint
+
+    def finish(started: float):
+        context = current_request.get()
+        if context is not None:
+            context.endpoint_finished = time.perf_counter()
+            context.add_span("handler", context.endpoint_finished - started)
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish(started)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                finish(started)
+    wrapper.is_timed = True
+    return wrapper
+
+class TimedRoute(APIRoute):
+    """Route that splits request time into handler, validation and rendering spans.
+
+    `validate` covers what FastAPI does between the endpoint returning and
+    the response existing (response-model validation and jsonable encoding)
+    less the time spent in `render`.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            context = current_request.get()
+            if context is not None and context.endpoint_finished is not None:
+                render = context.spans.get("render", (0.0,))[0]
+                context.add_span("validate", max(0.0, time.perf_counter() - context.endpoint_finished - render))
+            return response
+
+        return timed_handler
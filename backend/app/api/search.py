@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Literal, Optional
+from app.api.routing import TimedRoute
+from app.models.auth import AdminUser
+from app.services.auth import get_current_admin
+from app.services.search import search_service
+
+router = APIRouter(prefix="/search", tags=["search"], route_class=TimedRoute)
+
+@router.get("/", response_model=dict)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[Literal["litter", "parent", "puppy", "inquiry"]]] = Query(None),
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=100),
+    current_admin: AdminUser = Depends(get_current_admin)
+):
+    """Search litters, parents, puppies and inquiries by relevance (admin only)"""
+    return await search_service.search(q, types=types, skip=skip, limit=limit)
@@ -1,9 +1,132 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import PlainTextResponse, Response
+from app.api.routing import TimedRoute
+from app.services.database import get_database
 from datetime import datetime
 import xml.etree.ElementTree as ET
 
-router = APIRouter(prefix="/seo", tags=["seo"])
+router = APIRouter(prefix="/seo", tags=["seo"], route_class=TimedRoute)
+
+SITE_URL = "https://doublejsdoodles.com"
+
+LOCATION_META = {
+    "colorado": {
+        "title": "Goldendoodle Breeder Colorado - Double J's Doodles | Health Tested Puppies",
+        "description": "Premier Goldendoodle breeder in Colorado. Serving Denver, Colorado Springs, Pueblo. Health tested, home-raised puppies from champion bloodlines.",
+        "keywords": "goldendoodle breeder Colorado, goldendoodle puppies Colorado, Denver goldendoodle, Colorado Springs goldendoodle, Pueblo goldendoodle",
+        "h1": "Premium Goldendoodle Breeder in Colorado",
+        "content": "Located in La Junta, Colorado, Double J's Doodles serves families throughout Colorado including Denver, Colorado Springs, and Pueblo with premium Goldendoodle puppies.",
+    },
+    "denver": {
+        "title": "Goldendoodle Breeder Near Denver Colorado - Double J's Doodles",
+        "description": "Goldendoodle breeder serving Denver, Colorado. Airport pickup available. Health tested, champion bloodline puppies ready for Denver families.",
+        "keywords": "goldendoodle Denver, goldendoodle breeder Denver, Denver goldendoodle puppies, DEN airport pickup goldendoodle",
+        "h1": "Goldendoodle Breeder Serving Denver, Colorado",
+        "content": "Serving Denver families with premium Goldendoodle puppies. Convenient Denver Airport pickup available. Drive to our La Junta location or meet us halfway.",
+    },
+    "utah": {
+        "title": "Goldendoodle Breeder Serving Utah - Double J's Doodles Colorado",
+        "description": "Colorado Goldendoodle breeder serving Utah families. Ground transport available. Health tested puppies from champion bloodlines.",
+        "keywords": "goldendoodle Utah, goldendoodle breeder Utah, Utah goldendoodle puppies, Colorado goldendoodle Utah transport",
+        "h1": "Goldendoodle Breeder Serving Utah Families",
+        "content": "While located in Colorado, we proudly serve Utah families with our premium Goldendoodle puppies. Ground transport and meeting halfway options available.",
+    },
+    "texas": {
+        "title": "Goldendoodle Breeder Serving Texas - Double J's Doodles Colorado",
+        "description": "Colorado Goldendoodle breeder serving Texas families. Transport options available. Health tested, home-raised puppies from champion bloodlines.",
+        "keywords": "goldendoodle Texas, goldendoodle breeder Texas, Texas goldendoodle puppies, Colorado goldendoodle Texas transport",
+        "h1": "Goldendoodle Breeder Serving Texas Families",
+        "content": "Proudly serving Texas families from our Colorado location. Multiple transport options available to bring your new Goldendoodle puppy safely to Texas.",
+    },
+    "golden-doodles-near-me": {
+        "title": "Golden Doodles Near Me - Double J's Doodles Colorado, Utah, Texas",
+        "description": "Looking for golden doodles near me? Double J's Doodles serves Colorado, Utah, and Texas with premium Goldendoodle puppies. Multiple pickup locations.",
+        "keywords": "golden doodles near me, goldendoodle near me, goldendoodle puppies near me, local goldendoodle breeder",
+        "h1": "Golden Doodles Near Me - Premium Breeder",
+        "content": "Searching for 'golden doodles near me'? Double J's Doodles serves a wide area including Colorado, Utah, and Texas with convenient pickup and transport options.",
+    }
+}
+
+LOCAL_BUSINESS_SCHEMA = {
+    "@context": "https://schema.org",
+    "@type": "LocalBusiness",
+    "@id": "https://doublejsdoodles.com",
+    "name": "Double J's Doodles",
+    "alternateName": "Double Js Doodles",
+    "description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies from champion bloodlines.",
+    "url": "https://doublejsdoodles.com",
+    "logo": "https://doublejsdoodles.com/logo512.png",
+    "image": ["https://doublejsdoodles.com/logo512.png"],
+    "telephone": "Contact via Facebook",
+    "email": "Contact via website form",
+    "address": {
+        "@type": "PostalAddress",
+        "streetAddress": "La Junta",
+        "addressLocality": "La Junta",
+        "addressRegion": "CO",
+        "postalCode": "81050",
+        "addressCountry": "US"
+    },
+    "geo": {
+        "@type": "GeoCoordinates",
+        "latitude": 37.9842,
+        "longitude": -103.5472
+    },
+    "areaServed": [
+        {"@type": "State", "name": "Colorado"},
+        {"@type": "State", "name": "Utah"},
+        {"@type": "State", "name": "Texas"},
+        {"@type": "City", "name": "Denver", "addressRegion": "CO"},
+        {"@type": "City", "name": "Colorado Springs", "addressRegion": "CO"},
+        {"@type": "City", "name": "Pueblo", "addressRegion": "CO"}
+    ],
+    "founder": {
+        "@type": "Person",
+        "name": "Joanna Spangler",
+        "jobTitle": "Professional Dog Breeder"
+    },
+    "foundingDate": "2020",
+    "hasOfferCatalog": {
+        "@type": "OfferCatalog",
+        "name": "Goldendoodle Puppies",
+        "itemListElement": [
+            {
+                "@type": "Offer",
+                "itemOffered": {
+                    "@type": "Product",
+                    "name": "Goldendoodle Puppies",
+                    "description": "Health tested, home-raised Goldendoodle puppies from champion bloodlines",
+                    "category": "Pet"
+                },
+                "price": "1600",
+                "priceCurrency": "USD",
+                "availability": "InStock",
+                "areaServed": ["Colorado", "Utah", "Texas"]
+            }
+        ]
+    },
+    "knowsAbout": [
+        "Goldendoodle breeding",
+        "Dog health testing", 
+        "Puppy socialization",
+        "Pet care",
+        "Dog training"
+    ],
+    "paymentAccepted": ["Cash", "Check", "Bank Transfer"],
+    "priceRange": "$1600",
+    "currenciesAccepted": "USD",
+    "openingHours": "Mo-Su 09:00-18:00",
+    "contactPoint": {
+        "@type": "ContactPoint",
+        "contactType": "Customer Service",
+        "availableLanguage": "English"
+    },
+    "sameAs": [
+        "https://www.facebook.com/doublejsdoodles",
+        "https://www.gooddog.com/doublejsdoodles"
+    ],
+    "additionalType": "https://schema.org/PetStore"
+}
 
 @router.get("/sitemap.xml", response_class=PlainTextResponse)
 async def get_sitemap():
@@ -87,10 +210,33 @@ async def get_sitemap():
     <priority>0.8</priority>
   </url>
   
-</urlset>'''.format(current_date=datetime.now().strftime('%Y-%m-%d'))
+{detail_pages}</urlset>'''.format(
+        current_date=datetime.now().strftime('%Y-%m-%d'),
+        detail_pages=await build_detail_page_entries()
+    )
     
     return sitemap_content
 
+async def build_detail_page_entries() -> str:
+    """Sitemap entries for each litter page and puppy page, which have prerendered meta"""
+    db = get_database()
+    entries = []
+    async for litter_doc in db.litters.find({}, {"updated_at": 1, "puppies.id": 1}):
+        updated = litter_doc.get("updated_at")
+        lastmod = updated.strftime('%Y-%m-%d') if isinstance(updated, datetime) else datetime.now().strftime('%Y-%m-%d')
+        paths = [f"litters/{litter_doc['_id']}"] + [
+            f"puppies/{puppy['id']}" for puppy in litter_doc.get("puppies", []) if puppy.get("id")
+        ]
+        for path in paths:
+            entries.append(f'''  <url>
+    <loc>{SITE_URL}/{path}</loc>
+    <lastmod>{lastmod}</lastmod>
+    <changefreq>weekly</changefreq>
+    <priority>0.6</priority>
+  </url>
+''')
+    return "".join(entries)
+
 @router.get("/robots.txt", response_class=PlainTextResponse)
 async def get_robots():
     """Generate robots.txt for SEO"""
@@ -127,131 +273,12 @@ Disallow: /'''
 async def get_location_meta(location: str):
     """Get SEO meta data for specific locations"""
     
-    location_meta = {
-        "colorado": {
-            "title": "Goldendoodle Breeder Colorado - Double J's Doodles | Health Tested Puppies",
-            "description": "Premier Goldendoodle breeder in Colorado. Serving Denver, Colorado Springs, Pueblo. Health tested, home-raised puppies from champion bloodlines.",
-            "keywords": "goldendoodle breeder Colorado, goldendoodle puppies Colorado, Denver goldendoodle, Colorado Springs goldendoodle, Pueblo goldendoodle",
-            "h1": "Premium Goldendoodle Breeder in Colorado",
-            "content": "Located in La Junta, Colorado, Double J's Doodles serves families throughout Colorado including Denver, Colorado Springs, and Pueblo with premium Goldendoodle puppies.",
-        },
-        "denver": {
-            "title": "Goldendoodle Breeder Near Denver Colorado - Double J's Doodles",
-            "description": "Goldendoodle breeder serving Denver, Colorado. Airport pickup available. Health tested, champion bloodline puppies ready for Denver families.",
-            "keywords": "goldendoodle Denver, goldendoodle breeder Denver, Denver goldendoodle puppies, DEN airport pickup goldendoodle",
-            "h1": "Goldendoodle Breeder Serving Denver, Colorado",
-            "content": "Serving Denver families with premium Goldendoodle puppies. Convenient Denver Airport pickup available. Drive to our La Junta location or meet us halfway.",
-        },
-        "utah": {
-            "title": "Goldendoodle Breeder Serving Utah - Double J's Doodles Colorado",
-            "description": "Colorado Goldendoodle breeder serving Utah families. Ground transport available. Health tested puppies from champion bloodlines.",
-            "keywords": "goldendoodle Utah, goldendoodle breeder Utah, Utah goldendoodle puppies, Colorado goldendoodle Utah transport",
-            "h1": "Goldendoodle Breeder Serving Utah Families",
-            "content": "While located in Colorado, we proudly serve Utah families with our premium Goldendoodle puppies. Ground transport and meeting halfway options available.",
-        },
-        "texas": {
-            "title": "Goldendoodle Breeder Serving Texas - Double J's Doodles Colorado",
-            "description": "Colorado Goldendoodle breeder serving Texas families. Transport options available. Health tested, home-raised puppies from champion bloodlines.",
-            "keywords": "goldendoodle Texas, goldendoodle breeder Texas, Texas goldendoodle puppies, Colorado goldendoodle Texas transport",
-            "h1": "Goldendoodle Breeder Serving Texas Families",
-            "content": "Proudly serving Texas families from our Colorado location. Multiple transport options available to bring your new Goldendoodle puppy safely to Texas.",
-        },
-        "golden-doodles-near-me": {
-            "title": "Golden Doodles Near Me - Double J's Doodles Colorado, Utah, Texas",
-            "description": "Looking for golden doodles near me? Double J's Doodles serves Colorado, Utah, and Texas with premium Goldendoodle puppies. Multiple pickup locations.",
-            "keywords": "golden doodles near me, goldendoodle near me, goldendoodle puppies near me, local goldendoodle breeder",
-            "h1": "Golden Doodles Near Me - Premium Breeder",
-            "content": "Searching for 'golden doodles near me'? Double J's Doodles serves a wide area including Colorado, Utah, and Texas with convenient pickup and transport options.",
-        }
-    }
-    
-    if location.lower() not in location_meta:
+    if location.lower() not in LOCATION_META:
         raise HTTPException(status_code=404, detail="Location not found")
     
-    return location_meta[location.lower()]
+    return LOCATION_META[location.lower()]
 
 @router.get("/schema-org/local-business")
 async def get_local_business_schema():
     """Get structured data for local business"""
-    schema = {
-        "@context": "https://schema.org",
-        "@type": "LocalBusiness",
-        "@id": "https://doublejsdoodles.com",
-        "name": "Double J's Doodles",
-        "alternateName": "Double Js Doodles",
-        "description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies from champion bloodlines.",
-        "url": "https://doublejsdoodles.com",
-        "logo": "https://doublejsdoodles.com/logo512.png",
-        "image": ["https://doublejsdoodles.com/logo512.png"],
-        "telephone": "Contact via Facebook",
-        "email": "Contact via website form",
-        "address": {
-            "@type": "PostalAddress",
-            "streetAddress": "La Junta",
-            "addressLocality": "La Junta",
-            "addressRegion": "CO",
-            "postalCode": "81050",
-            "addressCountry": "US"
-        },
-        "geo": {
-            "@type": "GeoCoordinates",
-            "latitude": 37.9842,
-            "longitude": -103.5472
-        },
-        "areaServed": [
-            {"@type": "State", "name": "Colorado"},
-            {"@type": "State", "name": "Utah"},
-            {"@type": "State", "name": "Texas"},
-            {"@type": "City", "name": "Denver", "addressRegion": "CO"},
-            {"@type": "City", "name": "Colorado Springs", "addressRegion": "CO"},
-            {"@type": "City", "name": "Pueblo", "addressRegion": "CO"}
-        ],
-        "founder": {
-            "@type": "Person",
-            "name": "Joanna Spangler",
-            "jobTitle": "Professional Dog Breeder"
-        },
-        "foundingDate": "2020",
-        "hasOfferCatalog": {
-            "@type": "OfferCatalog",
-            "name": "Goldendoodle Puppies",
-            "itemListElement": [
-                {
-                    "@type": "Offer",
-                    "itemOffered": {
-                        "@type": "Product",
-                        "name": "Goldendoodle Puppies",
-                        "description": "Health tested, home-raised Goldendoodle puppies from champion bloodlines",
-                        "category": "Pet"
-                    },
-                    "price": "1600",
-                    "priceCurrency": "USD",
-                    "availability": "InStock",
-                    "areaServed": ["Colorado", "Utah", "Texas"]
-                }
-            ]
-        },
-        "knowsAbout": [
-            "Goldendoodle breeding",
-            "Dog health testing", 
-            "Puppy socialization",
-            "Pet care",
-            "Dog training"
-        ],
-        "paymentAccepted": ["Cash", "Check", "Bank Transfer"],
-        "priceRange": "$1600",
-        "currenciesAccepted": "USD",
-        "openingHours": "Mo-Su 09:00-18:00",
-        "contactPoint": {
-            "@type": "ContactPoint",
-            "contactType": "Customer Service",
-            "availableLanguage": "English"
-        },
-        "sameAs": [
-            "https://www.facebook.com/doublejsdoodles",
-            "https://www.gooddog.com/doublejsdoodles"
-        ],
-        "additionalType": "https://schema.org/PetStore"
-    }
-    
-    return schema
\ No newline at end of file
+    return LOCAL_BUSINESS_SCHEMA
\ No newline at end of file
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from app.services.storage import storage_service
+from app.services.local_storage import local_storage_service
+from app.services.media import IMMUTABLE_CACHE_CONTROL
+from app.api.routing import TimedRoute
+import mimetypes
+import tempfile
+
+router = APIRouter(prefix="/storage", tags=["storage"], route_class=TimedRoute)
+
+# Playlist and segment types are missing from some platform mime tables
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+
+def ensure_local_backend():
+    if storage_service is not local_storage_service:
+        raise HTTPException(status_code=404, detail="Local storage is not enabled")
+
+@router.get("/{file_name:path}")
+async def get_stored_file(file_name: str):
+    """Serve a locally stored object (Range requests and sendfile handled by FileResponse)"""
+    ensure_local_backend()
+    path = local_storage_service.resolve_path(file_name)
+    if not path or not path.is_file():
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    # Stored keys are never overwritten, so they can be cached indefinitely
+    return FileResponse(
+        path,
+        media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    )
+
+@router.put("/{file_name:path}")
+async def put_stored_file(file_name: str, expires: int, signature: str, request: Request):
+    """Accept a direct upload to a presigned local storage URL"""
+    ensure_local_backend()
+    if not local_storage_service.verify_signature(file_name, "put", expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+    
+    path = local_storage_service.resolve_path(file_name)
+    if not path:
+        raise HTTPException(status_code=400, detail="Invalid file name")
+    
+    # Spool the body so large uploads never sit fully in memory
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        url = await local_storage_service.upload_stream(
+            spool,
+            file_name,
+            request.headers.get("content-type", "application/octet-stream")
+        )
+    if not url:
+        raise HTTPException(status_code=500, detail="Failed to store file")
+    return {"url": url}
@@ -20,6 +20,46 @@ class Settings(BaseSettings):
     CLOUDFLARE_R2_REGION: Optional[str] = None
     CLOUDFLARE_R2_PUBLIC_URL: Optional[str] = None
     
+    # Media Storage ("r2" or "local"; defaults to R2 when credentials are set)
+    STORAGE_BACKEND: Optional[str] = None
+    LOCAL_STORAGE_PATH: str = "./storage"
+    LOCAL_STORAGE_PUBLIC_URL: str = "/api/storage"
+    
+    # Media Garbage Collection
+    MEDIA_GC_INTERVAL_SECONDS: int = 21600
+    MEDIA_GC_GRACE_PERIOD_SECONDS: int = 3600
+    
+    # Video Processing
+    VIDEO_FFMPEG_PATH: str = "ffmpeg"
+    VIDEO_FFPROBE_PATH: str = "ffprobe"
+    VIDEO_HLS_ENABLED: bool = False
+    
+    # Image Metadata
+    IMAGE_METADATA_WORKERS: int = 2
+    
+    # Password Hashing
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 8
+    
+    # Idempotency Keys
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LEASE_SECONDS: int = 600
+    
+    # Metrics (bearer token for Prometheus scrapes; admins can always read them)
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Slow Query Log
+    SLOW_QUERY_THRESHOLD_MS: int = 100
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 300
+    
+    # Contact Form Filtering
+    CONTACT_DUPLICATE_WINDOW_SECONDS: int = 600
+    CONTACT_RATE_WINDOW_SECONDS: int = 3600
+    CONTACT_MAX_PER_EMAIL: int = 5
+    CONTACT_MAX_PER_IP: int = 20
+    
     # Email SMTP Configuration
     EMAIL_SMTP_HOST: Optional[str] = None
     EMAIL_SMTP_PORT: Optional[int] = None
@@ -1,22 +1,69 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from pathlib import Path
-from app.api import auth, litters, contact, puppies, homepage, seo
+from app.api import auth, litters, contact, puppies, homepage, seo, media, storage, search, bootstrap, metrics
 from app.services.database import connect_to_mongo, close_mongo_connection
+from app.services.media import media_service
+from app.services.media_gc import media_gc
+from app.services.image_metadata import image_metadata_service
+from app.services.video_processing import video_processing_service
+from app.services.puppy_catalog import puppy_catalog_service
+from app.services.search import search_service
+from app.services.inquiry_inbox import inquiry_inbox_service
+from app.services.active_litter import active_litter_service
+from app.services.idempotency import idempotency_store
+from app.services.rate_limit import rate_limiter
+from app.services.auth import ensure_auth_indexes
+from app.services.password_hasher import password_hasher
+from app.services.homepage_publisher import homepage_publisher
+from app.services.metrics import event_loop_monitor
+from app.services.slow_query_log import slow_query_log
+from app.services.frontend import FrontendAssets
+from app.services.prerender import prerender_service
+from app.middleware.prerender import PrerenderInvalidationMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.api.routing import TimedJSONResponse
 from app.config.settings import settings
+import asyncio
 import os
 
-app = FastAPI(title="Double JS Doodles API", version="1.0.0")
+app = FastAPI(title="Double JS Doodles API", version="1.0.0", default_response_class=TimedJSONResponse)
 
 @app.on_event("startup")
 async def startup_db_client():
+    event_loop_monitor.start()
+    slow_query_log.start()
     await connect_to_mongo()
+    await media_service.ensure_indexes()
+    await puppy_catalog_service.ensure_indexes()
+    await search_service.ensure_indexes()
+    await inquiry_inbox_service.ensure_indexes()
+    await active_litter_service.ensure_indexes()
+    await idempotency_store.ensure_indexes()
+    await rate_limiter.ensure_indexes()
+    await ensure_auth_indexes()
+    await homepage_publisher.load()
+    media_gc.start()
+    await video_processing_service.ensure_indexes()
+    await video_processing_service.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await media_gc.stop()
+    await video_processing_service.stop()
+    image_metadata_service.stop()
+    password_hasher.stop()
     await close_mongo_connection()
+    await event_loop_monitor.stop()
+
+app.add_middleware(PrerenderInvalidationMiddleware)
+# Replays skip prerender invalidation (nothing changed) but still get compressed
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,7 +71,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "Idempotent-Replayed"],
 )
+app.add_middleware(ServerTimingMiddleware)
+# Outermost, so latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
 
 # Include API routers with /api prefix
 app.include_router(auth.router, prefix="/api")
@@ -33,38 +84,50 @@ app.include_router(puppies.router, prefix="/api")
 app.include_router(contact.router, prefix="/api")
 app.include_router(seo.router, prefix="/api")
 app.include_router(homepage.router, prefix="/api")
+app.include_router(media.router, prefix="/api")
+app.include_router(storage.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(bootstrap.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 # Health check endpoint for Railway
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "message": "Double JS Doodles API is running"}
 
-# Serve static files (React build)
+# Serve static files (React build) from memory, precompressed
 static_dir = Path("./static")
+frontend_assets = FrontendAssets(static_dir)
 if static_dir.exists():
-    # React builds create a 'static' subdirectory with CSS/JS assets
-    react_static_dir = static_dir / "static"
-    if react_static_dir.exists():
-        app.mount("/static", StaticFiles(directory=react_static_dir), name="static")
-    else:
-        # Fallback: serve directly from static if no nested static dir
-        app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    @app.on_event("startup")
+    async def load_frontend_assets():
+        await asyncio.to_thread(frontend_assets.load)
     
     # Serve React app for all non-API routes
     @app.get("/{full_path:path}")
-    async def serve_frontend(full_path: str):
+    async def serve_frontend(full_path: str, request: Request):
         # If it's an API route, let FastAPI handle it
         if full_path.startswith("api/"):
             return {"error": "API endpoint not found"}
         
-        # For React Router - serve index.html for any non-API route
-        index_file = static_dir / "index.html"
-        if index_file.exists():
-            return FileResponse(index_file)
-        else:
+        asset = frontend_assets.get(full_path)
+        if asset is None and full_path.startswith("static/"):
+            # Fallback: builds without a nested static dir serve assets from the root
+            asset = frontend_assets.get(full_path[len("static/"):])
+            if asset is None:
+                return Response(status_code=404)
+        
+        if asset is not None:
+            return frontend_assets.build_response(request, asset)
+        
+        # For React Router - serve index.html with route-specific SEO tags for any other non-API route
+        shell = frontend_assets.get("index.html")
+        if shell is None:
             return {"error": "Frontend not built", "message": "Static files not found"}
+        page = await prerender_service.get_page(full_path, shell)
+        return frontend_assets.build_response(request, page)
 else:
     # Fallback when static files don't exist
     @app.get("/")
     async def root():
-        return {"message": "Double JS Doodles API is running", "note": "Frontend static files not found"}
\ No newline at end of file
+        return {"message": "Double JS Doodles API is running", "note": "Frontend static files not found"}
@@ -0,0 +1,154 @@
+from app.services.frontend import choose_encoding
+from typing import Callable, Dict
+import asyncio
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/ld+json",
+    "application/xml",
+    "application/javascript",
+    "text/",
+)
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=4)
+
+def _zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(body)
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def available_compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Encoders in preference order; optional codecs are skipped when not installed"""
+    compressors = {}
+    if brotli is not None:
+        compressors["br"] = _brotli
+    if zstandard is not None:
+        compressors["zstd"] = _zstd
+    compressors["gzip"] = _gzip
+    return compressors
+
+class CompressionMiddleware:
+    """Negotiated brotli/zstd/gzip compression for API responses.
+
+    Only textual content types are compressed, and only above
+    `minimum_size`. Responses that already carry a Content-Encoding (media,
+    precompressed assets) pass through untouched, as do HEAD responses
+    (their empty body says nothing about the GET length) and streamed
+    responses (compressing them would buffer the whole stream). Bodies
+    larger than `offload_size` are compressed on a worker thread so big
+    payloads never stall the event loop.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, offload_size: int = 64 * 1024, path_prefix: str = "/api/", exclude_prefixes: tuple = ("/api/storage",)):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.path_prefix = path_prefix
+        self.exclude_prefixes = exclude_prefixes
+        self.compressors = available_compressors()
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or not scope["path"].startswith(self.path_prefix)
+            or scope["path"].startswith(self.exclude_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding, self.compressors.keys())
+
+        start_message = None
+        body_parts = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {name.lower(): value for name, value in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if message.get("more_body", False) and not body_parts:
+                # A streamed response; forward it as it arrives instead of buffering
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            await self.send_response(send, start_message, body, encoding)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def send_response(self, send, start_message, body: bytes, encoding):
+        headers = [
+            (name, value) for name, value in start_message.get("headers", [])
+            if name.lower() not in (b"content-length", b"vary", b"etag")
+        ]
+        original = {name.lower(): value for name, value in start_message.get("headers", [])}
+
+        # The representation depends on Accept-Encoding whether or not we compress this one
+        vary = original.get(b"vary", b"").decode("latin-1")
+        vary_values = [v.strip() for v in vary.split(",") if v.strip()]
+        if not any(v.lower() == "accept-encoding" for v in vary_values):
+            vary_values.append("Accept-Encoding")
+        headers.append((b"vary", ", ".join(vary_values).encode("latin-1")))
+
+        etag = original.get(b"etag")
+        if encoding and len(body) >= self.minimum_size and start_message["status"] not in (204, 304):
+            compress = self.compressors[encoding]
+            if len(body) >= self.offload_size:
+                compressed = await asyncio.to_thread(compress, body)
+            else:
+                compressed = compress(body)
+            if len(compressed) < len(body):
+                body = compressed
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+                # Byte-level validators no longer hold once the body is re-encoded
+                if etag and not etag.startswith(b"W/"):
+                    etag = b"W/" + etag
+
+        if etag:
+            headers.append((b"etag", etag))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
@@ -0,0 +1,146 @@
+from app.services.idempotency import idempotency_store
+from fastapi.responses import JSONResponse
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = ("POST", "PUT", "PATCH")
+MAX_KEY_LENGTH = 255
+# Body bytes covered by the fingerprint; longer uploads are identified by this prefix and their length
+MAX_FINGERPRINT_BODY = 1024 * 1024
+# Responses larger than this are not kept, so a retry runs the request again
+MAX_STORED_RESPONSE = 1024 * 1024
+# Statuses a retry should re-execute rather than replay
+RETRYABLE_STATUSES = (408, 429)
+
+def request_fingerprint(scope, body: bytes) -> str:
+    headers = dict(scope["headers"])
+    fingerprint = hashlib.sha256()
+    for part in (
+        scope["method"].encode("latin-1"),
+        scope["path"].encode("utf-8"),
+        scope.get("query_string", b""),
+        headers.get(b"content-type", b""),
+        headers.get(b"content-length", b""),
+    ):
+        fingerprint.update(part)
+        fingerprint.update(b"\0")
+    fingerprint.update(body)
+    return fingerprint.hexdigest()
+
+class IdempotencyMiddleware:
+    """Replay the stored response for retried writes carrying an Idempotency-Key.
+
+    The first request with a key claims it and runs normally; its response
+    is stored (except 5xx and retryable statuses) and replayed verbatim,
+    with `Idempotent-Replayed: true`, for repeats. A repeat that arrives
+    while the first is still running gets 409 with Retry-After, and reusing
+    a key for a different request gets 422. Keys are scoped to the caller's
+    Authorization header.
+    """
+
+    def __init__(self, app, path_prefix: str = "/api/"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in IDEMPOTENT_METHODS
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        key = headers.get(b"idempotency-key")
+        if not key:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(status_code=400, content={"detail": "Idempotency-Key is too long"})
+            await response(scope, receive, send)
+            return
+
+        # Buffer the start of the body for the fingerprint, then hand it back to the app
+        buffered = []
+        body = b""
+        more_body = True
+        while more_body and len(body) < MAX_FINGERPRINT_BODY:
+            message = await receive()
+            buffered.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        fingerprint = request_fingerprint(scope, body[:MAX_FINGERPRINT_BODY])
+
+        key_id = hashlib.sha256(headers.get(b"authorization", b"") + b"\0" + key).hexdigest()
+        existing = await idempotency_store.claim(key_id, fingerprint)
+        if existing is not None:
+            await self.respond_to_repeat(existing, fingerprint, scope, receive, send)
+            return
+
+        async def replay_receive():
+            if buffered:
+                return buffered.pop(0)
+            return await receive()
+
+        status = None
+        response_headers = []
+        response_body = []
+        stored_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, response_headers, stored_size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body" and stored_size <= MAX_STORED_RESPONSE:
+                chunk = message.get("body", b"")
+                stored_size += len(chunk)
+                response_body.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await idempotency_store.release(key_id)
+            raise
+
+        if status is None or status >= 500 or status in RETRYABLE_STATUSES or stored_size > MAX_STORED_RESPONSE:
+            await idempotency_store.release(key_id)
+            return
+        try:
+            await idempotency_store.complete(key_id, status, response_headers, b"".join(response_body))
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response: {e}")
+            await idempotency_store.release(key_id)
+
+    async def respond_to_repeat(self, existing: dict, fingerprint: str, scope, receive, send):
+        if existing.get("fingerprint") != fingerprint:
+            response = JSONResponse(
+                status_code=422,
+                content={"detail": "Idempotency-Key was already used for a different request"}
+            )
+            await response(scope, receive, send)
+            return
+
+        if existing.get("status") != "completed":
+            response = JSONResponse(
+                status_code=409,
+                content={"detail": "A request with this Idempotency-Key is still in progress"},
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+
+        stored = existing["response"]
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored["headers"]]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": stored["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": bytes(stored["body"]), "more_body": False})
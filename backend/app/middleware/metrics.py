@@ -0,0 +1,39 @@
+from app.services.metrics import http_request_duration, http_requests_in_flight
+from app.services.request_context import RequestContext, current_request
+import time
+
+class MetricsMiddleware:
+    """Record latency and concurrency for every HTTP request.
+
+    Latency is labelled with the matched route template (e.g.
+    `/api/puppies/{puppy_id}`) rather than the raw path, which keeps label
+    cardinality bounded; requests no route matched share `unmatched`.
+    It also publishes the request context used to attribute database work.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        context = RequestContext(scope)
+        token = current_request.set(context)
+        http_requests_in_flight.inc()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            current_request.reset(token)
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], context.route, str(status))
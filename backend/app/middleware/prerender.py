@@ -0,0 +1,23 @@
+from app.services.prerender import prerender_service, SOURCE_PATH_PREFIXES
+
+class PrerenderInvalidationMiddleware:
+    """Clear prerendered pages after any successful write to their source data"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or not scope["path"].startswith(SOURCE_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                prerender_service.invalidate()
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
@@ -9,6 +9,18 @@ from app.config.settings import settings
 request_counts = defaultdict(list)
 failed_login_attempts = defaultdict(list)
 
+def get_client_ip(request: Request) -> str:
+    # Handle various proxy headers
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+    
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+    
+    return request.client.host if request.client else "unknown"
+
 class SecurityMiddleware:
     def __init__(self, app):
         self.app = app
@@ -35,16 +47,7 @@ class SecurityMiddleware:
         await self.app(scope, receive, send)
     
     def get_client_ip(self, request: Request) -> str:
-        # Handle various proxy headers
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        return request.client.host if request.client else "unknown"
+        return get_client_ip(request)
     
     async def is_rate_limited(self, client_ip: str, path: str) -> bool:
         current_time = time.time()
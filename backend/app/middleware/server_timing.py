@@ -0,0 +1,73 @@
+from app.services.auth import token_username
+from app.services.request_context import current_request
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+def format_server_timing(spans: dict, total: float) -> str:
+    entries = [
+        f'{name};dur={seconds * 1000:.1f};desc="{int(count)}x"' if count > 1 else f"{name};dur={seconds * 1000:.1f}"
+        for name, (seconds, count) in spans.items()
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+class ServerTimingMiddleware:
+    """Break each request's time into spans (db, r2, smtp, auth, handler, validate, render).
+
+    Admin requests get a `Server-Timing` header, readable in the browser's
+    devtools; an admin is anyone whose request passed `get_current_admin` or
+    carries a valid access token. Spans are stamped when the response
+    starts, so streamed bodies are not covered. Every request also logs the
+    breakdown as structured fields. Needs the request context published by
+    MetricsMiddleware, so it must sit inside it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        context = current_request.get()
+        if scope["type"] != "http" or context is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+        response_started = None
+
+        async def send_wrapper(message):
+            nonlocal status, response_started
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started = time.perf_counter()
+                if self.is_admin(scope, context):
+                    with context.lock:
+                        spans = dict(context.spans)
+                    header = format_server_timing(spans, response_started - context.started)
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            total = (response_started or time.perf_counter()) - context.started
+            with context.lock:
+                spans = {name: round(seconds * 1000, 1) for name, (seconds, _) in context.spans.items()}
+            logger.info(
+                f"{scope['method']} {context.route} {status} {total * 1000:.1f}ms",
+                extra={
+                    "method": scope["method"],
+                    "route": context.route,
+                    "status": status,
+                    "duration_ms": round(total * 1000, 1),
+                    "spans_ms": spans,
+                }
+            )
+
+    def is_admin(self, scope, context) -> bool:
+        if context.is_admin:
+            return True
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        return scheme.lower() == "bearer" and bool(token) and token_username(token) is not None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ContactFormSubmission(BaseModel):
@@ -27,4 +27,22 @@ class ContactInquiry(BaseModel):
     subject: Optional[str] = None
     submitted_at: datetime = datetime.now()
     responded: bool = False
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+class ContactInquirySummary(BaseModel):
+    id: str
+    name: str
+    email: str
+    phone: str
+    preview: str = ""
+    puppy_name: Optional[str] = None
+    litter_name: Optional[str] = None
+    subject: Optional[str] = None
+    submitted_at: datetime
+    responded: bool = False
+    responded_at: Optional[datetime] = None
+
+class ContactInquiryPage(BaseModel):
+    inquiries: List[ContactInquirySummary]
+    next_cursor: Optional[str] = None
+    unresponded_count: int
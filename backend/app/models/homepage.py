@@ -1,11 +1,13 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
+from app.models.media import ImageMetadata
 import uuid
 
 class HeroImage(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     image_url: str
+    image_meta: Optional[ImageMetadata] = None
     title: Optional[str] = None
     subtitle: Optional[str] = None
     alt_text: str
@@ -61,4 +63,5 @@ class HomepageContentUpdate(BaseModel):
     meta_title: Optional[str] = None
     meta_description: Optional[str] = None
 
-import uuid 
\ No newline at end of file
+class HeroImageReorder(BaseModel):
+    ids: List[str]
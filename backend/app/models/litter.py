@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 from enum import Enum
+from app.models.media import ImageMetadata
 
 class PuppyStatus(str, Enum):
     AVAILABLE = "available"
@@ -27,6 +28,20 @@ class ParentDog(BaseModel):
     weight: Optional[float] = None
     health_clearances: List[str] = []
     image_url: Optional[str] = None
+    image_meta: Optional[ImageMetadata] = None
+
+class VideoRendition(BaseModel):
+    name: str
+    height: int
+    bitrate: str
+    url: str
+
+class VideoAsset(BaseModel):
+    job_id: str
+    source_url: str
+    poster_url: Optional[str] = None
+    renditions: List[VideoRendition] = []
+    hls_url: Optional[str] = None
 
 class Puppy(BaseModel):
     id: Optional[str] = None
@@ -37,7 +52,10 @@ class Puppy(BaseModel):
     estimated_adult_weight: Optional[float] = None
     status: PuppyStatus = PuppyStatus.AVAILABLE
     images: List[str] = []
+    # Metadata for entries of `images`, matched by url
+    image_meta: List[ImageMetadata] = []
     videos: List[str] = []
+    video_assets: List[VideoAsset] = []
     microchip_id: Optional[str] = None
     notes: Optional[str] = None
 
@@ -96,4 +114,24 @@ class PuppyUpdate(BaseModel):
     estimated_adult_weight: Optional[float] = None
     status: Optional[PuppyStatus] = None
     microchip_id: Optional[str] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+class PuppyBulkOperation(BaseModel):
+    op: Literal["create", "update", "status"]
+    litter_id: Optional[str] = None
+    puppy_id: Optional[str] = None
+    puppy: Optional[PuppyCreate] = None
+    update: Optional[PuppyUpdate] = None
+    status: Optional[PuppyStatus] = None
+
+class PuppyBulkRequest(BaseModel):
+    operations: List[PuppyBulkOperation] = Field(..., min_length=1, max_length=200)
+
+class PuppyBulkResult(BaseModel):
+    index: int
+    op: str
+    success: bool
+    litter_id: Optional[str] = None
+    puppy_id: Optional[str] = None
+    puppy: Optional[dict] = None
+    error: Optional[str] = None
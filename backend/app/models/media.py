@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Dict, Optional
+
+class MediaHashCheck(BaseModel):
+    hashes: List[str]
+
+class MediaHashCheckResponse(BaseModel):
+    existing: Dict[str, str]
+    missing: List[str]
+
+class MediaListRemove(BaseModel):
+    urls: List[str] = Field(..., min_length=1)
+
+class MediaListReorder(BaseModel):
+    urls: List[str]
+
+    @field_validator("urls")
+    @classmethod
+    def urls_unique(cls, urls: List[str]) -> List[str]:
+        # The reorder guard only compares membership and length, so a repeat would silently drop another entry
+        if len(set(urls)) != len(urls):
+            raise ValueError("urls must not contain duplicates")
+        return urls
+
+class ImageMetadata(BaseModel):
+    url: str
+    width: int
+    height: int
+    dominant_color: str
+    lqip: Optional[str] = None
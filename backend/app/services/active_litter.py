@@ -0,0 +1,123 @@
+from app.services.database import get_database
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_LITTER_INDEX = "one_current_litter"
+
+class ActiveLitterConflict(Exception):
+    """Another litter is already current"""
+
+    def __init__(self, existing_litter: Optional[dict]):
+        super().__init__("A current/active litter already exists")
+        self.existing_litter = existing_litter
+
+class ActiveLitterService:
+    """Tracks the single current litter.
+
+    A partial unique index on `is_current: true` lets the database enforce
+    that at most one litter is current, so activation is a single write
+    whose duplicate-key error doubles as the conflict check, and reading the
+    current litter is one indexed lookup that cannot return two documents.
+    """
+
+    async def ensure_indexes(self):
+        db = get_database()
+        # Older data may have several current litters; keep the most recently updated
+        current_ids = [
+            litter_doc["_id"]
+            async for litter_doc in db.litters.find({"is_current": True}, {"_id": 1}).sort("updated_at", -1)
+        ]
+        if len(current_ids) > 1:
+            logger.warning(f"Found {len(current_ids)} current litters; keeping {current_ids[0]}")
+            await db.litters.update_many(
+                {"_id": {"$in": current_ids[1:]}},
+                {"$set": {"is_current": False, "updated_at": datetime.now()}}
+            )
+        await db.litters.create_index(
+            "is_current",
+            unique=True,
+            partialFilterExpression={"is_current": True},
+            name=ACTIVE_LITTER_INDEX
+        )
+
+    async def find_active(self, projection: Optional[dict] = None) -> Optional[dict]:
+        db = get_database()
+        return await db.litters.find_one({"is_current": True}, projection)
+
+    async def deactivate_others(self, litter_id: Optional[ObjectId] = None):
+        db = get_database()
+        query = {"is_current": True}
+        if litter_id is not None:
+            query["_id"] = {"$ne": litter_id}
+        await db.litters.update_many(query, {"$set": {"is_current": False, "updated_at": datetime.now()}})
+
+    async def conflict(self, litter_id: Optional[ObjectId] = None) -> ActiveLitterConflict:
+        existing = await self.find_active({"name": 1})
+        if existing and existing["_id"] == litter_id:
+            existing = None
+        return ActiveLitterConflict(existing)
+
+    async def activate(self, litter_id: ObjectId, force: bool = False, update: Optional[dict] = None) -> Optional[dict]:
+        """Make a litter current (applying any other `update` fields) and return it.
+
+        Without `force` this raises ActiveLitterConflict when another litter is
+        current. With `force` the previous litter is cleared first, so there is
+        never a moment with two current litters; it is restored if the target
+        cannot be activated after all. Returns None if the litter does not
+        exist, leaving the current litter untouched.
+        """
+        db = get_database()
+        previous = None
+        if force:
+            if not await db.litters.find_one({"_id": litter_id}, {"_id": 1}):
+                return None
+            previous = await self.find_active({"_id": 1})
+            if previous and previous["_id"] != litter_id:
+                await self.deactivate_others(litter_id)
+            else:
+                previous = None
+        try:
+            litter_doc = await db.litters.find_one_and_update(
+                {"_id": litter_id},
+                {"$set": {**(update or {}), "is_current": True, "updated_at": datetime.now()}},
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            await self.restore(previous)
+            raise await self.conflict(litter_id)
+        if litter_doc is None:
+            # Deleted between the existence check and the update
+            await self.restore(previous)
+        return litter_doc
+
+    async def restore(self, previous: Optional[dict]):
+        """Make a litter cleared by a forced activation current again, unless another took its place"""
+        if previous is None:
+            return
+        db = get_database()
+        try:
+            await db.litters.update_one(
+                {"_id": previous["_id"]},
+                {"$set": {"is_current": True, "updated_at": datetime.now()}}
+            )
+        except DuplicateKeyError:
+            pass
+
+    async def insert(self, litter_doc: dict, force: bool = False) -> ObjectId:
+        """Insert a litter, honouring the single-current-litter rule"""
+        db = get_database()
+        if litter_doc.get("is_current") and force:
+            await self.deactivate_others()
+        try:
+            result = await db.litters.insert_one(litter_doc)
+        except DuplicateKeyError:
+            raise await self.conflict()
+        return result.inserted_id
+
+active_litter_service = ActiveLitterService()
@@ -1,12 +1,12 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer
 import hashlib
 import base64
 import time
+import re
 import secrets
 import string
 from bson import ObjectId
@@ -14,8 +14,19 @@ from app.config.settings import settings
 from app.models.auth import TokenData, AdminUser, AdminUserCreate, PasswordResetCode
 from app.services.database import get_database
 from app.services.email import email_service
+from app.services.rate_limit import rate_limiter
+from app.services.password_hasher import password_hasher, pwd_context
+from app.services.request_context import current_request, span
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESET_CODE_TTL_MINUTES = 20
+RESET_REQUEST_LIMIT = 3
+RESET_REQUEST_WINDOW_SECONDS = 3600
+RESET_ATTEMPT_LIMIT = 5
+RESET_ATTEMPT_WINDOW_SECONDS = 600
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 def hash_password_with_salt(password: str) -> str:
@@ -75,11 +86,13 @@ async def create_admin_user(admin_create: AdminUserCreate) -> AdminUser:
     # Check if password is already hashed (64 char hex string)
     is_pre_hashed = len(admin_create.password) == 64 and all(c in '0123456789abcdef' for c in admin_create.password.lower())
     
+    credential = admin_create.password if is_pre_hashed else hash_password_with_salt(admin_create.password)
+    
     # Create admin document - use only password field for consistency
     admin_doc = {
         "username": admin_create.username,
         "email": admin_create.email,
-        "password": admin_create.password if is_pre_hashed else hash_password_with_salt(admin_create.password),
+        "password": await password_hasher.hash(credential),
         "is_active": True,
         "created_at": datetime.now(),
         "updated_at": datetime.now()
@@ -92,23 +105,32 @@ async def create_admin_user(admin_create: AdminUserCreate) -> AdminUser:
     return AdminUser(**admin_doc)
 
 async def authenticate_admin_password(username: str, hashed_password: str) -> Optional[AdminUser]:
-    """Authenticate admin with salt-hashed password from frontend"""
-    admin = await get_admin_by_username(username)
-    if not admin or not admin.is_active:
+    """Authenticate admin with salt-hashed password from frontend.
+
+    The stored credential is a bcrypt hash of the frontend hash, checked on
+    the password hashing pool. Outdated hashes (pre-bcrypt digests or old
+    cost settings) are replaced with a fresh hash after a successful check.
+    """
+    db = get_database()
+    admin_doc = await db.admin_users.find_one({"username": {"$regex": f"^{re.escape(username)}$", "$options": "i"}})
+    if not admin_doc or not admin_doc.get("is_active", True) or "password" not in admin_doc:
         return None
     
-    # Get the stored hash from database (case-insensitive)
-    db = get_database()
-    admin_doc = await db.admin_users.find_one({"username": {"$regex": f"^{username}$", "$options": "i"}})
+    stored_hash = admin_doc["password"]
+    valid, new_hash = await password_hasher.verify_and_update(hashed_password, stored_hash)
+    if not valid:
+        return None
     
-    if admin_doc and "password" in admin_doc:
-        stored_hash = admin_doc["password"]
-        
-        # Direct comparison of hashed passwords
-        if hashed_password == stored_hash:
-            return admin
+    if new_hash:
+        # Only replace the hash we verified, in case the password changed meanwhile
+        await db.admin_users.update_one(
+            {"_id": admin_doc["_id"], "password": stored_hash},
+            {"$set": {"password": new_hash, "updated_at": datetime.now()}}
+        )
+        admin_doc["password"] = new_hash
     
-    return None
+    admin_doc["id"] = str(admin_doc.pop("_id"))
+    return AdminUser(**admin_doc)
 
 async def authenticate_admin(username: str, hashed_password: str) -> Optional[AdminUser]:
     """Authenticate admin with hashed password (legacy method for backward compatibility)"""
@@ -120,8 +142,7 @@ async def authenticate_admin(username: str, hashed_password: str) -> Optional[Ad
     if hashed_password == hash_password_with_salt("secret") and admin.username == "admin":
         # Legacy hardcoded admin - allow but should be updated
         return admin
-    elif hashed_password == admin.password:
-        # Direct hash comparison
+    elif (await password_hasher.verify_and_update(hashed_password, admin.password))[0]:
         return admin
     
     return None
@@ -144,24 +165,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.FASTAPI_SECRET_KEY, algorithm=settings.FASTAPI_ALGORITHM)
     return encoded_jwt
 
+def token_username(token: str) -> Optional[str]:
+    """Username from a valid, unexpired access token, or None"""
+    try:
+        payload = jwt.decode(token, settings.FASTAPI_SECRET_KEY, algorithms=[settings.FASTAPI_ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
 async def get_current_admin(token: str = Depends(security)) -> AdminUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token.credentials, settings.FASTAPI_SECRET_KEY, algorithms=[settings.FASTAPI_ALGORITHM])
-        username: str = payload.get("sub")
+    with span("auth"):
+        username = token_username(token.credentials)
         if username is None:
             raise credentials_exception
         token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-    
-    admin = await get_admin_by_username(token_data.username)
-    if admin is None or not admin.is_active:
-        raise credentials_exception
+        
+        admin = await get_admin_by_username(token_data.username)
+        if admin is None or not admin.is_active:
+            raise credentials_exception
+    context = current_request.get()
+    if context is not None:
+        context.is_admin = True
     return admin
 
 # Password Reset Functionality
@@ -170,39 +199,42 @@ def generate_reset_code() -> str:
     """Generate a 6-digit numeric code for password reset"""
     return ''.join(secrets.choice(string.digits) for _ in range(6))
 
+async def ensure_auth_indexes():
+    """Indexes for password reset lookups; the TTL index drops codes once they expire"""
+    db = get_database()
+    await db.password_reset_codes.create_index("expires_at", expireAfterSeconds=0)
+    await db.password_reset_codes.create_index([("email", 1), ("code", 1)])
+    # Attempts used to be logged one document each; the rate limiter's counters replace them
+    await db.drop_collection("password_reset_attempts")
+
 async def create_password_reset_code(email: str) -> Optional[str]:
     """Create a password reset code for the given email"""
     db = get_database()
     
-    # Check if admin with email exists
-    admin = await get_admin_by_email(email)
-    if not admin:
-        return None
-    
-    # Check rate limiting - only allow 3 attempts per hour
-    one_hour_ago = datetime.now() - timedelta(hours=1)
-    recent_attempts = await db.password_reset_codes.count_documents({
-        "email": email,
-        "created_at": {"$gte": one_hour_ago}
-    })
-    
-    if recent_attempts >= 3:
+    # Rate limit before the admin lookup so floods cost one counter write and
+    # responses don't reveal which emails exist - only allow 3 requests per hour
+    if await rate_limiter.hit("password_reset_request", email.lower(), RESET_REQUEST_WINDOW_SECONDS) > RESET_REQUEST_LIMIT:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many password reset attempts. Please wait an hour before trying again."
         )
     
+    # Check if admin with email exists
+    admin = await get_admin_by_email(email)
+    if not admin:
+        return None
+    
     # Generate reset code
     code = generate_reset_code()
-    expires_at = datetime.now() + timedelta(minutes=20)
+    now = datetime.utcnow()
     
-    # Store reset code
+    # Store reset code; expires_at is UTC so the TTL index removes it on time
     reset_doc = {
         "email": email,
         "code": code,
-        "expires_at": expires_at,
+        "expires_at": now + timedelta(minutes=RESET_CODE_TTL_MINUTES),
         "used": False,
-        "created_at": datetime.now()
+        "created_at": now
     }
     
     await db.password_reset_codes.insert_one(reset_doc)
@@ -216,16 +248,15 @@ async def create_password_reset_code(email: str) -> Optional[str]:
         return None
 
 async def verify_reset_code(email: str, code: str) -> bool:
-    """Verify a password reset code"""
+    """Verify a password reset code without consuming it"""
     db = get_database()
     
-    # Find valid, unused code
     reset_doc = await db.password_reset_codes.find_one({
         "email": email,
         "code": code,
         "used": False,
-        "expires_at": {"$gte": datetime.now()}
-    })
+        "expires_at": {"$gte": datetime.utcnow()}
+    }, {"_id": 1})
     
     return reset_doc is not None
 
@@ -234,86 +265,54 @@ async def reset_password_with_code(email: str, code: str, new_password: str) ->
     db = get_database()
     
     # Check rate limiting for reset attempts - only allow 5 attempts per 10 minutes
-    ten_minutes_ago = datetime.now() - timedelta(minutes=10)
-    recent_reset_attempts = await db.password_reset_attempts.count_documents({
-        "email": email,
-        "attempted_at": {"$gte": ten_minutes_ago}
-    })
-    
-    if recent_reset_attempts >= 5:
-        # Log the attempt
-        await db.password_reset_attempts.insert_one({
-            "email": email,
-            "attempted_at": datetime.now(),
-            "success": False
-        })
+    if await rate_limiter.hit("password_reset_attempt", email.lower(), RESET_ATTEMPT_WINDOW_SECONDS) > RESET_ATTEMPT_LIMIT:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many reset attempts. Please wait 10 minutes before trying again."
         )
     
-    # Find and verify the code
-    reset_doc = await db.password_reset_codes.find_one({
-        "email": email,
-        "code": code,
-        "used": False,
-        "expires_at": {"$gte": datetime.now()}
-    })
+    # Hash before touching the code, so a shed or failed hash leaves the code usable
+    new_hashed_password = await password_hasher.hash(hash_password_with_salt(new_password))
     
-    if not reset_doc:
-        # Log failed attempt
-        await db.password_reset_attempts.insert_one({
+    # Verify and consume the code in one step, so it can only ever be used once
+    now = datetime.utcnow()
+    reset_doc = await db.password_reset_codes.find_one_and_update(
+        {
             "email": email,
-            "attempted_at": datetime.now(),
-            "success": False
-        })
+            "code": code,
+            "used": False,
+            "expires_at": {"$gte": now}
+        },
+        {"$set": {"used": True, "used_at": now}},
+        projection={"_id": 1}
+    )
+    
+    if not reset_doc:
+        logger.info("Password reset failed: invalid or expired code")
         return False
     
     # Update admin password
-    new_hashed_password = hash_password_with_salt(new_password)
-    result = await db.admin_users.update_one(
-        {"email": email},
-        {
-            "$set": {
-                "password": new_hashed_password,
-                "updated_at": datetime.now()
+    try:
+        result = await db.admin_users.update_one(
+            {"email": email},
+            {
+                "$set": {
+                    "password": new_hashed_password,
+                    "updated_at": datetime.now()
+                }
             }
-        }
-    )
+        )
+    except Exception:
+        # The password is unchanged, so give the code back
+        await db.password_reset_codes.update_one(
+            {"_id": reset_doc["_id"]},
+            {"$set": {"used": False}, "$unset": {"used_at": ""}}
+        )
+        raise
     
-    if result.modified_count == 0:
-        # Log failed attempt
-        await db.password_reset_attempts.insert_one({
-            "email": email,
-            "attempted_at": datetime.now(),
-            "success": False
-        })
+    if result.matched_count == 0:
+        logger.info("Password reset failed: no admin for code")
         return False
     
-    # Mark reset code as used
-    await db.password_reset_codes.update_one(
-        {"_id": reset_doc["_id"]},
-        {"$set": {"used": True}}
-    )
-    
-    # Log successful attempt
-    await db.password_reset_attempts.insert_one({
-        "email": email,
-        "attempted_at": datetime.now(),
-        "success": True
-    })
-    
+    logger.info("Password reset completed")
     return True
-
-async def cleanup_expired_reset_codes():
-    """Clean up expired password reset codes (call this periodically)"""
-    db = get_database()
-    await db.password_reset_codes.delete_many({
-        "expires_at": {"$lt": datetime.now()}
-    })
-    
-    # Also clean up old reset attempts (older than 24 hours)
-    twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
-    await db.password_reset_attempts.delete_many({
-        "attempted_at": {"$lt": twenty_four_hours_ago}
-    })
\ No newline at end of file
@@ -0,0 +1,58 @@
+from app.api.seo import LOCAL_BUSINESS_SCHEMA
+from app.models.litter import Litter, PuppyStatus
+from app.services.active_litter import active_litter_service
+from app.services.frontend import StaticAsset, build_asset, REVALIDATE_CACHE_CONTROL
+from app.services.homepage_publisher import homepage_publisher
+from app.services.prerender import prerender_service
+from app.services.puppy_catalog import puppy_catalog_service
+from fastapi.encoders import jsonable_encoder
+from typing import Optional, Tuple
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE_PUPPIES_LIMIT = 50
+
+class BootstrapService:
+    """Everything the homepage needs for first paint in one payload.
+
+    Litters and puppies are read concurrently; homepage content comes from the
+    published snapshot. The serialized payload is kept until the next write
+    to litters, puppies or homepage (tracked through the prerender cache
+    generation), so repeat requests cost no database work.
+    """
+
+    def __init__(self):
+        self.cached: Optional[Tuple[int, StaticAsset]] = None
+
+    async def get_asset(self) -> StaticAsset:
+        generation = prerender_service.generation
+        if self.cached and self.cached[0] == generation:
+            return self.cached[1]
+
+        current_litter, available_puppies = await asyncio.gather(
+            active_litter_service.find_active(),
+            puppy_catalog_service.list_puppies(status=PuppyStatus.AVAILABLE, limit=AVAILABLE_PUPPIES_LIMIT)
+        )
+        current_litters = []
+        if current_litter:
+            current_litter["id"] = str(current_litter.pop("_id"))
+            current_litters.append(Litter(**current_litter))
+
+        payload = {
+            "homepage": {**homepage_publisher.content, "version": homepage_publisher.version},
+            "current_litters": current_litters,
+            "available_puppies": available_puppies,
+            "local_business": LOCAL_BUSINESS_SCHEMA
+        }
+        body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+        asset = await asyncio.to_thread(build_asset, body, "application/json", REVALIDATE_CACHE_CONTROL, 5, 6)
+
+        # Don't cache a payload built from data that changed while we were reading
+        if generation == prerender_service.generation:
+            self.cached = (generation, asset)
+        return asset
+
+bootstrap_service = BootstrapService()
@@ -1,12 +1,19 @@
 import boto3
 from botocore.exceptions import ClientError
 from app.config.settings import settings
-from typing import Optional
+from app.services.storage_base import StorageBackend
+from app.services.metrics import r2_request_duration, r2_request_errors
+from app.services.request_context import record_span
+from typing import BinaryIO, Optional, List
+import asyncio
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
-class CloudflareR2Service:
+class CloudflareR2Service(StorageBackend):
+    name = "r2"
+    
     def __init__(self):
         self.s3_client = None
         if settings.CLOUDFLARE_R2_ACCESS_KEY_ID and settings.CLOUDFLARE_R2_SECRET_ACCESS_KEY:
@@ -18,38 +25,103 @@ class CloudflareR2Service:
                 region_name=settings.CLOUDFLARE_R2_REGION,
             )
     
-    async def upload_file(self, file_content: bytes, file_name: str, content_type: str) -> Optional[str]:
+    @property
+    def is_configured(self) -> bool:
+        return self.s3_client is not None
+    
+    async def _request(self, operation: str, func, *args, **kwargs):
+        """Run a blocking client call off the event loop, recording its latency and failures"""
+        started = time.perf_counter()
+        try:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        except Exception:
+            r2_request_errors.inc(operation)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            r2_request_duration.observe(elapsed, operation)
+            record_span("r2", elapsed)
+    
+    def get_public_url(self, file_name: str) -> str:
+        """Build the public URL for an object key"""
+        if settings.CLOUDFLARE_R2_PUBLIC_URL:
+            return f"{settings.CLOUDFLARE_R2_PUBLIC_URL}/{file_name}"
+        return f"https://pub-{settings.CLOUDFLARE_R2_BUCKET_NAME}.r2.dev/{file_name}"
+    
+    async def upload_file(self, file_content: bytes, file_name: str, content_type: str, cache_control: Optional[str] = None) -> Optional[str]:
         """Upload file to Cloudflare R2 and return public URL"""
         if not self.s3_client:
             logger.warning("Cloudflare R2 not configured")
             return None
             
         try:
-            self.s3_client.put_object(
-                Bucket=settings.CLOUDFLARE_R2_BUCKET_NAME,
-                Key=file_name,
-                Body=file_content,
-                ContentType=content_type
-            )
+            put_kwargs = {
+                "Bucket": settings.CLOUDFLARE_R2_BUCKET_NAME,
+                "Key": file_name,
+                "Body": file_content,
+                "ContentType": content_type,
+            }
+            if cache_control:
+                put_kwargs["CacheControl"] = cache_control
+            await self._request("put_object", self.s3_client.put_object, **put_kwargs)
             
             # Return public URL using env variable
-            if settings.CLOUDFLARE_R2_PUBLIC_URL:
-                public_url = f"{settings.CLOUDFLARE_R2_PUBLIC_URL}/{file_name}"
-            else:
-                public_url = f"https://pub-{settings.CLOUDFLARE_R2_BUCKET_NAME}.r2.dev/{file_name}"
-            return public_url
+            return self.get_public_url(file_name)
             
         except ClientError as e:
             logger.error(f"Error uploading to R2: {e}")
             return None
     
+    async def upload_stream(self, file_obj: BinaryIO, file_name: str, content_type: str, cache_control: Optional[str] = None) -> Optional[str]:
+        """Stream a file-like object to R2 using multipart upload for large bodies"""
+        if not self.s3_client:
+            logger.warning("Cloudflare R2 not configured")
+            return None
+        
+        extra_args = {"ContentType": content_type}
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        try:
+            await self._request(
+                "upload_fileobj",
+                self.s3_client.upload_fileobj,
+                file_obj,
+                settings.CLOUDFLARE_R2_BUCKET_NAME,
+                file_name,
+                ExtraArgs=extra_args
+            )
+            return self.get_public_url(file_name)
+        except ClientError as e:
+            logger.error(f"Error streaming upload to R2: {e}")
+            return None
+    
+    async def download_file(self, file_name: str, destination: str) -> bool:
+        """Download an object to a local path"""
+        if not self.s3_client:
+            return False
+        
+        try:
+            await self._request(
+                "download_file",
+                self.s3_client.download_file,
+                settings.CLOUDFLARE_R2_BUCKET_NAME,
+                file_name,
+                destination
+            )
+            return True
+        except ClientError as e:
+            logger.error(f"Error downloading from R2: {e}")
+            return False
+    
     async def delete_file(self, file_name: str) -> bool:
         """Delete file from Cloudflare R2"""
         if not self.s3_client:
             return False
             
         try:
-            self.s3_client.delete_object(
+            await self._request(
+                "delete_object",
+                self.s3_client.delete_object,
                 Bucket=settings.CLOUDFLARE_R2_BUCKET_NAME,
                 Key=file_name
             )
@@ -57,5 +129,69 @@ class CloudflareR2Service:
         except ClientError as e:
             logger.error(f"Error deleting from R2: {e}")
             return False
+    
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        """Delete objects in batches of 1000 and return the keys that were removed"""
+        if not self.s3_client or not file_names:
+            return []
+        
+        deleted = []
+        for start in range(0, len(file_names), 1000):
+            batch = file_names[start:start + 1000]
+            try:
+                response = await self._request(
+                    "delete_objects",
+                    self.s3_client.delete_objects,
+                    Bucket=settings.CLOUDFLARE_R2_BUCKET_NAME,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": False}
+                )
+                deleted.extend(obj["Key"] for obj in response.get("Deleted", []))
+                for error in response.get("Errors", []):
+                    r2_request_errors.inc("delete_objects")
+                    logger.error(f"Error deleting {error.get('Key')} from R2: {error.get('Message')}")
+            except ClientError as e:
+                logger.error(f"Error batch deleting from R2: {e}")
+        return deleted
+    
+    async def list_files(self, prefix: str = "") -> List[dict]:
+        """List every object under a prefix as {key, last_modified, size}"""
+        if not self.s3_client:
+            return []
+        
+        def _list():
+            objects = []
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=settings.CLOUDFLARE_R2_BUCKET_NAME, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    objects.append({
+                        "key": obj["Key"],
+                        "last_modified": obj["LastModified"],
+                        "size": obj["Size"]
+                    })
+            return objects
+        
+        try:
+            return await asyncio.to_thread(_list)
+        except ClientError as e:
+            logger.error(f"Error listing R2 objects: {e}")
+            return []
+    
+    async def generate_presigned_url(self, file_name: str, method: str = "get", expires_in: int = 3600, content_type: Optional[str] = None) -> Optional[str]:
+        """Presigned GET or PUT URL for direct client access"""
+        if not self.s3_client:
+            return None
+        
+        params = {"Bucket": settings.CLOUDFLARE_R2_BUCKET_NAME, "Key": file_name}
+        if method == "put" and content_type:
+            params["ContentType"] = content_type
+        try:
+            return self.s3_client.generate_presigned_url(
+                "put_object" if method == "put" else "get_object",
+                Params=params,
+                ExpiresIn=expires_in
+            )
+        except ClientError as e:
+            logger.error(f"Error presigning R2 URL: {e}")
+            return None
 
-r2_service = CloudflareR2Service()
\ No newline at end of file
+r2_service = CloudflareR2Service()
@@ -0,0 +1,120 @@
+from app.config.settings import settings
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Iterable, Tuple
+import asyncio
+import hashlib
+import math
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on tracked fingerprints and addresses so a flood cannot grow memory without limit
+MAX_TRACKED_KEYS = 10000
+
+class ContactRateLimited(Exception):
+    """Too many recent submissions from one address"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many contact submissions")
+        self.retry_after = retry_after
+
+def normalize_message(message: str) -> str:
+    """Case, punctuation and whitespace folded away so trivial edits still match"""
+    return " ".join(re.findall(r"\w+", message.lower()))
+
+def submission_fingerprint(email: str, message: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(email.strip().lower().encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_message(message).encode("utf-8"))
+    return digest.digest()
+
+class ContactSubmissionFilter:
+    """In-memory front line for the public contact form.
+
+    A repeat of a recent submission (same email and normalized message
+    within `duplicate_window` seconds) is merged into the original: it waits
+    for and returns the original's result, including while the original is
+    still being saved, so double clicks never produce a second document or
+    email. New submissions are limited per email and per client IP over
+    `rate_window` seconds. Both checks are dictionary lookups, so rejected
+    traffic never reaches Mongo or SMTP.
+
+    State is per process; with several workers each enforces its own limits.
+    """
+
+    def __init__(self, duplicate_window: int, rate_window: int, max_per_email: int, max_per_ip: int):
+        self.duplicate_window = duplicate_window
+        self.rate_window = rate_window
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        # fingerprint -> (expires_at, future result of the original submission), oldest first
+        self.recent: "OrderedDict[bytes, Tuple[float, asyncio.Future]]" = OrderedDict()
+        # address -> accepted submission times, least recently used first
+        self.velocity: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def expire(self, now: float):
+        while self.recent:
+            _, (expires_at, _) = next(iter(self.recent.items()))
+            if expires_at > now and len(self.recent) <= MAX_TRACKED_KEYS:
+                break
+            self.recent.popitem(last=False)
+        while self.velocity:
+            _, times = next(iter(self.velocity.items()))
+            if times[-1] > now - self.rate_window and len(self.velocity) <= MAX_TRACKED_KEYS:
+                break
+            self.velocity.popitem(last=False)
+
+    def check_velocity(self, limits: Iterable[Tuple[str, int]], now: float):
+        for address, limit in limits:
+            times = self.velocity.get(address)
+            if not times:
+                continue
+            while times and times[0] <= now - self.rate_window:
+                times.popleft()
+            if len(times) >= limit:
+                raise ContactRateLimited(math.ceil(times[0] + self.rate_window - now))
+
+    def record(self, addresses: Iterable[str], now: float):
+        for address in addresses:
+            self.velocity.setdefault(address, deque()).append(now)
+            self.velocity.move_to_end(address)
+
+    async def submit(self, email: str, message: str, client_ip: str, handler: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `handler` for a new submission, or return the original's result for a duplicate"""
+        now = time.monotonic()
+        self.expire(now)
+
+        fingerprint = submission_fingerprint(email, message)
+        entry = self.recent.get(fingerprint)
+        if entry is not None:
+            result = await asyncio.shield(entry[1])
+            if result is not None:
+                logger.info("Merged duplicate contact submission")
+                return result
+            # The original failed and was forgotten; handle this one normally
+            return await self.submit(email, message, client_ip, handler)
+
+        limits = ((f"email:{email.strip().lower()}", self.max_per_email), (f"ip:{client_ip}", self.max_per_ip))
+        self.check_velocity(limits, now)
+
+        future = asyncio.get_running_loop().create_future()
+        self.recent[fingerprint] = (now + self.duplicate_window, future)
+        self.record((address for address, _ in limits), now)
+        try:
+            result = await handler()
+        except BaseException:
+            self.recent.pop(fingerprint, None)
+            future.set_result(None)
+            raise
+        future.set_result(result)
+        return result
+
+contact_filter = ContactSubmissionFilter(
+    duplicate_window=settings.CONTACT_DUPLICATE_WINDOW_SECONDS,
+    rate_window=settings.CONTACT_RATE_WINDOW_SECONDS,
+    max_per_email=settings.CONTACT_MAX_PER_EMAIL,
+    max_per_ip=settings.CONTACT_MAX_PER_IP
+)
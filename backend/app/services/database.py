@@ -1,5 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config.settings import settings
+from app.services.mongo_monitoring import event_listeners
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +14,7 @@ db_service = DatabaseService()
 async def connect_to_mongo():
     """Create database connection"""
     try:
-        db_service.client = AsyncIOMotorClient(settings.MONGODB_CONNECTION_STRING)
+        db_service.client = AsyncIOMotorClient(settings.MONGODB_CONNECTION_STRING, event_listeners=event_listeners())
         db_service.database = db_service.client[settings.MONGODB_DATABASE_NAME]
         logger.info("Connected to MongoDB")
     except Exception as e:
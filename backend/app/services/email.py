@@ -2,6 +2,9 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config.settings import settings
+from app.services.metrics import smtp_send_duration
+from app.services.request_context import record_span
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,10 +38,18 @@ class EmailService:
                 msg.attach(MIMEText(body, 'plain'))
 
             # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            started = time.perf_counter()
+            outcome = "failure"
+            try:
+                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
+                    server.starttls()
+                    server.login(self.username, self.password)
+                    server.send_message(msg)
+                outcome = "success"
+            finally:
+                elapsed = time.perf_counter() - started
+                smtp_send_duration.observe(elapsed, outcome)
+                record_span("smtp", elapsed)
 
             logger.info(f"Email sent successfully to {to_email}")
             return True
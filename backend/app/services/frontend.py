@@ -0,0 +1,156 @@
+from fastapi import Request
+from fastapi.responses import Response
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+import gzip
+import hashlib
+import mimetypes
+import re
+import logging
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# CRA emits content-hashed names like main.3f2a9c1b.js and 787.1a2b3c4d.chunk.css
+HASHED_ASSET_PATTERN = re.compile(r"\.[0-9a-f]{8,}\.")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "image/x-icon",
+    "image/vnd.microsoft.icon",
+)
+
+# Below this size the encoding overhead outweighs the savings
+MIN_COMPRESS_SIZE = 1024
+
+@dataclass
+class StaticAsset:
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+def choose_encoding(accept_encoding: str, available) -> Optional[str]:
+    """Pick the best available coding the client accepts, preferring brotli"""
+    codings = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = codings.get(coding, codings.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def build_asset(body: bytes, media_type: str, cache_control: str, brotli_quality: int = 11, gzip_level: int = 9) -> StaticAsset:
+    """Wrap a body with its ETag and any smaller brotli/gzip encodings"""
+    asset = StaticAsset(
+        body=body,
+        media_type=media_type,
+        etag=hashlib.sha256(body).hexdigest()[:32],
+        cache_control=cache_control
+    )
+    if len(body) >= MIN_COMPRESS_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+        if brotli is not None:
+            encoded = brotli.compress(body, quality=brotli_quality)
+            if len(encoded) < len(body):
+                asset.encoded["br"] = encoded
+        encoded = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        if len(encoded) < len(body):
+            asset.encoded["gzip"] = encoded
+    return asset
+
+class FrontendAssets:
+    """In-memory, precompressed copy of the React build.
+
+    Every file is read once at startup, compressed to brotli and gzip when
+    that saves bytes, and served from memory with a strong ETag. Hashed
+    assets under `static/` get an immutable cache lifetime; everything else
+    (including the `index.html` shell) must be revalidated.
+    """
+
+    def __init__(self, build_dir: Path):
+        self.build_dir = build_dir
+        self.assets: Dict[str, StaticAsset] = {}
+
+    def load(self):
+        assets = {}
+        original_size = compressed_size = 0
+        for path in sorted(p for p in self.build_dir.rglob("*") if p.is_file()):
+            relative_path = path.relative_to(self.build_dir).as_posix()
+            body = path.read_bytes()
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            is_hashed = relative_path.startswith("static/") and HASHED_ASSET_PATTERN.search(path.name)
+            asset = build_asset(
+                body,
+                media_type,
+                IMMUTABLE_CACHE_CONTROL if is_hashed else REVALIDATE_CACHE_CONTROL
+            )
+            original_size += len(body)
+            compressed_size += min([len(body), *map(len, asset.encoded.values())])
+            assets[relative_path] = asset
+
+        self.assets = assets
+        logger.info(
+            f"Loaded {len(assets)} frontend assets "
+            f"({original_size} bytes, {compressed_size} bytes compressed)"
+        )
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self.assets.get(path.lstrip("/"))
+
+    def build_response(self, request: Request, asset: StaticAsset) -> Response:
+        return asset_response(request, asset)
+
+def asset_response(request: Request, asset: StaticAsset) -> Response:
+    """Serve an in-memory asset with content negotiation and If-None-Match handling"""
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), asset.encoded.keys())
+    # Each encoded representation gets its own strong validator
+    headers = {
+        "ETag": f'"{asset.etag}-{encoding}"' if encoding else f'"{asset.etag}"',
+        "Cache-Control": asset.cache_control,
+    }
+    if asset.encoded:
+        headers["Vary"] = "Accept-Encoding"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = [tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")]
+        if any(tag == "*" or tag.split("-")[0] == asset.etag for tag in client_tags):
+            return Response(status_code=304, headers=headers)
+
+    body = asset.body
+    if encoding:
+        body = asset.encoded[encoding]
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type=asset.media_type, headers=headers)
@@ -0,0 +1,129 @@
+from app.services.database import get_database
+from app.services.frontend import StaticAsset, build_asset, REVALIDATE_CACHE_CONTROL
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from pymongo.errors import DuplicateKeyError
+from typing import List, Optional
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOMEPAGE_CONTENT = {
+    "hero_images": [],
+    "sections": [],
+    "meta_title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado | Golden Doodles Near Me | Denver, Utah, Texas",
+    "meta_description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies. Golden doodles near me - Double J's Doodles La Junta CO.",
+    "meta_keywords": "goldendoodle breeder, golden doodles near me, goldendoodle puppies Colorado, goldendoodle breeder Colorado, goldendoodle puppies Denver, goldendoodle Utah, goldendoodle Texas, La Junta Colorado breeder, health tested goldendoodle, home raised puppies",
+    "canonical_url": "https://doublejsdoodles.com",
+    "og_title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado",
+    "og_description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies ready for loving homes.",
+    "og_image": "https://doublejsdoodles.com/logo512.png",
+    "twitter_title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado",
+    "twitter_description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies.",
+    "schema_org": {
+        "@context": "https://schema.org",
+        "@type": "LocalBusiness",
+        "name": "Double J's Doodles",
+        "description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas.",
+        "address": {
+            "@type": "PostalAddress",
+            "addressLocality": "La Junta",
+            "addressRegion": "CO",
+            "addressCountry": "US"
+        },
+        "areaServed": ["Colorado", "Utah", "Texas", "Denver", "Colorado Springs"]
+    }
+}
+
+# Draft bookkeeping that never appears in a published snapshot
+DRAFT_ONLY_FIELDS = ("_id", "published_version", "published_at", "published_by")
+
+def active_in_order(items: List[dict]) -> List[dict]:
+    return sorted((item for item in items if item.get("is_active", True)), key=lambda item: item.get("order", 0))
+
+def build_published_content(draft_doc: dict) -> dict:
+    """Public homepage content from a draft: inactive entries dropped, the rest sorted by order"""
+    content = {k: v for k, v in draft_doc.items() if k not in DRAFT_ONLY_FIELDS}
+    content["hero_images"] = active_in_order(draft_doc.get("hero_images", []))
+    content["sections"] = active_in_order(draft_doc.get("sections", []))
+    return content
+
+def build_snapshot_asset(version: int, content: dict, published_at: Optional[datetime]) -> StaticAsset:
+    payload = {**content, "version": version, "published_at": published_at}
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+    return build_asset(body, "application/json", REVALIDATE_CACHE_CONTROL, 5, 6)
+
+class HomepagePublisher:
+    """Versioned, immutable homepage snapshots served from memory.
+
+    Admin edits go to the draft (the `homepage` document). Publishing copies
+    the draft into `homepage_snapshots` under the next version number and
+    swaps in a pre-serialized, precompressed copy, so public reads never
+    touch the database.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.content: dict = DEFAULT_HOMEPAGE_CONTENT
+        self.asset: StaticAsset = build_snapshot_asset(0, DEFAULT_HOMEPAGE_CONTENT, None)
+        self.publish_lock = asyncio.Lock()
+
+    async def load(self):
+        """Load the latest snapshot, publishing the current draft if there is none yet"""
+        db = get_database()
+        snapshot = await db.homepage_snapshots.find_one({}, sort=[("_id", -1)])
+        if snapshot is None:
+            if await db.homepage.find_one({}, {"_id": 1}):
+                await self.publish("system")
+                return
+            await self.set_snapshot(0, DEFAULT_HOMEPAGE_CONTENT, None)
+            return
+        await self.set_snapshot(snapshot["_id"], snapshot["content"], snapshot["published_at"])
+
+    async def set_snapshot(self, version: int, content: dict, published_at: Optional[datetime]):
+        asset = await asyncio.to_thread(build_snapshot_asset, version, content, published_at)
+        self.version, self.content, self.asset = version, content, asset
+
+    async def publish(self, username: str) -> dict:
+        db = get_database()
+        async with self.publish_lock:
+            draft_doc = await db.homepage.find_one() or {}
+            content = build_published_content(draft_doc) if draft_doc else DEFAULT_HOMEPAGE_CONTENT
+            published_at = datetime.utcnow()
+
+            latest = await db.homepage_snapshots.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+            version = (latest["_id"] if latest else 0) + 1
+            while True:
+                try:
+                    await db.homepage_snapshots.insert_one({
+                        "_id": version,
+                        "content": content,
+                        "published_at": published_at,
+                        "published_by": username
+                    })
+                    break
+                except DuplicateKeyError:
+                    # Another process published concurrently; take the next version
+                    version += 1
+
+            if draft_doc:
+                await db.homepage.update_one(
+                    {"_id": draft_doc["_id"]},
+                    {"$set": {"published_version": version, "published_at": published_at, "published_by": username}}
+                )
+            await self.set_snapshot(version, content, published_at)
+
+        logger.info(f"Published homepage version {version}")
+        return {"version": version, "published_at": published_at, "published_by": username}
+
+    async def list_versions(self, limit: int = 20) -> List[dict]:
+        db = get_database()
+        cursor = db.homepage_snapshots.find({}, {"published_at": 1, "published_by": 1}).sort("_id", -1).limit(limit)
+        return [
+            {"version": doc["_id"], "published_at": doc["published_at"], "published_by": doc.get("published_by")}
+            async for doc in cursor
+        ]
+
+homepage_publisher = HomepagePublisher()
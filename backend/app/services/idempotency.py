@@ -0,0 +1,73 @@
+from app.services.database import get_database
+from app.config.settings import settings
+from bson import Binary
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from typing import List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IdempotencyStore:
+    """Request fingerprints and stored responses for Idempotency-Key replays.
+
+    A key is claimed by inserting an `in_flight` record, so the unique `_id`
+    decides which of several concurrent duplicates runs. Completed records
+    keep the response for `IDEMPOTENCY_TTL_SECONDS`; in-flight claims expire
+    after `IDEMPOTENCY_LEASE_SECONDS` so a crashed request cannot hold its
+    key forever. A TTL index removes both.
+    """
+
+    async def ensure_indexes(self):
+        db = get_database()
+        await db.idempotency_keys.create_index("expires_at", expireAfterSeconds=0)
+
+    async def claim(self, key_id: str, fingerprint: str) -> Optional[dict]:
+        """Claim a key for a new request. Returns None on success, else the existing record"""
+        db = get_database()
+        while True:
+            now = datetime.utcnow()
+            claim_doc = {
+                "fingerprint": fingerprint,
+                "status": "in_flight",
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+            }
+            try:
+                await db.idempotency_keys.insert_one({"_id": key_id, **claim_doc})
+                return None
+            except DuplicateKeyError:
+                pass
+
+            # The TTL monitor only runs once a minute; take over a record that has already expired
+            result = await db.idempotency_keys.replace_one({"_id": key_id, "expires_at": {"$lte": now}}, claim_doc)
+            if result.modified_count:
+                return None
+
+            existing = await db.idempotency_keys.find_one({"_id": key_id})
+            if existing is not None:
+                return existing
+            # Removed between our insert and read; try again
+
+    async def complete(self, key_id: str, status: int, headers: List[Tuple[str, str]], body: bytes):
+        db = get_database()
+        now = datetime.utcnow()
+        await db.idempotency_keys.update_one(
+            {"_id": key_id},
+            {"$set": {
+                "status": "completed",
+                "response": {"status": status, "headers": headers, "body": Binary(body)},
+                "completed_at": now,
+                "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            }}
+        )
+
+    async def release(self, key_id: str):
+        """Forget an in-flight claim so the client may retry"""
+        db = get_database()
+        try:
+            await db.idempotency_keys.delete_one({"_id": key_id, "status": "in_flight"})
+        except Exception as e:
+            logger.error(f"Failed to release idempotency key: {e}")
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,97 @@
+from app.config.settings import settings
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Optional
+import asyncio
+import base64
+import io
+import logging
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+LQIP_SIZE = 16
+LQIP_QUALITY = 60
+PALETTE_SAMPLE_SIZE = 64
+PALETTE_COLORS = 8
+# EXIF orientations that rotate the image by 90 degrees
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+def extract_image_metadata(data: bytes) -> dict:
+    """Display size, dominant colour and a tiny base64 placeholder for an image.
+
+    Runs in a worker process. JPEGs are decoded at reduced scale via draft
+    mode, since only thumbnails are needed beyond the header dimensions.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        width, height = img.size
+        if img.getexif().get(0x0112) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+
+        img.draft("RGB", (PALETTE_SAMPLE_SIZE, PALETTE_SAMPLE_SIZE))
+        sample = ImageOps.exif_transpose(img)
+        if sample.mode in ("RGBA", "LA", "P"):
+            sample = sample.convert("RGBA")
+            background = Image.new("RGBA", sample.size, (255, 255, 255, 255))
+            sample = Image.alpha_composite(background, sample)
+        sample = sample.convert("RGB")
+        sample.thumbnail((PALETTE_SAMPLE_SIZE, PALETTE_SAMPLE_SIZE))
+
+    palette_image = sample.quantize(colors=PALETTE_COLORS)
+    _, index = max(palette_image.getcolors())
+    r, g, b = palette_image.getpalette()[index * 3:index * 3 + 3]
+
+    placeholder = sample.copy()
+    placeholder.thumbnail((LQIP_SIZE, LQIP_SIZE))
+    buffer = io.BytesIO()
+    placeholder.save(buffer, "JPEG", quality=LQIP_QUALITY, optimize=True)
+
+    return {
+        "width": width,
+        "height": height,
+        "dominant_color": f"#{r:02x}{g:02x}{b:02x}",
+        "lqip": "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+    }
+
+class ImageMetadataService:
+    """Computes image metadata for uploads on a pool of worker processes.
+
+    Decoding is CPU-bound and holds the GIL, so it runs off the event loop
+    in separate processes. Failures are logged and yield no metadata rather
+    than failing the upload.
+    """
+
+    def __init__(self):
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=settings.IMAGE_METADATA_WORKERS)
+        return self.executor
+
+    def stop(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def describe(self, file_obj: BinaryIO) -> Optional[dict]:
+        """Metadata for an image file object, leaving it rewound for upload"""
+        if not self.available:
+            return None
+        data = await asyncio.to_thread(file_obj.read)
+        file_obj.seek(0)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get_executor(), extract_image_metadata, data)
+        except Exception as e:
+            logger.warning(f"Could not extract image metadata: {e}")
+            return None
+
+image_metadata_service = ImageMetadataService()
@@ -0,0 +1,109 @@
+from app.services.database import get_database
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from typing import Optional, Tuple
+import asyncio
+import base64
+import logging
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_LENGTH = 160
+
+# Newest first; _id breaks ties between inquiries submitted in the same millisecond
+INBOX_SORT = [("submitted_at", -1), ("_id", -1)]
+
+# List view fields; the message body is reduced to a short preview
+INBOX_PROJECTION = {
+    "name": 1, "email": 1, "phone": 1, "subject": 1,
+    "puppy_name": 1, "litter_name": 1,
+    "submitted_at": 1, "responded": 1, "responded_at": 1,
+    "preview": {"$substrCP": ["$message", 0, PREVIEW_LENGTH]},
+}
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(contact_doc: dict) -> str:
+    raw = f"{contact_doc['submitted_at'].isoformat()}|{contact_doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        submitted_at, contact_id = raw.split("|")
+        return datetime.fromisoformat(submitted_at), ObjectId(contact_id)
+    except (ValueError, InvalidId) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+def build_inbox_query(
+    responded: Optional[bool] = None,
+    puppy_name: Optional[str] = None,
+    litter_name: Optional[str] = None,
+    submitted_after: Optional[datetime] = None,
+    submitted_before: Optional[datetime] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> dict:
+    query = {}
+    if responded is not None:
+        query["responded"] = responded
+    if puppy_name:
+        query["puppy_name"] = puppy_name
+    if litter_name:
+        query["litter_name"] = litter_name
+    if submitted_after or submitted_before:
+        query["submitted_at"] = {}
+        if submitted_after:
+            query["submitted_at"]["$gte"] = submitted_after
+        if submitted_before:
+            query["submitted_at"]["$lte"] = submitted_before
+    if q:
+        query["$text"] = {"$search": q}
+    if cursor:
+        # Keyset paging: strictly after the last inquiry of the previous page
+        submitted_at, contact_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"submitted_at": {"$lt": submitted_at}},
+            {"submitted_at": submitted_at, "_id": {"$lt": contact_id}},
+        ]
+    return query
+
+class InquiryInboxService:
+    """Indexed, cursor-paged listing of contact inquiries for the admin inbox.
+
+    Every filter combination leads with an equality field and ends with the
+    (submitted_at, _id) sort key, so pages are served straight off an index
+    without an in-memory sort, and keyset cursors keep deep pages as cheap
+    as the first. Text search uses the contacts text index.
+    """
+
+    async def ensure_indexes(self):
+        db = get_database()
+        await db.contacts.create_index(INBOX_SORT)
+        await db.contacts.create_index([("responded", 1), *INBOX_SORT])
+        await db.contacts.create_index([("puppy_name", 1), *INBOX_SORT])
+        await db.contacts.create_index([("litter_name", 1), *INBOX_SORT])
+
+    async def list(self, limit: int = 25, **filters) -> dict:
+        """One page of inquiry summaries plus the cursor for the next page"""
+        db = get_database()
+        query = build_inbox_query(**filters)
+
+        docs, unresponded_count = await asyncio.gather(
+            db.contacts.find(query, INBOX_PROJECTION).sort(INBOX_SORT).limit(limit + 1).to_list(length=limit + 1),
+            self.unresponded_count()
+        )
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]) if has_more else None
+        for contact_doc in docs:
+            contact_doc["id"] = str(contact_doc.pop("_id"))
+        return {"inquiries": docs, "next_cursor": next_cursor, "unresponded_count": unresponded_count}
+
+    async def unresponded_count(self) -> int:
+        db = get_database()
+        return await db.contacts.count_documents({"responded": False})
+
+inquiry_inbox_service = InquiryInboxService()
@@ -0,0 +1,143 @@
+from app.config.settings import settings
+from app.services.storage_base import StorageBackend
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+from urllib.parse import urlencode
+import asyncio
+import hashlib
+import io
+import hmac
+import os
+import shutil
+import tempfile
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+class LocalStorageService(StorageBackend):
+    """Filesystem storage for local development and offline load testing.
+
+    Objects live under LOCAL_STORAGE_PATH and are served by the `/api/storage`
+    route. Writes go to a temporary file first and are renamed into place so
+    readers never observe a partial object.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.root = Path(settings.LOCAL_STORAGE_PATH).resolve()
+
+    def get_public_url(self, file_name: str) -> str:
+        return f"{settings.LOCAL_STORAGE_PUBLIC_URL.rstrip('/')}/{file_name}"
+
+    def resolve_path(self, file_name: str) -> Optional[Path]:
+        """Map a key to a path inside the storage root, rejecting traversal"""
+        path = (self.root / file_name).resolve()
+        if path == self.root or self.root not in path.parents:
+            return None
+        return path
+
+    def _write(self, file_obj: BinaryIO, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per call, so concurrent writes of the same key never share one
+        fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as destination:
+                shutil.copyfileobj(file_obj, destination, CHUNK_SIZE)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    async def upload_file(self, file_content: bytes, file_name: str, content_type: str, cache_control: Optional[str] = None) -> Optional[str]:
+        return await self.upload_stream(io.BytesIO(file_content), file_name, content_type, cache_control)
+
+    async def upload_stream(self, file_obj: BinaryIO, file_name: str, content_type: str, cache_control: Optional[str] = None) -> Optional[str]:
+        path = self.resolve_path(file_name)
+        if not path:
+            return None
+        try:
+            await asyncio.to_thread(self._write, file_obj, path)
+            return self.get_public_url(file_name)
+        except OSError as e:
+            logger.error(f"Error writing {file_name} to local storage: {e}")
+            return None
+
+    async def download_file(self, file_name: str, destination: str) -> bool:
+        path = self.resolve_path(file_name)
+        if not path or not path.is_file():
+            return False
+        await asyncio.to_thread(shutil.copyfile, path, destination)
+        return True
+
+    async def delete_file(self, file_name: str) -> bool:
+        path = self.resolve_path(file_name)
+        if not path:
+            return False
+        try:
+            await asyncio.to_thread(path.unlink)
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        def _delete_all():
+            deleted = []
+            for file_name in file_names:
+                path = self.resolve_path(file_name)
+                if not path:
+                    continue
+                try:
+                    path.unlink()
+                    deleted.append(file_name)
+                except FileNotFoundError:
+                    pass
+            return deleted
+
+        return await asyncio.to_thread(_delete_all)
+
+    async def list_files(self, prefix: str = "") -> List[dict]:
+        def _list():
+            # Walk only the directory containing the prefix
+            start = self.root / prefix.rsplit("/", 1)[0] if "/" in prefix else self.root
+            objects = []
+            for directory, _, files in os.walk(start):
+                for name in files:
+                    if name.endswith(".tmp"):
+                        continue
+                    path = Path(directory) / name
+                    key = path.relative_to(self.root).as_posix()
+                    if not key.startswith(prefix):
+                        continue
+                    stat = path.stat()
+                    objects.append({
+                        "key": key,
+                        "last_modified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                        "size": stat.st_size
+                    })
+            return objects
+
+        return await asyncio.to_thread(_list)
+
+    def sign(self, file_name: str, method: str, expires: int) -> str:
+        message = f"{method}:{file_name}:{expires}".encode()
+        return hmac.new(settings.FASTAPI_SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, file_name: str, method: str, expires: int, signature: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.sign(file_name, method, expires), signature)
+
+    async def generate_presigned_url(self, file_name: str, method: str = "get", expires_in: int = 3600, content_type: Optional[str] = None) -> Optional[str]:
+        expires = int(time.time()) + expires_in
+        query = urlencode({"expires": expires, "signature": self.sign(file_name, method, expires)})
+        return f"{self.get_public_url(file_name)}?{query}"
+
+local_storage_service = LocalStorageService()
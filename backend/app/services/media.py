@@ -0,0 +1,215 @@
+from fastapi import HTTPException, UploadFile
+from pymongo import ReturnDocument
+from app.services.database import get_database
+from app.services.storage import storage_service
+from app.services.image_metadata import image_metadata_service
+from datetime import datetime
+from typing import BinaryIO, List, Optional
+import hashlib
+import io
+import mimetypes
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Content-addressed objects never change, so CDNs and browsers may cache them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def compute_content_hash(file_content: bytes) -> str:
+    """SHA-256 hex digest used as the identity of a stored media object"""
+    return hashlib.sha256(file_content).hexdigest()
+
+def build_media_key(content_hash: str, extension: str) -> str:
+    """Build the storage key for a content hash, fanned out by prefix"""
+    return f"media/{content_hash[:2]}/{content_hash}{extension}"
+
+def normalize_extension(filename: Optional[str], content_type: str) -> str:
+    """Pick a file extension from the upload filename or its content type"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if not extension:
+        extension = mimetypes.guess_extension(content_type) or ""
+    return extension
+
+class MediaService:
+    """Deduplicating media store backed by object storage and the `media_objects` collection.
+
+    Each stored object is keyed by the SHA-256 of its bytes. The collection
+    tracks how many documents reference each object so shared files (e.g. a
+    parent dog photo used across several litters) are only stored once.
+    """
+
+    async def ensure_indexes(self):
+        """Create indexes used for hash and URL lookups"""
+        db = get_database()
+        await db.media_objects.create_index("url", unique=True)
+        await db.media_objects.create_index("key")
+        await db.media_objects.create_index("ref_count")
+
+    async def find_existing(self, content_hashes: List[str]) -> dict:
+        """Return {hash: {url, content_type}} for hashes already stored"""
+        db = get_database()
+        cursor = db.media_objects.find(
+            {"_id": {"$in": [h.lower() for h in content_hashes]}},
+            {"url": 1, "content_type": 1}
+        )
+        existing = {}
+        async for media_doc in cursor:
+            existing[media_doc["_id"]] = {
+                "url": media_doc["url"],
+                "content_type": media_doc["content_type"]
+            }
+        return existing
+
+    async def reference_object(self, content_hash: str, allowed_types: Optional[List[str]] = None) -> Optional[dict]:
+        """Add a reference to an already stored object and return its url, content type and image metadata"""
+        db = get_database()
+        query = {"_id": content_hash.lower()}
+        if allowed_types is not None:
+            query["content_type"] = {"$in": allowed_types}
+        return await db.media_objects.find_one_and_update(
+            query,
+            {"$inc": {"ref_count": 1}, "$set": {"last_referenced_at": datetime.utcnow()}},
+            projection={"url": 1, "content_type": 1, "image": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def release(self, url: str):
+        """Give back a reference taken by a store or reference call that ended up unused"""
+        db = get_database()
+        await db.media_objects.update_one({"url": url}, {"$inc": {"ref_count": -1}})
+
+    async def reference_existing(self, content_hash: str, allowed_types: Optional[List[str]] = None) -> Optional[str]:
+        """Add a reference to an already stored object and return its URL"""
+        media_doc = await self.reference_object(content_hash, allowed_types)
+        return media_doc["url"] if media_doc else None
+
+    async def store(self, file_content: bytes, content_type: str, extension: str) -> Optional[str]:
+        """Store bytes under their content hash, reusing an existing object if present"""
+        return await self.store_stream(
+            io.BytesIO(file_content),
+            compute_content_hash(file_content),
+            len(file_content),
+            content_type,
+            extension
+        )
+
+    async def store_stream(
+        self,
+        file_obj: BinaryIO,
+        content_hash: str,
+        size: int,
+        content_type: str,
+        extension: str
+    ) -> Optional[str]:
+        """Stream an already hashed file into storage, reusing an existing object if present"""
+        media_doc = await self.store_stream_object(file_obj, content_hash, size, content_type, extension)
+        return media_doc["url"] if media_doc else None
+
+    async def store_stream_object(
+        self,
+        file_obj: BinaryIO,
+        content_hash: str,
+        size: int,
+        content_type: str,
+        extension: str
+    ) -> Optional[dict]:
+        """Like `store_stream`, returning {url, content_type, image}.
+
+        Images get their metadata computed once, when the object is first
+        stored; objects stored before metadata existed are backfilled the
+        next time their bytes are uploaded.
+        """
+        db = get_database()
+        is_image = content_type.startswith("image/")
+
+        existing = await self.reference_object(content_hash)
+        if existing:
+            logger.info(f"Reusing stored media object {content_hash}")
+            if is_image and "image" not in existing:
+                image = await image_metadata_service.describe(file_obj)
+                if image:
+                    await db.media_objects.update_one({"_id": existing["_id"]}, {"$set": {"image": image}})
+                    existing["image"] = image
+            return existing
+
+        image = await image_metadata_service.describe(file_obj) if is_image else None
+
+        key = build_media_key(content_hash, extension)
+        url = await storage_service.upload_stream(file_obj, key, content_type, cache_control=IMMUTABLE_CACHE_CONTROL)
+        if not url:
+            return None
+
+        # Upsert so two concurrent uploads of the same bytes converge on one document
+        now = datetime.utcnow()
+        media_doc = {
+            "key": key,
+            "url": url,
+            "content_type": content_type,
+            "size": size,
+            "created_at": now
+        }
+        if image:
+            media_doc["image"] = image
+        await db.media_objects.update_one(
+            {"_id": content_hash},
+            {
+                "$inc": {"ref_count": 1},
+                "$set": {"last_referenced_at": now},
+                "$setOnInsert": media_doc
+            },
+            upsert=True
+        )
+        return {"_id": content_hash, "url": url, "content_type": content_type, "image": image}
+
+    async def store_upload(
+        self,
+        file: Optional[UploadFile],
+        content_hash: Optional[str],
+        allowed_types: List[str]
+    ) -> Optional[str]:
+        """Resolve an upload request to a stored URL.
+
+        When the client supplies a known `content_hash` the bytes are not needed
+        and `file` may be omitted entirely.
+        """
+        media_doc = await self.store_upload_object(file, content_hash, allowed_types)
+        return media_doc["url"] if media_doc else None
+
+    async def store_upload_object(
+        self,
+        file: Optional[UploadFile],
+        content_hash: Optional[str],
+        allowed_types: List[str]
+    ) -> Optional[dict]:
+        """Like `store_upload`, returning {url, content_type, image}"""
+        if content_hash:
+            existing = await self.reference_object(content_hash, allowed_types)
+            if existing:
+                return existing
+
+        if file is None:
+            raise HTTPException(
+                status_code=400,
+                detail="File is required when content hash is not already stored"
+            )
+
+        # Hash in chunks so large videos are never held in memory
+        hasher = hashlib.sha256()
+        size = 0
+        while chunk := await file.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+            size += len(chunk)
+        await file.seek(0)
+
+        extension = normalize_extension(file.filename, file.content_type)
+        return await self.store_stream_object(file.file, hasher.hexdigest(), size, file.content_type, extension)
+
+    def image_metadata(self, media_doc: dict) -> Optional[dict]:
+        """Image metadata to store next to a URL, or None if it could not be computed"""
+        image = media_doc.get("image")
+        return {"url": media_doc["url"], **image} if image else None
+
+media_service = MediaService()
@@ -0,0 +1,264 @@
+from pymongo import UpdateOne
+from app.services.database import get_database
+from app.services.storage import storage_service
+from app.config.settings import settings
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Only objects under these prefixes are ever considered by the sweep
+MANAGED_PREFIXES = ["media/", "puppies/", "parents/", "homepage/"]
+
+# Largest batch accepted by the S3 DeleteObjects call
+DELETE_BATCH_SIZE = 1000
+
+LITTER_MEDIA_PROJECTION = {
+    "mother.image_url": 1,
+    "father.image_url": 1,
+    "puppies.images": 1,
+    "puppies.videos": 1,
+    "puppies.video_assets": 1
+}
+
+HOMEPAGE_MEDIA_PROJECTION = {
+    "hero_images.image_url": 1,
+    "sections.images": 1
+}
+
+def collect_litter_media_urls(litter_doc: dict) -> List[str]:
+    """Every media URL referenced by a litter document"""
+    urls = []
+    for parent in ("mother", "father"):
+        image_url = (litter_doc.get(parent) or {}).get("image_url")
+        if image_url:
+            urls.append(image_url)
+    for puppy in litter_doc.get("puppies", []):
+        urls.extend(puppy.get("images", []))
+        urls.extend(puppy.get("videos", []))
+        for video_asset in puppy.get("video_assets", []):
+            urls.append(video_asset.get("poster_url"))
+            urls.append(video_asset.get("hls_url"))
+            urls.extend(rendition.get("url") for rendition in video_asset.get("renditions", []))
+    return [url for url in urls if url]
+
+def collect_homepage_media_urls(homepage_doc: dict) -> List[str]:
+    """Every media URL referenced by the homepage document"""
+    urls = [hero.get("image_url") for hero in homepage_doc.get("hero_images", [])]
+    for section in homepage_doc.get("sections", []):
+        urls.extend(section.get("images", []))
+    return [url for url in urls if url]
+
+PUBLISHED_HOMEPAGE_PROJECTION = {f"content.{field}": 1 for field in HOMEPAGE_MEDIA_PROJECTION}
+
+async def find_referenced_urls(urls: Optional[List[str]] = None) -> Set[str]:
+    """Return the subset of `urls` still referenced anywhere, or every referenced URL if None.
+
+    The live homepage snapshot counts as a reference, so media removed from
+    the draft stays in place until a publish stops serving it; the next
+    sweep after that removes it.
+    """
+    db = get_database()
+
+    litter_query = {}
+    homepage_query = {}
+    if urls is not None:
+        if not urls:
+            return set()
+        litter_query = {"$or": [
+            {"mother.image_url": {"$in": urls}},
+            {"father.image_url": {"$in": urls}},
+            {"puppies.images": {"$in": urls}},
+            {"puppies.videos": {"$in": urls}},
+            {"puppies.video_assets.poster_url": {"$in": urls}},
+            {"puppies.video_assets.hls_url": {"$in": urls}},
+            {"puppies.video_assets.renditions.url": {"$in": urls}}
+        ]}
+        homepage_query = {"$or": [{field: {"$in": urls}} for field in HOMEPAGE_MEDIA_PROJECTION]}
+
+    referenced = set()
+    async for litter_doc in db.litters.find(litter_query, LITTER_MEDIA_PROJECTION):
+        referenced.update(collect_litter_media_urls(litter_doc))
+    async for homepage_doc in db.homepage.find(homepage_query, HOMEPAGE_MEDIA_PROJECTION):
+        referenced.update(collect_homepage_media_urls(homepage_doc))
+    snapshot = await db.homepage_snapshots.find_one({}, PUBLISHED_HOMEPAGE_PROJECTION, sort=[("_id", -1)])
+    if snapshot:
+        referenced.update(collect_homepage_media_urls(snapshot.get("content") or {}))
+
+    if urls is not None:
+        referenced &= set(urls)
+    return referenced
+
+class MediaGarbageCollector:
+    """Background worker that removes unreferenced media from storage.
+
+    Request handlers call `schedule_delete` and return immediately; the worker
+    drains the queue in batches, releases content-addressed references, double
+    checks that nothing still points at each URL and then issues batched
+    `delete_files` calls. A periodic sweep reconciles the whole bucket against
+    the `litters` and `homepage` collections and the published homepage to
+    catch anything missed.
+
+    Content-addressed objects are claimed before their bytes are removed: the
+    `media_objects` document is deleted only while its `ref_count` is still
+    zero, so an upload that references the object first keeps it alive.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.next_sweep_at = datetime.now(timezone.utc)
+        self.stats = {
+            "deleted_total": 0,
+            "last_sweep_at": None,
+            "last_sweep_deleted": 0,
+            "last_error": None
+        }
+
+    def schedule_delete(self, *urls: str):
+        """Queue media URLs for deletion once they are no longer referenced"""
+        for url in urls:
+            if url:
+                self.queue.put_nowait(url)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def status(self) -> dict:
+        return {
+            **self.stats,
+            "pending": self.queue.qsize(),
+            "next_sweep_at": self.next_sweep_at
+        }
+
+    async def _run(self):
+        while True:
+            timeout = (self.next_sweep_at - datetime.now(timezone.utc)).total_seconds()
+            try:
+                url = await asyncio.wait_for(self.queue.get(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                await self._safe(self.sweep())
+                continue
+
+            urls = [url]
+            while len(urls) < DELETE_BATCH_SIZE and not self.queue.empty():
+                urls.append(self.queue.get_nowait())
+            await self._safe(self.process_deletions(urls))
+
+    async def _safe(self, coro):
+        try:
+            await coro
+        except Exception as e:
+            self.stats["last_error"] = str(e)
+            logger.error(f"Media GC error: {e}")
+
+    async def process_deletions(self, urls: List[str]) -> List[str]:
+        """Release references for queued URLs and delete those that became orphans"""
+        db = get_database()
+        release_counts = Counter(urls)
+
+        # Drop one reference per queued URL for content-addressed objects
+        await db.media_objects.bulk_write(
+            [UpdateOne({"url": url}, {"$inc": {"ref_count": -count}}) for url, count in release_counts.items()],
+            ordered=False
+        )
+        still_shared = set()
+        async for media_doc in db.media_objects.find(
+            {"url": {"$in": list(release_counts)}, "ref_count": {"$gt": 0}}, {"url": 1}
+        ):
+            still_shared.add(media_doc["url"])
+
+        candidates = [url for url in release_counts if url not in still_shared]
+        referenced = await find_referenced_urls(candidates)
+        orphans = [url for url in candidates if url not in referenced]
+
+        tracked = {}
+        async for media_doc in db.media_objects.find({"url": {"$in": orphans}}, {"url": 1}):
+            tracked[media_doc["url"]] = media_doc["_id"]
+        claimed = await self._claim(tracked.values())
+
+        keys = [
+            storage_service.get_key_from_url(url) for url in orphans
+            if url not in tracked or tracked[url] in claimed
+        ]
+        return await self._delete_keys(key for key in keys if key)
+
+    async def sweep(self) -> List[str]:
+        """Delete every managed object that no document references"""
+        self.next_sweep_at = datetime.now(timezone.utc) + timedelta(seconds=settings.MEDIA_GC_INTERVAL_SECONDS)
+
+        referenced_keys = {
+            storage_service.get_key_from_url(url) for url in await find_referenced_urls()
+        }
+        # Skip fresh objects whose owning document may not have been written yet
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.MEDIA_GC_GRACE_PERIOD_SECONDS)
+
+        # HLS segments are only reachable through their playlist, so keep the whole directory
+        referenced_dirs = tuple(
+            key.rsplit("/", 1)[0] + "/" for key in referenced_keys if key and key.endswith(".m3u8")
+        )
+
+        orphans = []
+        for prefix in MANAGED_PREFIXES:
+            for obj in await storage_service.list_files(prefix):
+                if obj["key"] in referenced_keys or obj["key"].startswith(referenced_dirs):
+                    continue
+                if obj["last_modified"] < cutoff:
+                    orphans.append(obj["key"])
+
+        # A reused object can be old in storage yet freshly referenced by an
+        # upload whose document is not written yet, so only claim objects
+        # nobody has referenced since the cutoff
+        tracked = {}
+        async for media_doc in get_database().media_objects.find({"key": {"$in": orphans}}, {"key": 1}):
+            tracked[media_doc["key"]] = media_doc["_id"]
+        claimed = await self._claim(tracked.values(), {"$or": [
+            {"last_referenced_at": {"$lt": cutoff}},
+            {"last_referenced_at": {"$exists": False}}
+        ]})
+
+        deleted = await self._delete_keys(
+            key for key in orphans if key not in tracked or tracked[key] in claimed
+        )
+        self.stats["last_sweep_at"] = datetime.now(timezone.utc)
+        self.stats["last_sweep_deleted"] = len(deleted)
+        logger.info(f"Media GC sweep removed {len(deleted)} orphaned objects")
+        return deleted
+
+    async def _claim(self, content_hashes: Iterable[str], extra_query: Optional[dict] = None) -> Set[str]:
+        """Atomically remove the `media_objects` documents that are still unreferenced.
+
+        Returns the hashes actually claimed; a concurrent `reference_object`
+        either wins and keeps its object, or finds no document and stores the
+        bytes again.
+        """
+        db = get_database()
+        claimed = set()
+        for content_hash in content_hashes:
+            query = {"_id": content_hash, "ref_count": {"$lte": 0}, **(extra_query or {})}
+            if await db.media_objects.find_one_and_delete(query, projection={"_id": 1}):
+                claimed.add(content_hash)
+        return claimed
+
+    async def _delete_keys(self, keys: Iterable[str]) -> List[str]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return []
+        deleted = await storage_service.delete_files(keys)
+        self.stats["deleted_total"] += len(deleted)
+        return deleted
+
+media_gc = MediaGarbageCollector()
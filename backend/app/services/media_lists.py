@@ -0,0 +1,58 @@
+from typing import Any, Dict, List
+
+# Large enough to mean "the rest of the array" for $slice
+SLICE_REST = 2 ** 31 - 1
+
+def without_index(list_expression: str, index: int) -> Dict[str, Any]:
+    """Aggregation expression for a list with the element at `index` removed"""
+    tail = {"$slice": [list_expression, index + 1, SLICE_REST]}
+    if index == 0:
+        return tail
+    return {"$concatArrays": [{"$slice": [list_expression, index]}, tail]}
+
+def without_url(meta_expression: str, url_expression: Any) -> Dict[str, Any]:
+    """Aggregation expression for a metadata list with the entry for `url_expression` removed"""
+    return {"$filter": {
+        "input": {"$ifNull": [meta_expression, []]},
+        "as": "meta",
+        "cond": {"$ne": ["$$meta.url", url_expression]}
+    }}
+
+def update_nested_fields(array_field: str, element_id: str, expression_builders: Dict[str, Any]) -> List[dict]:
+    """Pipeline update rewriting fields on the `array_field` element with `id == element_id`.
+
+    Each builder receives the path of the current element ("$$item") and
+    returns the expression for its field's new value. All builders see the
+    element as it was before the update.
+    """
+    return [{"$set": {array_field: {"$map": {
+        "input": f"${array_field}",
+        "as": "item",
+        "in": {"$cond": [
+            {"$eq": ["$$item.id", element_id]},
+            {"$mergeObjects": ["$$item", {
+                field: builder("$$item") for field, builder in expression_builders.items()
+            }]},
+            "$$item"
+        ]}
+    }}}}]
+
+def update_nested_list(array_field: str, element_id: str, list_field: str, expression_builder) -> List[dict]:
+    """Pipeline update rewriting `list_field` on the `array_field` element with `id == element_id`.
+
+    `expression_builder` receives the path of the element's current list
+    (e.g. "$$item.images") and returns the expression for its new value.
+    """
+    return update_nested_fields(array_field, element_id, {
+        list_field: lambda item: expression_builder(f"{item}.{list_field}")
+    })
+
+def permutation_filter(list_field: str, urls: List[str]) -> Dict[str, Any]:
+    """Match a list that holds exactly `urls` in any order.
+
+    Entries are unique within a list, so `$all` plus `$size` means the new
+    order is a permutation of the stored one.
+    """
+    if not urls:
+        return {list_field: {"$size": 0}}
+    return {list_field: {"$all": urls, "$size": len(urls)}}
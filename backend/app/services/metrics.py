@@ -0,0 +1,189 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import math
+import threading
+import time
+
+# Seconds; spans sub-millisecond cache hits to multi-second uploads
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label_value(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    """Base for labelled metrics; updates may come from driver threads, so they take a lock"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}" for labels, value in items
+        ]
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self.lock:
+            self.values[labels] = value
+
+    def render(self) -> List[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}" for labels, value in items
+        ]
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        # labels -> [per-bucket counts, sum, count]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = 0
+        while value > self.buckets[index]:
+            index += 1
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self.lock:
+            items = [(labels, (list(counts), total, count)) for labels, (counts, total, count) in self.series.items()]
+        lines = self.header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+mongodb_command_duration = registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ("command", "collection", "outcome")
+)
+mongodb_slow_commands = registry.counter(
+    "mongodb_slow_commands_total", "MongoDB commands slower than the slow query threshold", ("command", "collection")
+)
+mongodb_connections_checked_out = registry.gauge(
+    "mongodb_pool_connections_checked_out", "MongoDB connections currently checked out of the pool"
+)
+r2_request_duration = registry.histogram("r2_request_duration_seconds", "Cloudflare R2 request latency", ("operation",))
+r2_request_errors = registry.counter("r2_request_errors_total", "Failed Cloudflare R2 requests", ("operation",))
+smtp_send_duration = registry.histogram("smtp_send_duration_seconds", "SMTP send latency", ("outcome",))
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "Delay between a scheduled event loop wakeup and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+class EventLoopLagMonitor:
+    """Samples event loop responsiveness by timing how late a periodic sleep wakes up"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            event_loop_lag.observe(max(0.0, time.perf_counter() - started - self.interval))
+
+event_loop_monitor = EventLoopLagMonitor()
@@ -0,0 +1,96 @@
+from app.services.metrics import mongodb_command_duration, mongodb_connections_checked_out
+from app.services.request_context import current_route, record_span
+from pymongo import monitoring
+import threading
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Times every MongoDB command by name and collection, and into the request's `db` span.
+
+    Callbacks run on the driver's threads. The collection is only present
+    on the started event, so it is remembered until the command finishes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collections = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        with self.lock:
+            self.collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ""
+
+    def _finish(self, event, outcome: str):
+        with self.lock:
+            collection = self.collections.pop((event.connection_id, event.request_id), "")
+        mongodb_command_duration.observe(event.duration_micros / 1e6, event.command_name, collection, outcome)
+        record_span("db", event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+class SlowCommandListener(monitoring.CommandListener):
+    """Hands commands slower than the slow query log's threshold to it.
+
+    The command document and originating route are only available when the
+    command starts, so they are held until it finishes. `started` runs in
+    the caller's context, which carries the current request.
+    """
+
+    def __init__(self, slow_query_log):
+        self.slow_query_log = slow_query_log
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        with self.lock:
+            self.pending[(event.connection_id, event.request_id)] = (
+                event.command,
+                event.database_name,
+                collection if isinstance(collection, str) else "",
+                current_route()
+            )
+
+    def succeeded(self, event):
+        with self.lock:
+            pending = self.pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is not None and duration_ms >= self.slow_query_log.threshold_ms:
+            command, database, collection, route = pending
+            self.slow_query_log.record(event.command_name, command, database, collection, duration_ms, route)
+
+    def failed(self, event):
+        with self.lock:
+            self.pending.pop((event.connection_id, event.request_id), None)
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Tracks how many pooled connections are checked out at any moment"""
+
+    def connection_checked_out(self, event):
+        mongodb_connections_checked_out.inc()
+
+    def connection_checked_in(self, event):
+        mongodb_connections_checked_out.dec()
+
+    # Remaining pool events are not needed for metrics
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): pass
+
+def event_listeners() -> list:
+    # Imported here because the slow query log itself depends on the database module
+    from app.services.slow_query_log import slow_query_log
+    return [CommandMetricsListener(), SlowCommandListener(slow_query_log), PoolMetricsListener()]
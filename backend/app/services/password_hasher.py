@@ -0,0 +1,64 @@
+from app.config.settings import settings
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from typing import Optional, Tuple
+import asyncio
+import hmac
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Changing the rounds makes existing hashes "need update", so they are re-hashed on next login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
+
+# Credentials stored before bcrypt: the client's salted SHA-256 hex digest as-is
+LEGACY_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+def verify_and_update(secret: str, stored_hash: str) -> Tuple[bool, Optional[str]]:
+    """Check `secret` against a stored hash; also return a replacement hash if it is outdated"""
+    if LEGACY_HASH_PATTERN.match(stored_hash):
+        if not hmac.compare_digest(secret.encode("utf-8"), stored_hash.encode("utf-8")):
+            return False, None
+        return True, pwd_context.hash(secret)
+    return pwd_context.verify_and_update(secret, stored_hash)
+
+class PasswordHasher:
+    """Runs password hashing on a small dedicated thread pool with admission control.
+
+    bcrypt releases the GIL, so hashing on these threads leaves the event
+    loop free for other requests. At most `max_pending` operations may be
+    running or queued; beyond that requests are shed immediately with 503
+    instead of queueing behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.max_pending = max_pending
+        self.pending = 0
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            logger.warning("Password hashing pool saturated; shedding request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in attempts in progress. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, secret: str) -> str:
+        return await self.run(pwd_context.hash, secret)
+
+    async def verify_and_update(self, secret: str, stored_hash: str) -> Tuple[bool, Optional[str]]:
+        return await self.run(verify_and_update, secret, stored_hash)
+
+    def stop(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
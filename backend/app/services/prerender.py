@@ -0,0 +1,292 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from collections import OrderedDict
+from typing import Optional
+from app.api.seo import LOCATION_META, SITE_URL
+from app.services.database import get_database
+from app.services.frontend import StaticAsset, build_asset, REVALIDATE_CACHE_CONTROL
+from app.services.homepage_publisher import homepage_publisher
+import asyncio
+import html
+import json
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+SITE_NAME = "Double J's Doodles"
+DEFAULT_IMAGE = f"{SITE_URL}/logo512.png"
+
+# Upper bound on cached routes so random URLs cannot grow memory without limit
+MAX_CACHED_ROUTES = 512
+
+# API prefixes whose writes change data rendered into page heads
+SOURCE_PATH_PREFIXES = ("/api/litters", "/api/puppies", "/api/homepage")
+
+STATIC_PAGES = {
+    "about": {
+        "title": "About Double J's Doodles - Goldendoodle Breeder in La Junta, Colorado",
+        "description": "Meet Double J's Doodles, a family Goldendoodle breeder in La Junta, Colorado raising health tested, home-raised puppies.",
+    },
+    "litters": {
+        "title": "Goldendoodle Litters - Double J's Doodles Colorado",
+        "description": "Current and upcoming Goldendoodle litters from Double J's Doodles. Meet the parents and reserve your puppy.",
+    },
+    "puppies": {
+        "title": "Goldendoodle Puppies for Sale - Double J's Doodles Colorado",
+        "description": "Available Goldendoodle puppies from Double J's Doodles in Colorado. Health tested, home-raised puppies ready for loving homes.",
+    },
+    "contact": {
+        "title": "Contact Double J's Doodles - Goldendoodle Puppy Inquiries",
+        "description": "Contact Double J's Doodles about available Goldendoodle puppies, upcoming litters, pickup and transport options.",
+    },
+}
+
+PUPPY_AVAILABILITY = {
+    "available": "https://schema.org/InStock",
+    "reserved": "https://schema.org/PreOrder",
+    "sold": "https://schema.org/SoldOut",
+}
+
+def route_cache_key(path: str) -> str:
+    """Normalize a request path to the key its rendered HTML is cached under"""
+    path = path.strip("/").lower()
+    parts = path.split("/")
+    if path in STATIC_PAGES or path == "":
+        return path
+    if len(parts) == 2 and parts[0] in ("litters", "puppies"):
+        return path
+    if path.startswith("goldendoodle-breeder-") or path == "golden-doodles-near-me":
+        return path
+    # Everything else renders the generic shell
+    return "*"
+
+def json_ld_script(data: dict) -> str:
+    payload = json.dumps(data, separators=(",", ":"), default=str).replace("</", "<\\/")
+    return f'<script type="application/ld+json">{payload}</script>'
+
+def set_meta(shell: str, attribute: str, name: str, content: str) -> str:
+    """Replace a meta tag's content, or add the tag before </head>"""
+    tag = f'<meta {attribute}="{name}" content="{html.escape(content, quote=True)}" />'
+    pattern = re.compile(rf'<meta\s+{attribute}="{re.escape(name)}"[^>]*>', re.IGNORECASE)
+    if pattern.search(shell):
+        return pattern.sub(lambda _: tag, shell, count=1)
+    return shell.replace("</head>", f"{tag}</head>", 1)
+
+def inject_head(shell: str, meta: dict) -> str:
+    """Inject title, description, canonical, Open Graph, Twitter and route JSON-LD tags.
+
+    The shell already carries the site-wide LocalBusiness/PetStore JSON-LD, so
+    only route-specific structured data is added here.
+    """
+    title = meta["title"]
+    description = meta["description"]
+    canonical = meta["canonical"]
+    image = meta.get("image") or DEFAULT_IMAGE
+
+    shell = re.sub(
+        r"<title>.*?</title>",
+        lambda _: f"<title>{html.escape(title)}</title>",
+        shell, count=1, flags=re.DOTALL | re.IGNORECASE
+    )
+    shell = set_meta(shell, "name", "description", description)
+    if meta.get("keywords"):
+        shell = set_meta(shell, "name", "keywords", meta["keywords"])
+    shell = set_meta(shell, "property", "og:type", meta.get("og_type", "website"))
+    shell = set_meta(shell, "property", "og:title", title)
+    shell = set_meta(shell, "property", "og:description", description)
+    shell = set_meta(shell, "property", "og:url", canonical)
+    shell = set_meta(shell, "property", "og:image", image)
+    shell = set_meta(shell, "name", "twitter:title", title)
+    shell = set_meta(shell, "name", "twitter:description", description)
+    shell = set_meta(shell, "name", "twitter:image", image)
+    shell = re.sub(
+        r'<link\s+rel="canonical"[^>]*>',
+        lambda _: f'<link rel="canonical" href="{html.escape(canonical, quote=True)}" />',
+        shell, count=1, flags=re.IGNORECASE
+    )
+
+    scripts = "".join(json_ld_script(data) for data in meta.get("json_ld", []))
+    return shell.replace("</head>", f"{scripts}</head>", 1)
+
+class PrerenderService:
+    """Per-route HTML shells with server-side SEO metadata.
+
+    Rendered pages are compressed once and kept in a bounded LRU keyed by
+    normalized route. Any successful write to litters, puppies or homepage
+    clears the cache (see PrerenderInvalidationMiddleware).
+    """
+
+    def __init__(self):
+        self.cache: "OrderedDict[str, StaticAsset]" = OrderedDict()
+        self.generation = 0
+
+    def invalidate(self):
+        self.generation += 1
+        self.cache.clear()
+
+    async def get_page(self, path: str, shell_asset: StaticAsset) -> StaticAsset:
+        key = route_cache_key(path)
+        asset = self.cache.get(key)
+        if asset is not None:
+            self.cache.move_to_end(key)
+            return asset
+
+        generation = self.generation
+        try:
+            meta = await self.resolve_meta(key)
+        except Exception as e:
+            logger.error(f"Failed to resolve SEO meta for /{key}: {e}")
+            return shell_asset
+
+        if meta is None:
+            asset = shell_asset
+        else:
+            rendered = inject_head(shell_asset.body.decode("utf-8"), meta).encode("utf-8")
+            asset = await asyncio.to_thread(
+                build_asset, rendered, "text/html", REVALIDATE_CACHE_CONTROL, 5, 6
+            )
+
+        # Don't cache a page rendered from data that changed while we were rendering
+        if generation == self.generation:
+            self.cache[key] = asset
+            if len(self.cache) > MAX_CACHED_ROUTES:
+                self.cache.popitem(last=False)
+        return asset
+
+    async def resolve_meta(self, key: str) -> Optional[dict]:
+        if key == "*":
+            return None
+        if key == "":
+            return await self.homepage_meta()
+        if key in STATIC_PAGES:
+            return {
+                **STATIC_PAGES[key],
+                "canonical": f"{SITE_URL}/{key}"
+            }
+        if key.startswith("litters/"):
+            return await self.litter_meta(key.split("/", 1)[1])
+        if key.startswith("puppies/"):
+            return await self.puppy_meta(key.split("/", 1)[1])
+
+        location = key.replace("goldendoodle-breeder-", "", 1)
+        location_meta = LOCATION_META.get(location)
+        if not location_meta:
+            return None
+        return {
+            "title": location_meta["title"],
+            "description": location_meta["description"],
+            "keywords": location_meta["keywords"],
+            "canonical": f"{SITE_URL}/{key}"
+        }
+
+    async def homepage_meta(self) -> dict:
+        content_doc = homepage_publisher.content
+        meta = {
+            "title": "Double J's Doodles - Premium Goldendoodle Breeder Colorado | Golden Doodles Near Me | Denver, Utah, Texas",
+            "description": "Premium Goldendoodle breeder in Colorado serving Denver, Colorado Springs, Utah, and Texas. Health tested, home-raised puppies. Golden doodles near me - Double J's Doodles La Junta CO.",
+            "canonical": SITE_URL
+        }
+        if content_doc.get("meta_title"):
+            meta["title"] = content_doc["meta_title"]
+        if content_doc.get("meta_description"):
+            meta["description"] = content_doc["meta_description"]
+        if content_doc.get("meta_keywords"):
+            meta["keywords"] = content_doc["meta_keywords"]
+        if content_doc.get("og_image"):
+            meta["image"] = content_doc["og_image"]
+        return meta
+
+    async def litter_meta(self, litter_id: str) -> Optional[dict]:
+        db = get_database()
+        try:
+            object_id = ObjectId(litter_id)
+        except InvalidId:
+            return None
+        litter_doc = await db.litters.find_one(
+            {"_id": object_id},
+            {
+                "name": 1, "breed": 1, "generation": 1, "description": 1,
+                "mother.name": 1, "mother.image_url": 1, "father.name": 1,
+                "puppies.id": 1, "puppies.name": 1, "puppies.status": 1, "puppies.images": 1
+            }
+        )
+        if not litter_doc:
+            return None
+
+        canonical = f"{SITE_URL}/litters/{litter_id}"
+        mother = litter_doc.get("mother", {})
+        father = litter_doc.get("father", {})
+        description = litter_doc.get("description") or (
+            f"{litter_doc['generation']} {litter_doc['breed']} litter from "
+            f"{mother.get('name', 'our dam')} and {father.get('name', 'our sire')} at {SITE_NAME} in Colorado."
+        )
+        puppies = litter_doc.get("puppies", [])
+        return {
+            "title": f"{litter_doc['name']} - {litter_doc['generation']} {litter_doc['breed']} Litter | {SITE_NAME}",
+            "description": description,
+            "canonical": canonical,
+            "image": mother.get("image_url"),
+            "json_ld": [{
+                "@context": "https://schema.org",
+                "@type": "ItemList",
+                "name": litter_doc["name"],
+                "url": canonical,
+                "numberOfItems": len(puppies),
+                "itemListElement": [
+                    {
+                        "@type": "ListItem",
+                        "position": position,
+                        "url": f"{SITE_URL}/puppies/{puppy['id']}",
+                        "name": puppy.get("name")
+                    }
+                    for position, puppy in enumerate(puppies, start=1)
+                ]
+            }]
+        }
+
+    async def puppy_meta(self, puppy_id: str) -> Optional[dict]:
+        db = get_database()
+        litter_doc = await db.litters.find_one(
+            {"puppies.id": puppy_id},
+            {"name": 1, "breed": 1, "generation": 1, "puppies.$": 1}
+        )
+        if not litter_doc or not litter_doc.get("puppies"):
+            return None
+
+        puppy = litter_doc["puppies"][0]
+        canonical = f"{SITE_URL}/puppies/{puppy_id}"
+        breed = f"{litter_doc['generation']} {litter_doc['breed']}"
+        images = puppy.get("images", [])
+        description = (
+            f"{puppy['name']} is a {puppy.get('color', '').lower()} {puppy.get('gender', '').lower()} "
+            f"{breed} puppy from the {litter_doc['name']} litter at {SITE_NAME}. "
+            f"Status: {puppy.get('status', 'available')}."
+        )
+        return {
+            "title": f"{puppy['name']} - {breed} Puppy | {SITE_NAME}",
+            "description": " ".join(description.split()),
+            "canonical": canonical,
+            "og_type": "product",
+            "image": images[0] if images else None,
+            "json_ld": [{
+                "@context": "https://schema.org",
+                "@type": "Product",
+                "name": puppy["name"],
+                "description": puppy.get("notes") or description,
+                "image": images or [DEFAULT_IMAGE],
+                "url": canonical,
+                "category": breed,
+                "color": puppy.get("color"),
+                "brand": {"@type": "Brand", "name": SITE_NAME},
+                "offers": {
+                    "@type": "Offer",
+                    "url": canonical,
+                    "priceCurrency": "USD",
+                    "price": "1600",
+                    "availability": PUPPY_AVAILABILITY.get(puppy.get("status"), PUPPY_AVAILABILITY["available"])
+                }
+            }]
+        }
+
+prerender_service = PrerenderService()
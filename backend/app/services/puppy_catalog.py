@@ -0,0 +1,346 @@
+from app.services.database import get_database
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Dict, List, Optional, Tuple
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Litter-level fields that can be matched before puppies are unwound
+LITTER_FACETS = ("breed", "generation")
+# Fields on the embedded puppy documents
+PUPPY_FACETS = ("gender", "color", "status")
+
+SORT_FIELDS = {
+    "birth_date": "birth_date",
+    "name": "name",
+    "status": "status",
+}
+
+# Litter fields returned alongside a resolved puppy
+LITTER_SUMMARY_PROJECTION = {"name": 1, "breed": 1, "generation": 1}
+
+# Projects an unwound litter to a puppy with its litter summary
+PUPPY_WITH_LITTER_STAGE = {"$replaceRoot": {
+    "newRoot": {
+        "$mergeObjects": [
+            "$puppies",
+            {
+                "litter": {
+                    "id": {"$toString": "$_id"},
+                    "name": "$name",
+                    "breed": "$breed",
+                    "generation": "$generation"
+                }
+            }
+        ]
+    }
+}}
+
+def build_puppy_criteria(
+    gender: Optional[List[str]] = None,
+    color: Optional[List[str]] = None,
+    status: Optional[List[str]] = None,
+    born_after: Optional[datetime] = None,
+    born_before: Optional[datetime] = None
+) -> dict:
+    """Criteria on a single embedded puppy, keyed by puppy field name"""
+    criteria = {}
+    for field, values in (("gender", gender), ("color", color), ("status", status)):
+        if values:
+            criteria[field] = {"$in": values}
+    if born_after or born_before:
+        criteria["birth_date"] = {}
+        if born_after:
+            criteria["birth_date"]["$gte"] = born_after
+        if born_before:
+            criteria["birth_date"]["$lte"] = born_before
+    return criteria
+
+def facet_count_stage(field: str) -> list:
+    return [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$project": {"_id": 0, "value": "$_id", "count": 1}}
+    ]
+
+class PuppyCatalogService:
+    """Faceted search over puppies embedded in litters.
+
+    Facets are disjunctive: each facet is counted with every filter except
+    its own, so selecting a breed still lists the other breeds and what
+    picking them would return. Filters are applied at litter level before
+    `$unwind` (puppy criteria via `$elemMatch`) so the multikey indexes below
+    can narrow the litters scanned, as an `$or` of the per-facet criteria
+    when several facets are filtered; the exact criteria are then applied to
+    the unwound puppies. Results and per-facet counts come back from one
+    `$facet` aggregation.
+    """
+
+    async def ensure_indexes(self):
+        db = get_database()
+        await db.litters.create_index("puppies.id")
+        await db.litters.create_index([("puppies.status", 1), ("puppies.birth_date", -1)])
+        await db.litters.create_index([("breed", 1), ("generation", 1), ("puppies.status", 1)])
+        await db.litters.create_index([("puppies.gender", 1), ("puppies.color", 1)])
+
+    async def find_puppy(self, puppy_id: str) -> Tuple[Optional[dict], Optional[dict]]:
+        """Resolve a puppy by id to (litter summary, puppy) via the puppies.id index.
+
+        The `$elemMatch` projection returns only the matching puppy rather than
+        the whole litter.
+        """
+        db = get_database()
+        litter_doc = await db.litters.find_one(
+            {"puppies.id": puppy_id},
+            {**LITTER_SUMMARY_PROJECTION, "puppies": {"$elemMatch": {"id": puppy_id}}}
+        )
+        if not litter_doc or not litter_doc.get("puppies"):
+            return None, None
+        return litter_doc, litter_doc["puppies"][0]
+
+    async def find_litter_id(self, puppy_id: str) -> Optional[ObjectId]:
+        """Id of the litter containing a puppy, or None"""
+        db = get_database()
+        litter_doc = await db.litters.find_one({"puppies.id": puppy_id}, {"_id": 1})
+        return litter_doc["_id"] if litter_doc else None
+
+    async def list_puppies(self, status: Optional[str] = None, litter_id: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """Puppies with their litter summary, optionally filtered by status or litter"""
+        db = get_database()
+
+        # Build match criteria; status is matched on the litter first so the
+        # puppies.status index can skip litters with no matching puppy
+        match_criteria = {}
+        if litter_id:
+            match_criteria["_id"] = ObjectId(litter_id)
+        if status:
+            match_criteria["puppies.status"] = status
+
+        pipeline = [
+            {"$match": match_criteria},
+            {"$unwind": "$puppies"},
+        ]
+
+        # Drop the other puppies of litters that matched
+        if status:
+            pipeline.append({"$match": {"puppies.status": status}})
+        pipeline.append(PUPPY_WITH_LITTER_STAGE)
+        pipeline.append({"$limit": limit})
+
+        return await db.litters.aggregate(pipeline).to_list(length=limit)
+
+    async def bulk_apply(self, operations: list) -> List[dict]:
+        """Apply puppy creates, updates and status changes in one bulk_write.
+
+        One indexed read resolves every referenced litter and puppy. Valid
+        items are then folded into at most two updates per litter: a `$push`
+        of new puppies, and one `$set` that addresses each edited puppy
+        through an array filter. Returns one result per input item, in order.
+        """
+        db = get_database()
+        results = [
+            {"index": index, "op": item.op, "success": False, "litter_id": item.litter_id, "puppy_id": item.puppy_id}
+            for index, item in enumerate(operations)
+        ]
+
+        litter_ids = set()
+        for item, result in zip(operations, results):
+            if item.op == "create":
+                if not item.litter_id or not item.puppy:
+                    result["error"] = "create requires litter_id and puppy"
+                    continue
+                try:
+                    litter_ids.add(ObjectId(item.litter_id))
+                except InvalidId:
+                    result["error"] = "Litter not found"
+            elif not item.puppy_id:
+                result["error"] = f"{item.op} requires puppy_id"
+            elif item.op == "update" and not item.update:
+                result["error"] = "update requires update"
+            elif item.op == "status" and not item.status:
+                result["error"] = "status requires status"
+        puppy_ids = {item.puppy_id for item, result in zip(operations, results) if item.op != "create" and "error" not in result}
+
+        # Resolve litters and puppy -> litter in a single round trip
+        existing_litters = set()
+        puppy_litters: Dict[str, ObjectId] = {}
+        if litter_ids or puppy_ids:
+            cursor = db.litters.find(
+                {"$or": [{"_id": {"$in": list(litter_ids)}}, {"puppies.id": {"$in": list(puppy_ids)}}]},
+                {"_id": 1, "puppies.id": 1}
+            )
+            async for litter_doc in cursor:
+                existing_litters.add(litter_doc["_id"])
+                for puppy in litter_doc.get("puppies", []):
+                    if puppy.get("id") in puppy_ids:
+                        puppy_litters[puppy["id"]] = litter_doc["_id"]
+
+        now = datetime.now()
+        creates: Dict[ObjectId, List[Tuple[int, dict]]] = {}
+        # litter -> puppy_id -> merged field changes; later items win
+        changes: Dict[ObjectId, Dict[str, dict]] = {}
+        item_litters: Dict[int, ObjectId] = {}
+        for item, result in zip(operations, results):
+            if "error" in result:
+                continue
+            if item.op == "create":
+                litter_id = ObjectId(item.litter_id)
+                if litter_id not in existing_litters:
+                    result["error"] = "Litter not found"
+                    continue
+                puppy_doc = item.puppy.dict()
+                puppy_doc["id"] = str(uuid.uuid4())
+                puppy_doc["images"] = []
+                puppy_doc["image_meta"] = []
+                puppy_doc["videos"] = []
+                creates.setdefault(litter_id, []).append((result["index"], puppy_doc))
+                result["puppy_id"] = puppy_doc["id"]
+                result["puppy"] = puppy_doc
+            else:
+                litter_id = puppy_litters.get(item.puppy_id)
+                if not litter_id:
+                    result["error"] = "Puppy not found"
+                    continue
+                if item.op == "update":
+                    fields = {k: v for k, v in item.update.dict(exclude_unset=True).items() if v is not None}
+                else:
+                    fields = {"status": item.status}
+                changes.setdefault(litter_id, {}).setdefault(item.puppy_id, {}).update(fields)
+            result["litter_id"] = str(litter_id)
+            item_litters[result["index"]] = litter_id
+
+        requests = []
+        request_items: List[List[int]] = []
+        for litter_id, new_puppies in creates.items():
+            requests.append(UpdateOne(
+                {"_id": litter_id},
+                {"$push": {"puppies": {"$each": [doc for _, doc in new_puppies]}}, "$set": {"updated_at": now}}
+            ))
+            request_items.append([index for index, _ in new_puppies])
+        for litter_id, puppies in changes.items():
+            update_set = {"updated_at": now}
+            array_filters = []
+            for position, (puppy_id, fields) in enumerate(puppies.items()):
+                for key, value in fields.items():
+                    update_set[f"puppies.$[p{position}].{key}"] = value
+                array_filters.append({f"p{position}.id": puppy_id})
+            requests.append(UpdateOne({"_id": litter_id}, {"$set": update_set}, array_filters=array_filters))
+            request_items.append([
+                index for index, item_litter in item_litters.items()
+                if item_litter == litter_id and operations[index].op != "create"
+            ])
+
+        failed = {}
+        if requests:
+            try:
+                await db.litters.bulk_write(requests, ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get("writeErrors", []):
+                    for index in request_items[write_error["index"]]:
+                        failed[index] = write_error.get("errmsg", "Write failed")
+
+        for index in item_litters:
+            if index in failed:
+                results[index]["error"] = failed[index]
+                results[index].pop("puppy", None)
+            else:
+                results[index]["success"] = True
+        return results
+
+    async def search(
+        self,
+        breed: Optional[List[str]] = None,
+        generation: Optional[List[str]] = None,
+        gender: Optional[List[str]] = None,
+        color: Optional[List[str]] = None,
+        status: Optional[List[str]] = None,
+        born_after: Optional[datetime] = None,
+        born_before: Optional[datetime] = None,
+        litter_id: Optional[str] = None,
+        sort_by: str = "birth_date",
+        descending: bool = True,
+        skip: int = 0,
+        limit: int = 50
+    ) -> dict:
+        db = get_database()
+
+        litter_match = {}
+        if litter_id:
+            try:
+                litter_match["_id"] = ObjectId(litter_id)
+            except InvalidId:
+                return {"puppies": [], "total": 0, "facets": {f: [] for f in LITTER_FACETS + PUPPY_FACETS}}
+
+        selected = {
+            field: values for field, values in (
+                ("breed", breed), ("generation", generation), ("gender", gender), ("color", color), ("status", status)
+            ) if values
+        }
+        born_criteria = build_puppy_criteria(born_after=born_after, born_before=born_before)
+
+        def litter_criteria(excluded: Optional[str] = None) -> dict:
+            criteria = {field: {"$in": selected[field]} for field in LITTER_FACETS if field in selected and field != excluded}
+            puppy_criteria = {
+                field: {"$in": selected[field]} for field in PUPPY_FACETS if field in selected and field != excluded
+            }
+            puppy_criteria.update(born_criteria)
+            if puppy_criteria:
+                criteria["puppies"] = {"$elemMatch": puppy_criteria}
+            return criteria
+
+        def unwound_criteria(excluded: Optional[str] = None) -> dict:
+            return {
+                (f"litter.{field}" if field in LITTER_FACETS else field): {"$in": values}
+                for field, values in selected.items() if field != excluded
+            }
+
+        # A litter is needed if any facet's count could include one of its puppies
+        branches = [litter_criteria(field) for field in selected] or [litter_criteria()]
+        if len(branches) == 1:
+            litter_match.update(branches[0])
+        else:
+            litter_match["$or"] = branches
+
+        pipeline = [
+            {"$match": litter_match},
+            {"$project": {"name": 1, "breed": 1, "generation": 1, "puppies": 1}},
+            {"$unwind": "$puppies"},
+        ]
+        if born_criteria:
+            pipeline.append({"$match": {f"puppies.{k}": v for k, v in born_criteria.items()}})
+        pipeline.append(PUPPY_WITH_LITTER_STAGE)
+
+        sort_field = SORT_FIELDS.get(sort_by, "birth_date")
+        direction = -1 if descending else 1
+        matched = unwound_criteria()
+        pipeline.append({"$facet": {
+            "puppies": [
+                {"$match": matched},
+                # Tie-break on id so paging is stable
+                {"$sort": {sort_field: direction, "id": 1}},
+                {"$skip": skip},
+                {"$limit": limit}
+            ],
+            "total": [{"$match": matched}, {"$count": "count"}],
+            "breed": [{"$match": unwound_criteria("breed")}] + facet_count_stage("litter.breed"),
+            "generation": [{"$match": unwound_criteria("generation")}] + facet_count_stage("litter.generation"),
+            "gender": [{"$match": unwound_criteria("gender")}] + facet_count_stage("gender"),
+            "color": [{"$match": unwound_criteria("color")}] + facet_count_stage("color"),
+            "status": [{"$match": unwound_criteria("status")}] + facet_count_stage("status"),
+        }})
+
+        results = await db.litters.aggregate(pipeline).to_list(length=1)
+        result = results[0] if results else {}
+        total = result.get("total", [])
+        return {
+            "puppies": result.get("puppies", []),
+            "total": total[0]["count"] if total else 0,
+            "facets": {field: result.get(field, []) for field in LITTER_FACETS + PUPPY_FACETS}
+        }
+
+puppy_catalog_service = PuppyCatalogService()
@@ -0,0 +1,37 @@
+from app.services.database import get_database
+from datetime import datetime
+from pymongo import ReturnDocument
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FixedWindowRateLimiter:
+    """Fixed-window counters shared by every process through the `rate_limits` collection.
+
+    Each (scope, key, window) is one small document bumped by an atomic
+    `$inc` upsert, so a check is a single indexed write no matter how much
+    history exists. Documents carry the end of their window in `expires_at`
+    and are removed by a TTL index.
+    """
+
+    async def ensure_indexes(self):
+        db = get_database()
+        await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+
+    async def hit(self, scope: str, key: str, window_seconds: int) -> int:
+        """Count one hit in the current window and return the window's total so far"""
+        db = get_database()
+        window_start = int(time.time() // window_seconds) * window_seconds
+        counter = await db.rate_limits.find_one_and_update(
+            {"_id": f"{scope}:{key}:{window_start}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {"expires_at": datetime.utcfromtimestamp(window_start + window_seconds)}
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["count"]
+
+rate_limiter = FixedWindowRateLimiter()
@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+import threading
+import time
+
+class RequestContext:
+    """Per-request state visible to code that has no access to the Request object.
+
+    Context variables follow the request into `asyncio.to_thread` and Motor's
+    executor threads, so driver callbacks can attribute work to a request.
+    Spans accumulate time per category (db, r2, auth, ...); concurrent work
+    in one category, such as gathered queries, is summed.
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.is_admin = False
+        self.endpoint_finished: Optional[float] = None
+        self.lock = threading.Lock()
+        # name -> [total seconds, count], in first-seen order
+        self.spans: Dict[str, List[float]] = {}
+
+    @property
+    def route(self) -> str:
+        # The router adds the matched route to the scope once dispatch begins
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    def add_span(self, name: str, seconds: float):
+        with self.lock:
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = [seconds, 1]
+            else:
+                span[0] += seconds
+                span[1] += 1
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+def current_route() -> Optional[str]:
+    context = current_request.get()
+    return context.route if context else None
+
+def record_span(name: str, seconds: float):
+    context = current_request.get()
+    if context is not None:
+        context.add_span(name, seconds)
+
+@contextmanager
+def span(name: str):
+    """Time a block into the current request's spans; a no-op outside a request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
@@ -0,0 +1,207 @@
+from app.services.database import get_database
+from typing import Iterable, List, Optional
+import asyncio
+import html
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TYPES = ("litter", "parent", "puppy", "inquiry")
+
+LITTER_TEXT_WEIGHTS = {
+    "name": 10,
+    "mother.name": 8,
+    "father.name": 8,
+    "puppies.name": 8,
+    "puppies.color": 3,
+    "description": 2,
+    "puppies.notes": 1,
+}
+
+CONTACT_TEXT_WEIGHTS = {
+    "name": 10,
+    "email": 10,
+    "puppy_name": 5,
+    "litter_name": 5,
+    "subject": 3,
+    "message": 1,
+}
+
+LITTER_SEARCH_PROJECTION = {
+    "score": {"$meta": "textScore"},
+    "name": 1, "description": 1, "breed": 1, "generation": 1,
+    "mother.name": 1, "father.name": 1,
+    "puppies.id": 1, "puppies.name": 1, "puppies.color": 1, "puppies.notes": 1,
+}
+
+CONTACT_SEARCH_PROJECTION = {
+    "score": {"$meta": "textScore"},
+    "name": 1, "email": 1, "subject": 1, "message": 1,
+    "puppy_name": 1, "litter_name": 1, "submitted_at": 1, "responded": 1,
+}
+
+SNIPPET_RADIUS = 60
+STEM_SUFFIXES = ("ies", "es", "s", "ing", "ed")
+
+def query_terms(query: str) -> List[str]:
+    """Lowercased, roughly stemmed terms for highlighting"""
+    terms = []
+    for word in re.findall(r"\w{2,}", query.lower()):
+        for suffix in STEM_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+        if word not in terms:
+            terms.append(word)
+    return terms
+
+def term_pattern(terms: Iterable[str]) -> Optional[re.Pattern]:
+    terms = list(terms)
+    if not terms:
+        return None
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\w*", re.IGNORECASE)
+
+def highlight(text: Optional[str], pattern: Optional[re.Pattern]) -> Optional[str]:
+    """HTML-escaped snippet around the first match with matches wrapped in <mark>"""
+    if not text or pattern is None:
+        return None
+    first = pattern.search(text)
+    if not first:
+        return None
+    start = max(0, first.start() - SNIPPET_RADIUS)
+    end = min(len(text), first.end() + SNIPPET_RADIUS)
+    snippet = text[start:end]
+
+    parts, position = [], 0
+    for match in pattern.finditer(snippet):
+        parts.append(html.escape(snippet[position:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        position = match.end()
+    parts.append(html.escape(snippet[position:]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+def highlight_fields(doc: dict, fields: Iterable[str], pattern: Optional[re.Pattern]) -> dict:
+    highlights = {}
+    for field in fields:
+        value = doc.get(field)
+        snippet = highlight(value if isinstance(value, str) else None, pattern)
+        if snippet:
+            highlights[field] = snippet
+    return highlights
+
+def litter_hits(litter_doc: dict, pattern: Optional[re.Pattern], types: Iterable[str]) -> List[dict]:
+    """Split a matching litter into hits for the litter, its parents and its puppies"""
+    litter_id = str(litter_doc["_id"])
+    score = litter_doc.get("score", 0.0)
+    hits = []
+
+    if "litter" in types:
+        highlights = highlight_fields(litter_doc, ("name", "description"), pattern)
+        if highlights:
+            hits.append({
+                "type": "litter", "id": litter_id, "litter_id": litter_id,
+                "title": litter_doc.get("name"), "score": score, "highlights": highlights
+            })
+
+    if "parent" in types:
+        for role in ("mother", "father"):
+            parent = litter_doc.get(role) or {}
+            highlights = highlight_fields(parent, ("name",), pattern)
+            if highlights:
+                hits.append({
+                    "type": "parent", "id": f"{litter_id}:{role}", "litter_id": litter_id,
+                    "role": role, "title": parent.get("name"), "score": score, "highlights": highlights
+                })
+
+    if "puppy" in types:
+        for puppy in litter_doc.get("puppies", []):
+            highlights = highlight_fields(puppy, ("name", "color", "notes"), pattern)
+            if highlights:
+                hits.append({
+                    "type": "puppy", "id": puppy.get("id"), "litter_id": litter_id,
+                    "title": puppy.get("name"), "score": score, "highlights": highlights
+                })
+
+    # Stemming can match a document our highlighter misses; still surface the litter
+    if not hits and "litter" in types:
+        hits.append({
+            "type": "litter", "id": litter_id, "litter_id": litter_id,
+            "title": litter_doc.get("name"), "score": score, "highlights": {}
+        })
+    return hits
+
+def inquiry_hit(contact_doc: dict, pattern: Optional[re.Pattern]) -> dict:
+    return {
+        "type": "inquiry",
+        "id": str(contact_doc["_id"]),
+        "title": contact_doc.get("name"),
+        "email": contact_doc.get("email"),
+        "submitted_at": contact_doc.get("submitted_at"),
+        "responded": contact_doc.get("responded", False),
+        "score": contact_doc.get("score", 0.0),
+        "highlights": highlight_fields(
+            contact_doc, ("name", "email", "subject", "puppy_name", "litter_name", "message"), pattern
+        )
+    }
+
+class SearchService:
+    """Relevance-ranked search backed by weighted Mongo text indexes.
+
+    Litters carry one text index spanning litter, parent and puppy fields;
+    a match is split into per-entity hits. Contact inquiries have their own
+    index. Both collections are queried concurrently and merged by score.
+    """
+
+    async def ensure_indexes(self):
+        db = get_database()
+        await db.litters.create_index(
+            [(field, "text") for field in LITTER_TEXT_WEIGHTS],
+            weights=LITTER_TEXT_WEIGHTS, name="search_text", default_language="english"
+        )
+        await db.contacts.create_index(
+            [(field, "text") for field in CONTACT_TEXT_WEIGHTS],
+            weights=CONTACT_TEXT_WEIGHTS, name="search_text", default_language="english"
+        )
+
+    async def _find(self, collection, query: str, projection: dict, fetch: int) -> List[dict]:
+        cursor = collection.find({"$text": {"$search": query}}, projection)
+        cursor = cursor.sort([("score", {"$meta": "textScore"})]).limit(fetch)
+        return await cursor.to_list(length=fetch)
+
+    async def search(self, query: str, types: Optional[List[str]] = None, skip: int = 0, limit: int = 20) -> dict:
+        db = get_database()
+        types = set(types or SEARCH_TYPES)
+        pattern = term_pattern(query_terms(query))
+        # Each document yields at least one hit, so this many per collection covers the page
+        fetch = skip + limit + 1
+
+        kinds, lookups = [], []
+        if types & {"litter", "parent", "puppy"}:
+            kinds.append("litter")
+            lookups.append(self._find(db.litters, query, LITTER_SEARCH_PROJECTION, fetch))
+        if "inquiry" in types:
+            kinds.append("inquiry")
+            lookups.append(self._find(db.contacts, query, CONTACT_SEARCH_PROJECTION, fetch))
+        results = await asyncio.gather(*lookups)
+
+        hits = []
+        more_documents = False
+        for kind, docs in zip(kinds, results):
+            more_documents = more_documents or len(docs) >= fetch
+            for doc in docs:
+                if kind == "litter":
+                    hits.extend(litter_hits(doc, pattern, types))
+                else:
+                    hits.append(inquiry_hit(doc, pattern))
+
+        hits.sort(key=lambda hit: hit["score"], reverse=True)
+        return {
+            "query": query,
+            "hits": hits[skip:skip + limit],
+            "skip": skip,
+            "limit": limit,
+            "has_more": more_documents or len(hits) > skip + limit
+        }
+
+search_service = SearchService()
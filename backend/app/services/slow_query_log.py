@@ -0,0 +1,176 @@
+from app.config.settings import settings
+from app.services.database import get_database
+from app.services.metrics import mongodb_slow_commands
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Commands whose plan `explain` can report, mapped to where their filter and sort live
+EXPLAINABLE_COMMANDS = {
+    "find": ("filter", "sort"),
+    "aggregate": (None, None),
+    "count": ("query", None),
+    "distinct": ("query", None),
+    "findAndModify": ("query", "sort"),
+    "update": ("q", None),
+    "delete": ("q", None),
+}
+# Session, transaction and routing fields the driver adds that `explain` rejects or ignores
+DRIVER_FIELDS = ("lsid", "txnNumber", "autocommit", "startTransaction", "writeConcern", "readConcern")
+
+def redact(value: Any) -> Any:
+    """Keep field names and operators, drop values, so entries never hold customer data"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value[:3]]
+    return "?"
+
+def query_shape(command_name: str, command: dict) -> dict:
+    filter_field, sort_field = EXPLAINABLE_COMMANDS[command_name]
+    if command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or [{}]
+        return {"filter": redact(statements[0].get(filter_field, {}))}
+    if command_name == "aggregate":
+        return {"pipeline": [{stage: redact(spec) for stage, spec in step.items()} for step in command.get("pipeline", [])[:4]]}
+    shape = {"filter": redact(command.get(filter_field, {}))}
+    if sort_field and command.get(sort_field):
+        shape["sort"] = dict(command[sort_field])
+    return shape
+
+def explain_target(command_name: str, command: dict) -> dict:
+    """The original command reduced to something `explain` accepts"""
+    target = {key: value for key, value in command.items() if not key.startswith("$") and key not in DRIVER_FIELDS}
+    if command_name in ("update", "delete"):
+        # explain covers a single statement
+        plural = command_name + "s"
+        target[plural] = target.get(plural, [])[:1]
+    return target
+
+def winning_stages(explain: Any) -> List[str]:
+    """Every plan stage of the winning plan(s), including those nested in aggregate and sharded output"""
+    stages: List[str] = []
+
+    def collect(node: Any, in_winning_plan: bool):
+        if isinstance(node, dict):
+            if in_winning_plan and isinstance(node.get("stage"), str):
+                stages.append(node["stage"])
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                collect(value, in_winning_plan or key == "winningPlan")
+        elif isinstance(node, list):
+            for item in node:
+                collect(item, in_winning_plan)
+
+    collect(explain, False)
+    return stages
+
+class SlowQueryLog:
+    """Bounded, in-memory record of MongoDB commands slower than a threshold.
+
+    Entries arrive from the command listener on driver threads. The first
+    slow occurrence of each query shape (and at most one per shape every
+    `explain_interval` seconds after that) is explained on the event loop
+    with `queryPlanner` verbosity, which plans the query without running it,
+    to flag collection scans and in-memory sorts. Explains run one at a time
+    and are skipped rather than queued while one is in progress.
+    """
+
+    def __init__(self, threshold_ms: int, size: int, explain_interval: int):
+        self.threshold_ms = threshold_ms
+        self.explain_interval = explain_interval
+        self.entries: deque = deque(maxlen=size)
+        self.lock = threading.Lock()
+        # shape key -> monotonic time it was last explained, and that explain's findings
+        self.explained: Dict[str, tuple] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.explaining = False
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+
+    def record(self, command_name: str, command: dict, database: str, collection: str, duration_ms: float, route: Optional[str]):
+        """Called from the command listener for commands over the threshold"""
+        mongodb_slow_commands.inc(command_name, collection)
+        explainable = command_name in EXPLAINABLE_COMMANDS
+        shape = query_shape(command_name, command) if explainable else None
+        entry = {
+            "at": datetime.now(timezone.utc),
+            "command": command_name,
+            "database": database,
+            "collection": collection,
+            "duration_ms": round(duration_ms, 1),
+            "route": route,
+            "shape": shape,
+            "plan": None,
+        }
+        shape_key = json.dumps([command_name, database, collection, shape], sort_keys=True, default=str)
+
+        now = time.monotonic()
+        with self.lock:
+            self.entries.append(entry)
+            last = self.explained.get(shape_key)
+            if last is not None:
+                entry["plan"] = last[1]
+            should_explain = (
+                explainable
+                and self.loop is not None
+                and not self.explaining
+                and (last is None or now - last[0] >= self.explain_interval)
+            )
+            if should_explain:
+                self.explaining = True
+                self.explained[shape_key] = (now, None)
+        if should_explain:
+            target = explain_target(command_name, command)
+            self.loop.call_soon_threadsafe(self.schedule_explain, entry, shape_key, database, target)
+
+    def schedule_explain(self, entry: dict, shape_key: str, database: str, target: dict):
+        asyncio.create_task(self.explain(entry, shape_key, database, target))
+
+    async def explain(self, entry: dict, shape_key: str, database: str, target: dict):
+        try:
+            db = get_database().client[database]
+            result = await db.command({"explain": target, "verbosity": "queryPlanner"})
+            stages = winning_stages(result)
+            plan = {
+                "stages": stages,
+                "collscan": "COLLSCAN" in stages,
+                "in_memory_sort": "SORT" in stages,
+            }
+            if plan["collscan"] or plan["in_memory_sort"]:
+                problems = ", ".join(name for name in ("collscan", "in_memory_sort") if plan[name])
+                logger.warning(
+                    f"Slow {entry['command']} on {entry['collection']} ({entry['duration_ms']} ms, "
+                    f"route {entry['route']}): {problems} {json.dumps(entry['shape'], default=str)}"
+                )
+        except Exception as e:
+            logger.error(f"Failed to explain slow {entry['command']} on {entry['collection']}: {e}")
+            plan = {"error": str(e)}
+        with self.lock:
+            entry["plan"] = plan
+            self.explained[shape_key] = (self.explained[shape_key][0], plan)
+            if len(self.explained) > self.entries.maxlen * 4:
+                # Forget the oldest shapes; they are explained again if they recur
+                for key in list(self.explained)[:len(self.explained) - self.entries.maxlen * 2]:
+                    del self.explained[key]
+            self.explaining = False
+
+    def recent(self) -> List[dict]:
+        """Newest first"""
+        with self.lock:
+            return [dict(entry) for entry in reversed(self.entries)]
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
+)
@@ -0,0 +1,23 @@
+from app.config.settings import settings
+from app.services.storage_base import StorageBackend
+import logging
+
+logger = logging.getLogger(__name__)
+
+def create_storage_backend() -> StorageBackend:
+    """Pick the storage backend from STORAGE_BACKEND, defaulting to R2 when configured"""
+    from app.services.cloudflare_r2 import r2_service
+    from app.services.local_storage import local_storage_service
+
+    backend_name = (settings.STORAGE_BACKEND or "").lower()
+    if backend_name == "local":
+        backend = local_storage_service
+    elif backend_name == "r2":
+        backend = r2_service
+    else:
+        backend = r2_service if r2_service.is_configured else local_storage_service
+
+    logger.info(f"Using {backend.name} media storage")
+    return backend
+
+storage_service = create_storage_backend()
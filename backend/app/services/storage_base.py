@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, List, Optional
+
+class StorageBackend(ABC):
+    """Interface implemented by every media storage backend.
+
+    Keys are slash separated object names (e.g. `media/ab/abcd....jpg`).
+    Upload methods return the public URL of the stored object, or None on failure.
+    """
+
+    name: str = "base"
+
+    @property
+    def is_configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    def get_public_url(self, file_name: str) -> str:
+        """Build the public URL for an object key"""
+
+    def get_key_from_url(self, url: str) -> Optional[str]:
+        """Recover the object key from a public URL, or None if the URL is not ours"""
+        base_url = self.get_public_url("")
+        if url and url.startswith(base_url):
+            return url[len(base_url):]
+        return None
+
+    @abstractmethod
+    async def upload_file(self, file_content: bytes, file_name: str, content_type: str, cache_control: Optional[str] = None) -> Optional[str]:
+        """Store bytes under a key"""
+
+    @abstractmethod
+    async def upload_stream(self, file_obj: BinaryIO, file_name: str, content_type: str, cache_control: Optional[str] = None) -> Optional[str]:
+        """Store a file-like object under a key without loading it into memory"""
+
+    @abstractmethod
+    async def download_file(self, file_name: str, destination: str) -> bool:
+        """Download an object to a local path"""
+
+    @abstractmethod
+    async def delete_file(self, file_name: str) -> bool:
+        """Delete a single object"""
+
+    @abstractmethod
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        """Delete many objects and return the keys that were removed"""
+
+    @abstractmethod
+    async def list_files(self, prefix: str = "") -> List[dict]:
+        """List every object under a prefix as {key, last_modified, size}"""
+
+    @abstractmethod
+    async def generate_presigned_url(self, file_name: str, method: str = "get", expires_in: int = 3600, content_type: Optional[str] = None) -> Optional[str]:
+        """Time-limited URL that lets a client GET or PUT an object directly"""
@@ -0,0 +1,269 @@
+from app.services.database import get_database
+from app.services.storage import storage_service
+from app.services.media import IMMUTABLE_CACHE_CONTROL
+from app.services.prerender import prerender_service
+from app.config.settings import settings
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import json
+import mimetypes
+import shutil
+import tempfile
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bitrate ladder, smallest first; renditions taller than the source are skipped
+RENDITION_LADDER = [
+    {"name": "360p", "height": 360, "video_bitrate": "800k", "audio_bitrate": "96k"},
+    {"name": "720p", "height": 720, "video_bitrate": "2500k", "audio_bitrate": "128k"},
+    {"name": "1080p", "height": 1080, "video_bitrate": "5000k", "audio_bitrate": "128k"},
+]
+
+class VideoProcessingError(Exception):
+    pass
+
+class VideoProcessingService:
+    """Background queue that turns raw puppy videos into web-friendly assets.
+
+    Each job downloads the uploaded original, extracts a poster frame,
+    transcodes an H.264 bitrate ladder with fast-start MP4s and optionally
+    segments it to HLS. Outputs are uploaded next to the original and recorded
+    under `video_assets` on the puppy; job state lives in `video_jobs`.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def ffmpeg_available(self) -> bool:
+        return bool(shutil.which(settings.VIDEO_FFMPEG_PATH) and shutil.which(settings.VIDEO_FFPROBE_PATH))
+
+    async def ensure_indexes(self):
+        db = get_database()
+        await db.video_jobs.create_index([("puppy_id", 1), ("created_at", -1)])
+        await db.video_jobs.create_index("status")
+
+    async def start(self):
+        if self.task is not None:
+            return
+        if not self.ffmpeg_available:
+            logger.warning("ffmpeg not found; uploaded videos will be served as-is")
+        # Resume jobs interrupted by a restart
+        db = get_database()
+        async for job_doc in db.video_jobs.find({"status": {"$in": ["queued", "processing"]}}, {"_id": 1}):
+            self.queue.put_nowait(job_doc["_id"])
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def enqueue(self, puppy_id: str, source_url: str) -> dict:
+        """Record a processing job for an uploaded video and queue it"""
+        db = get_database()
+        now = datetime.utcnow()
+        job_doc = {
+            "_id": str(uuid.uuid4()),
+            "puppy_id": puppy_id,
+            "source_url": source_url,
+            "status": "queued" if self.ffmpeg_available else "skipped",
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        await db.video_jobs.insert_one(job_doc)
+        if job_doc["status"] == "queued":
+            self.queue.put_nowait(job_doc["_id"])
+        return serialize_job(job_doc)
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        db = get_database()
+        job_doc = await db.video_jobs.find_one({"_id": job_id})
+        return serialize_job(job_doc) if job_doc else None
+
+    async def latest_job(self, puppy_id: str, source_url: str) -> Optional[dict]:
+        """The most recent job for a video already on the puppy"""
+        db = get_database()
+        job_doc = await db.video_jobs.find_one(
+            {"puppy_id": puppy_id, "source_url": source_url}, sort=[("created_at", -1)]
+        )
+        return serialize_job(job_doc) if job_doc else None
+
+    async def list_jobs(self, puppy_id: str) -> List[dict]:
+        db = get_database()
+        cursor = db.video_jobs.find({"puppy_id": puppy_id}).sort("created_at", -1)
+        return [serialize_job(job_doc) async for job_doc in cursor]
+
+    async def _run(self):
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                logger.error(f"Video job {job_id} failed: {e}")
+                try:
+                    await self._set_status(job_id, "failed", error=str(e))
+                except Exception as status_error:
+                    # Keep the worker alive; the job resumes on the next start
+                    logger.error(f"Could not mark video job {job_id} failed: {status_error}")
+
+    async def _set_status(self, job_id: str, status: str, **fields):
+        db = get_database()
+        await db.video_jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": status, "updated_at": datetime.utcnow(), **fields}}
+        )
+
+    async def _process(self, job_id: str):
+        db = get_database()
+        job_doc = await db.video_jobs.find_one({"_id": job_id})
+        if not job_doc or job_doc["status"] not in ("queued", "processing"):
+            return
+        await self._set_status(job_id, "processing", started_at=datetime.utcnow())
+
+        source_key = storage_service.get_key_from_url(job_doc["source_url"])
+        if not source_key:
+            raise VideoProcessingError("Source video is not in media storage")
+        output_prefix = f"puppies/{job_doc['puppy_id']}/videos/{job_id}"
+
+        with tempfile.TemporaryDirectory(prefix="video-job-") as work_dir:
+            work_path = Path(work_dir)
+            source_path = work_path / "source"
+            if not await storage_service.download_file(source_key, str(source_path)):
+                raise VideoProcessingError("Could not download source video")
+
+            source_height = await self._probe_height(source_path)
+            ladder = [r for r in RENDITION_LADDER if r["height"] <= source_height] or RENDITION_LADDER[:1]
+
+            output_path = work_path / "out"
+            output_path.mkdir()
+            poster_path = output_path / "poster.jpg"
+            await self._ffmpeg(
+                "-ss", "1", "-i", str(source_path), "-frames:v", "1",
+                "-vf", "scale=-2:720", "-q:v", "3", str(poster_path)
+            )
+
+            renditions = []
+            for rendition in ladder:
+                rendition_path = output_path / f"{rendition['name']}.mp4"
+                await self._ffmpeg(
+                    "-i", str(source_path),
+                    "-vf", f"scale=-2:{rendition['height']}",
+                    "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+                    "-b:v", rendition["video_bitrate"], "-maxrate", rendition["video_bitrate"],
+                    "-bufsize", rendition["video_bitrate"],
+                    "-c:a", "aac", "-b:a", rendition["audio_bitrate"],
+                    "-movflags", "+faststart", str(rendition_path)
+                )
+                renditions.append({**rendition, "path": rendition_path})
+
+            hls_master = None
+            if settings.VIDEO_HLS_ENABLED:
+                hls_master = await self._segment_hls(output_path / "hls", renditions)
+
+            # Upload everything under the job prefix
+            uploaded = {}
+            for file_path in sorted(p for p in output_path.rglob("*") if p.is_file()):
+                relative_key = file_path.relative_to(output_path).as_posix()
+                content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+                if file_path.suffix == ".m3u8":
+                    content_type = "application/vnd.apple.mpegurl"
+                elif file_path.suffix == ".ts":
+                    content_type = "video/mp2t"
+                with open(file_path, "rb") as output_file:
+                    url = await storage_service.upload_stream(
+                        output_file,
+                        f"{output_prefix}/{relative_key}",
+                        content_type,
+                        cache_control=IMMUTABLE_CACHE_CONTROL
+                    )
+                if not url:
+                    raise VideoProcessingError(f"Failed to upload {relative_key}")
+                uploaded[file_path] = url
+
+        video_asset = {
+            "job_id": job_id,
+            "source_url": job_doc["source_url"],
+            "poster_url": uploaded.get(poster_path),
+            "renditions": [
+                {
+                    "name": r["name"],
+                    "height": r["height"],
+                    "bitrate": r["video_bitrate"],
+                    "url": uploaded[r["path"]]
+                }
+                for r in renditions
+            ],
+            "hls_url": uploaded.get(hls_master) if hls_master else None
+        }
+        result = await db.litters.update_one(
+            {"puppies.id": job_doc["puppy_id"]},
+            {"$push": {"puppies.$.video_assets": video_asset}, "$set": {"updated_at": datetime.now()}}
+        )
+        if result.matched_count == 0:
+            raise VideoProcessingError("Puppy no longer exists")
+        # This write bypasses the API, so drop cached pages built from the old puppy
+        prerender_service.invalidate()
+
+        await self._set_status(job_id, "completed", outputs=video_asset, completed_at=datetime.utcnow())
+        logger.info(f"Video job {job_id} completed with {len(renditions)} renditions")
+
+    async def _segment_hls(self, hls_path: Path, renditions: List[dict]) -> Path:
+        """Segment each MP4 rendition to HLS and write a master playlist"""
+        hls_path.mkdir()
+        master_lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+        for rendition in renditions:
+            rendition_dir = hls_path / rendition["name"]
+            rendition_dir.mkdir()
+            await self._ffmpeg(
+                "-i", str(rendition["path"]), "-c", "copy",
+                "-f", "hls", "-hls_time", "4", "-hls_playlist_type", "vod",
+                "-hls_segment_filename", str(rendition_dir / "segment_%03d.ts"),
+                str(rendition_dir / "index.m3u8")
+            )
+            bandwidth = int(rendition["video_bitrate"].rstrip("k")) * 1000 + int(rendition["audio_bitrate"].rstrip("k")) * 1000
+            master_lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION=x{rendition['height']}")
+            master_lines.append(f"{rendition['name']}/index.m3u8")
+        master_path = hls_path / "master.m3u8"
+        master_path.write_text("\n".join(master_lines) + "\n")
+        return master_path
+
+    async def _probe_height(self, source_path: Path) -> int:
+        process = await asyncio.create_subprocess_exec(
+            settings.VIDEO_FFPROBE_PATH, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "stream=height", "-of", "json", str(source_path),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise VideoProcessingError(f"ffprobe failed: {stderr.decode(errors='ignore')[-500:]}")
+        streams = json.loads(stdout or b"{}").get("streams", [])
+        if not streams:
+            raise VideoProcessingError("Source has no video stream")
+        return int(streams[0]["height"])
+
+    async def _ffmpeg(self, *args: str):
+        process = await asyncio.create_subprocess_exec(
+            settings.VIDEO_FFMPEG_PATH, "-y", "-hide_banner", "-loglevel", "error", *args,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise VideoProcessingError(f"ffmpeg failed: {stderr.decode(errors='ignore')[-500:]}")
+
+def serialize_job(job_doc: dict) -> dict:
+    job = job_doc.copy()
+    job["id"] = job.pop("_id")
+    return job
+
+video_processing_service = VideoProcessingService()
@@ -7,6 +7,8 @@ import { Footer } from './components/Footer';
 import { HomePage } from './pages/HomePage';
 import { AboutPage } from './pages/AboutPage';
 import { LittersPage } from './pages/LittersPage';
+import { PuppiesPage } from './pages/PuppiesPage';
+import { PuppyPage } from './pages/PuppyPage';
 import { ContactPage } from './pages/ContactPage';
 import { AdminLoginPage } from './pages/AdminLoginPage';
 import { AdminDashboard } from './pages/AdminDashboard';
@@ -23,7 +25,9 @@ function App() {
               <Route path="/" element={<HomePage />} />
               <Route path="/about" element={<AboutPage />} />
               <Route path="/litters" element={<LittersPage />} />
-              <Route path="/puppies" element={<LittersPage />} />
+              <Route path="/litters/:litterId" element={<LittersPage />} />
+              <Route path="/puppies" element={<PuppiesPage />} />
+              <Route path="/puppies/:puppyId" element={<PuppyPage />} />
               <Route path="/contact" element={<ContactPage />} />
               <Route path="/admin/login" element={<AdminLoginPage />} />
               <Route path="/admin" element={<AdminDashboard />} />
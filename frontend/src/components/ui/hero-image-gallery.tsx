@@ -1,5 +1,6 @@
 import React, { useEffect, useRef, useState } from 'react';
 import { cn } from '../../lib/utils';
+import type { ImageMetadata } from '../../lib/api';
 
 /**
  * HeroImageGallery - Enhanced image gallery component specifically for homepage hero sections
@@ -11,10 +12,12 @@ import { cn } from '../../lib/utils';
  * - Minimal dark overlay (5%)
  * - Responsive design
  * - No click-to-view or navigation arrows (clean presentation)
+ * - Optional per-image metadata paints a blurred placeholder while each image loads
  */
 
 interface HeroImageGalleryProps {
   images: string[];
+  placeholders?: (ImageMetadata | undefined)[];
   alt?: string;
   className?: string;
   autoplay?: boolean;
@@ -24,6 +27,7 @@ interface HeroImageGalleryProps {
 
 export function HeroImageGallery({ 
   images, 
+  placeholders = [],
   alt = "Hero image", 
   className,
   autoplay = true,
@@ -89,7 +93,9 @@ export function HeroImageGallery({
       {/* Main Image Display with slide animation */}
       <div className="relative w-full h-full overflow-hidden rounded-lg">
         <div className="relative w-full h-full">
-          {images.map((image, index) => (
+          {images.map((image, index) => {
+            const meta = placeholders[index];
+            return (
             <div
               key={index}
               className={cn(
@@ -100,15 +106,24 @@ export function HeroImageGallery({
                     ? "-translate-x-full opacity-0" 
                     : "translate-x-full opacity-0"
               )}
+              style={meta ? {
+                backgroundColor: meta.dominant_color,
+                backgroundImage: meta.lqip ? `url(${meta.lqip})` : undefined,
+                backgroundSize: 'cover',
+                backgroundPosition: 'center'
+              } : undefined}
             >
               <img
                 src={image}
                 alt={`${alt} ${index + 1}`}
+                width={meta?.width}
+                height={meta?.height}
                 className="w-full h-full object-contain"
                 loading={index === 0 ? "eager" : "lazy"}
               />
             </div>
-          ))}
+            );
+          })}
         </div>
         
         {/* Subtle overlay for text readability */}
@@ -0,0 +1,77 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { cn } from '../../lib/utils';
+import type { VideoAsset } from '../../lib/api';
+
+/**
+ * PuppyVideo - Plays an uploaded puppy video from its processed outputs
+ *
+ * - Shows the extracted poster frame and loads nothing until played
+ * - Uses the HLS playlist where the browser plays HLS natively (Safari, iOS)
+ * - Otherwise picks the smallest MP4 rendition that covers the player's size
+ *   on this screen (the smallest one when the visitor asked to save data)
+ * - Falls back to the original upload while processing is pending or if a
+ *   processed file fails to load
+ */
+
+const HLS_TYPE = 'application/vnd.apple.mpegurl';
+
+interface PuppyVideoProps {
+  src: string;
+  asset?: VideoAsset;
+  title?: string;
+  className?: string;
+}
+
+type Rendition = VideoAsset['renditions'][number];
+
+function pickRendition(renditions: Rendition[], targetHeight: number, saveData: boolean): Rendition {
+  const ladder = [...renditions].sort((a, b) => a.height - b.height);
+  if (saveData) {
+    return ladder[0];
+  }
+  return ladder.find((rendition) => rendition.height >= targetHeight) || ladder[ladder.length - 1];
+}
+
+function chooseSource(video: HTMLVideoElement, src: string, asset?: VideoAsset): string {
+  if (asset?.hls_url && video.canPlayType(HLS_TYPE)) {
+    return asset.hls_url;
+  }
+  if (asset?.renditions?.length) {
+    const saveData = Boolean((navigator as any).connection?.saveData);
+    const renderedHeight = (video.clientWidth || 640) * (9 / 16) * (window.devicePixelRatio || 1);
+    return pickRendition(asset.renditions, renderedHeight, saveData).url;
+  }
+  return src;
+}
+
+export function PuppyVideo({ src, asset, title, className }: PuppyVideoProps) {
+  const videoRef = useRef<HTMLVideoElement>(null);
+  const [source, setSource] = useState<string | undefined>(undefined);
+
+  useEffect(() => {
+    if (videoRef.current) {
+      setSource(chooseSource(videoRef.current, src, asset));
+    }
+  }, [src, asset]);
+
+  const handleError = () => {
+    // A processed output is missing or unplayable; the original always exists
+    if (source && source !== src) {
+      setSource(src);
+    }
+  };
+
+  return (
+    <video
+      ref={videoRef}
+      src={source}
+      poster={asset?.poster_url}
+      title={title}
+      controls
+      playsInline
+      preload="none"
+      onError={handleError}
+      className={cn('w-full aspect-video rounded-lg bg-black object-contain', className)}
+    />
+  );
+}
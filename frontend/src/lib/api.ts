@@ -27,6 +27,14 @@ export interface Litter {
   updated_at: string;
 }
 
+export interface ImageMetadata {
+  url: string;
+  width: number;
+  height: number;
+  dominant_color: string;
+  lqip?: string;
+}
+
 export interface ParentDog {
   name: string;
   breed: string;
@@ -34,6 +42,26 @@ export interface ParentDog {
   weight?: number;
   health_clearances: string[];
   image_url?: string;
+  image_meta?: ImageMetadata;
+}
+
+export interface VideoAsset {
+  job_id: string;
+  source_url: string;
+  poster_url?: string;
+  renditions: { name: string; height: number; bitrate: string; url: string }[];
+  hls_url?: string;
+}
+
+export interface VideoJob {
+  id: string;
+  puppy_id: string;
+  source_url: string;
+  status: 'queued' | 'processing' | 'completed' | 'failed' | 'skipped';
+  error?: string;
+  outputs?: VideoAsset;
+  created_at: string;
+  updated_at: string;
 }
 
 export interface Puppy {
@@ -45,11 +73,173 @@ export interface Puppy {
   estimated_adult_weight?: number;
   status: 'available' | 'reserved' | 'sold';
   images: string[];
+  image_meta?: ImageMetadata[];
   videos: string[];
+  video_assets?: VideoAsset[];
   microchip_id?: string;
   notes?: string;
 }
 
+export interface PuppySearchFilters {
+  breed?: string[];
+  generation?: string[];
+  gender?: string[];
+  color?: string[];
+  status?: Puppy['status'][];
+  born_after?: string;
+  born_before?: string;
+  litter_id?: string;
+  sort_by?: 'birth_date' | 'name' | 'status';
+  sort_order?: 'asc' | 'desc';
+  skip?: number;
+  limit?: number;
+}
+
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+export interface PuppySearchResult {
+  puppies: (Puppy & { litter: { id: string; name: string; breed: string; generation: string } })[];
+  total: number;
+  facets: Record<'breed' | 'generation' | 'gender' | 'color' | 'status', FacetCount[]>;
+}
+
+export interface SearchHit {
+  type: 'litter' | 'parent' | 'puppy' | 'inquiry';
+  id: string;
+  litter_id?: string;
+  role?: 'mother' | 'father';
+  title: string;
+  email?: string;
+  submitted_at?: string;
+  responded?: boolean;
+  score: number;
+  // Field name -> HTML-escaped snippet with matches wrapped in <mark>
+  highlights: Record<string, string>;
+}
+
+export interface SearchResult {
+  query: string;
+  hits: SearchHit[];
+  skip: number;
+  limit: number;
+  has_more: boolean;
+}
+
+export interface InquiryFilters {
+  responded?: boolean;
+  puppy_name?: string;
+  litter_name?: string;
+  submitted_after?: string;
+  submitted_before?: string;
+  q?: string;
+  cursor?: string;
+  limit?: number;
+}
+
+export interface ContactInquirySummary {
+  id: string;
+  name: string;
+  email: string;
+  phone: string;
+  preview: string;
+  puppy_name?: string;
+  litter_name?: string;
+  subject?: string;
+  submitted_at: string;
+  responded: boolean;
+  responded_at?: string;
+}
+
+export interface ContactInquiryPage {
+  inquiries: ContactInquirySummary[];
+  next_cursor?: string | null;
+  unresponded_count: number;
+}
+
+export type PuppyBulkOperation =
+  | { op: 'create'; litter_id: string; puppy: Omit<Puppy, 'id' | 'images' | 'videos' | 'video_assets'> }
+  | { op: 'update'; puppy_id: string; update: Partial<Omit<Puppy, 'id' | 'images' | 'videos' | 'video_assets'>> }
+  | { op: 'status'; puppy_id: string; status: Puppy['status'] };
+
+export interface PuppyBulkResult {
+  index: number;
+  op: PuppyBulkOperation['op'];
+  success: boolean;
+  litter_id?: string;
+  puppy_id?: string;
+  puppy?: Puppy;
+  error?: string;
+}
+
+export interface BootstrapPayload {
+  homepage: any;
+  current_litters: Litter[];
+  available_puppies: (Puppy & { litter: { id: string; name: string; breed: string; generation: string } })[];
+  local_business: Record<string, any>;
+}
+
+const IDEMPOTENT_METHODS = ['POST', 'PUT', 'PATCH'];
+const MAX_WRITE_ATTEMPTS = 3;
+
+function newIdempotencyKey(): string {
+  if (window.crypto?.randomUUID) {
+    return window.crypto.randomUUID();
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Writes carry an Idempotency-Key and are retried with the same key on network
+// failures, so a retried request is replayed by the server instead of repeated
+async function fetchWithRetry(url: string, config: RequestInit): Promise<Response> {
+  const method = (config.method || 'GET').toUpperCase();
+  if (!IDEMPOTENT_METHODS.includes(method)) {
+    return fetch(url, config);
+  }
+
+  const headers = new Headers(config.headers);
+  headers.set('Idempotency-Key', newIdempotencyKey());
+  let body = config.body;
+  if (body instanceof FormData) {
+    // Each fetch of a FormData picks a fresh multipart boundary; encode it once so
+    // every attempt sends the same bytes and matches the server's request fingerprint
+    const encoded = new Request(url, { method, body });
+    headers.set('Content-Type', encoded.headers.get('Content-Type') || '');
+    body = await encoded.blob();
+  }
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const response = await fetch(url, { ...config, headers, body });
+      // The first attempt is still running on the server; wait for its stored response
+      if (response.status === 409 && response.headers.has('Retry-After') && attempt < MAX_WRITE_ATTEMPTS) {
+        await sleep((Number(response.headers.get('Retry-After')) || 1) * 1000);
+        continue;
+      }
+      return response;
+    } catch (error) {
+      if (attempt >= MAX_WRITE_ATTEMPTS) {
+        throw error;
+      }
+      await sleep(500 * attempt);
+    }
+  }
+}
+
+// SHA-256 of a file's bytes, matching the backend's content-addressed media keys
+async function hashFile(file: File): Promise<string | null> {
+  if (!window.crypto?.subtle) {
+    return null;
+  }
+  const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
+
 class ApiClient {
   private token: string | null = null;
 
@@ -83,7 +273,7 @@ class ApiClient {
       },
     };
 
-    const response = await fetch(url, config);
+    const response = await fetchWithRetry(url, config);
 
     if (!response.ok) {
       if (response.status === 401) {
@@ -105,6 +295,59 @@ class ApiClient {
     return response.json();
   }
 
+  // Upload a file, skipping the byte transfer when the server already stores identical content
+  private async uploadMedia(endpoint: string, file: File, fields: Record<string, string> = {}) {
+    const contentHash = await hashFile(file);
+    let alreadyStored = false;
+    if (contentHash) {
+      try {
+        const check = await this.request('/media/check', {
+          method: 'POST',
+          body: JSON.stringify({ hashes: [contentHash] }),
+        });
+        alreadyStored = Boolean(check.existing?.[contentHash]);
+      } catch {
+        alreadyStored = false;
+      }
+    }
+
+    const send = (includeFile: boolean) => {
+      const formData = new FormData();
+      Object.entries(fields).forEach(([key, value]) => formData.append(key, value));
+      if (contentHash) {
+        formData.append('content_hash', contentHash);
+      }
+      if (includeFile) {
+        formData.append('file', file);
+      }
+
+      const token = this.getToken();
+      return fetchWithRetry(`${API_BASE_URL}${API_PREFIX}${endpoint}`, {
+        method: 'POST',
+        headers: {
+          ...(token && { Authorization: `Bearer ${token}` }),
+        },
+        body: formData,
+      });
+    };
+
+    let response = await send(!alreadyStored);
+    if (alreadyStored && response.status === 400) {
+      // The stored copy was garbage collected after the check; send the bytes after all
+      response = await send(true);
+    }
+
+    if (!response.ok) {
+      if (response.status === 401) {
+        this.clearToken();
+      }
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || `API Error: ${response.status} ${response.statusText}`);
+    }
+
+    return response.json();
+  }
+
   // Auth endpoints
   async login(username: string, hashedPassword: string): Promise<AuthResponse> {
     return this.request('/auth/login', {
@@ -199,56 +442,35 @@ class ApiClient {
   }
 
   // Puppy image endpoints
-  async uploadPuppyImage(puppyId: string, file: File): Promise<{ image_url: string; message: string }> {
-    const formData = new FormData();
-    formData.append('file', file);
-    
-    const token = this.getToken();
-    const response = await fetch(`${API_BASE_URL}${API_PREFIX}/puppies/${puppyId}/images`, {
-      method: 'POST',
-      headers: {
-        ...(token && { Authorization: `Bearer ${token}` }),
-      },
-      body: formData,
-    });
-
-    if (!response.ok) {
-      if (response.status === 401) {
-        this.clearToken();
-      }
-      throw new Error(`API Error: ${response.status} ${response.statusText}`);
-    }
+  async uploadPuppyImage(puppyId: string, file: File): Promise<{ image_url: string; image_meta?: ImageMetadata; message: string }> {
+    return this.uploadMedia(`/puppies/${puppyId}/images`, file);
+  }
 
-    return response.json();
+  // Images are identified by URL, so concurrent edits can't remove the wrong one
+  async deletePuppyImage(puppyId: string, imageUrl: string): Promise<{ removed: string[]; message: string }> {
+    return this.removePuppyImages(puppyId, [imageUrl]);
   }
 
-  async deletePuppyImage(puppyId: string, imageIndex: number): Promise<{ message: string }> {
-    return this.request(`/puppies/${puppyId}/images/${imageIndex}`, {
-      method: 'DELETE',
+  async removePuppyImages(puppyId: string, imageUrls: string[]): Promise<{ removed: string[]; message: string }> {
+    return this.request(`/puppies/${puppyId}/images/remove`, {
+      method: 'POST',
+      body: JSON.stringify({ urls: imageUrls }),
     });
   }
 
-  async uploadPuppyVideo(puppyId: string, file: File): Promise<{ video_url: string; message: string }> {
-    const formData = new FormData();
-    formData.append('file', file);
-    
-    const token = this.getToken();
-    const response = await fetch(`${API_BASE_URL}${API_PREFIX}/puppies/${puppyId}/videos`, {
-      method: 'POST',
-      headers: {
-        ...(token && { Authorization: `Bearer ${token}` }),
-      },
-      body: formData,
+  async reorderPuppyImages(puppyId: string, imageUrls: string[]): Promise<{ images: string[]; message: string }> {
+    return this.request(`/puppies/${puppyId}/images/order`, {
+      method: 'PUT',
+      body: JSON.stringify({ urls: imageUrls }),
     });
+  }
 
-    if (!response.ok) {
-      if (response.status === 401) {
-        this.clearToken();
-      }
-      throw new Error(`API Error: ${response.status} ${response.statusText}`);
-    }
+  async uploadPuppyVideo(puppyId: string, file: File): Promise<{ video_url: string; job: VideoJob; message: string }> {
+    return this.uploadMedia(`/puppies/${puppyId}/videos`, file);
+  }
 
-    return response.json();
+  async getPuppyVideoJobs(puppyId: string): Promise<VideoJob[]> {
+    return this.request(`/puppies/${puppyId}/video-jobs`);
   }
 
   // Contact endpoints
@@ -266,8 +488,20 @@ class ApiClient {
     });
   }
 
-  async getContactInquiries(): Promise<any[]> {
-    return this.request('/contact/inquiries');
+  // Inbox page, newest first; pass next_cursor back as cursor for the next page
+  async getContactInquiries(filters: InquiryFilters = {}): Promise<ContactInquiryPage> {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        params.append(key, String(value));
+      }
+    });
+    const query = params.toString();
+    return this.request(`/contact/inquiries${query ? `?${query}` : ''}`);
+  }
+
+  async getContactInquiry(inquiryId: string): Promise<any> {
+    return this.request(`/contact/inquiries/${inquiryId}`);
   }
 
   async markInquiryResponded(inquiryId: string): Promise<void> {
@@ -276,56 +510,47 @@ class ApiClient {
     });
   }
 
-  // Get individual puppy by ID
-  async getPuppy(puppyId: string): Promise<any> {
-    return this.request(`/puppies/${puppyId}`);
-  }
-
-  // Parent image endpoints
-  async uploadMotherImage(litterId: string, file: File): Promise<{ image_url: string; message: string }> {
-    const formData = new FormData();
-    formData.append('file', file);
-    
-    const token = this.getToken();
-    const response = await fetch(`${API_BASE_URL}${API_PREFIX}/litters/${litterId}/mother/image`, {
+  // Apply many puppy creates/updates/status changes in one request
+  async bulkPuppies(operations: PuppyBulkOperation[]): Promise<PuppyBulkResult[]> {
+    return this.request('/puppies/bulk', {
       method: 'POST',
-      headers: {
-        ...(token && { Authorization: `Bearer ${token}` }),
-      },
-      body: formData,
+      body: JSON.stringify({ operations }),
     });
+  }
 
-    if (!response.ok) {
-      if (response.status === 401) {
-        this.clearToken();
+  // Faceted puppy search; array filters are sent as repeated query parameters
+  async searchPuppies(filters: PuppySearchFilters = {}): Promise<PuppySearchResult> {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (Array.isArray(value)) {
+        value.forEach((item) => params.append(key, item));
+      } else if (value !== undefined && value !== null && value !== '') {
+        params.append(key, String(value));
       }
-      throw new Error(`API Error: ${response.status} ${response.statusText}`);
-    }
+    });
+    const query = params.toString();
+    return this.request(`/puppies/search${query ? `?${query}` : ''}`);
+  }
 
-    return response.json();
+  // Admin search across litters, parents, puppies and inquiries
+  async search(query: string, types: SearchHit['type'][] = [], skip: number = 0, limit: number = 20): Promise<SearchResult> {
+    const params = new URLSearchParams({ q: query, skip: String(skip), limit: String(limit) });
+    types.forEach((type) => params.append('types', type));
+    return this.request(`/search/?${params.toString()}`);
   }
 
-  async uploadFatherImage(litterId: string, file: File): Promise<{ image_url: string; message: string }> {
-    const formData = new FormData();
-    formData.append('file', file);
-    
-    const token = this.getToken();
-    const response = await fetch(`${API_BASE_URL}${API_PREFIX}/litters/${litterId}/father/image`, {
-      method: 'POST',
-      headers: {
-        ...(token && { Authorization: `Bearer ${token}` }),
-      },
-      body: formData,
-    });
+  // Get individual puppy by ID
+  async getPuppy(puppyId: string): Promise<any> {
+    return this.request(`/puppies/${puppyId}`);
+  }
 
-    if (!response.ok) {
-      if (response.status === 401) {
-        this.clearToken();
-      }
-      throw new Error(`API Error: ${response.status} ${response.statusText}`);
-    }
+  // Parent image endpoints
+  async uploadMotherImage(litterId: string, file: File): Promise<{ image_url: string; image_meta?: ImageMetadata; message: string }> {
+    return this.uploadMedia(`/litters/${litterId}/mother/image`, file);
+  }
 
-    return response.json();
+  async uploadFatherImage(litterId: string, file: File): Promise<{ image_url: string; image_meta?: ImageMetadata; message: string }> {
+    return this.uploadMedia(`/litters/${litterId}/father/image`, file);
   }
 
   async deleteMotherImage(litterId: string): Promise<{ message: string }> {
@@ -341,37 +566,36 @@ class ApiClient {
   }
 
   // Homepage content endpoint
+  // Everything the homepage needs for first paint in a single request
+  async getBootstrap(): Promise<BootstrapPayload> {
+    return this.request('/bootstrap');
+  }
+
   async getHomepageContent(): Promise<any> {
     return this.request('/homepage/content');
   }
 
-  // Hero image upload endpoint
-  async uploadHeroImage(file: File, title?: string, subtitle?: string, altText?: string): Promise<{ hero_image: any; message: string }> {
-    const formData = new FormData();
-    formData.append('file', file);
-    if (title) formData.append('title', title);
-    if (subtitle) formData.append('subtitle', subtitle);
-    formData.append('alt_text', altText || 'Hero image');
-    formData.append('order', '0');
-    
-    const token = this.getToken();
-    const response = await fetch(`${API_BASE_URL}${API_PREFIX}/homepage/hero-images`, {
+  // Admin edits apply to the draft until it is published
+  async getHomepageDraft(): Promise<any> {
+    return this.request('/homepage/draft');
+  }
+
+  async publishHomepage(): Promise<{ version: number; published_at: string; published_by: string; message: string }> {
+    return this.request('/homepage/publish', {
       method: 'POST',
-      headers: {
-        ...(token && { Authorization: `Bearer ${token}` }),
-      },
-      body: formData,
     });
+  }
 
-    if (!response.ok) {
-      if (response.status === 401) {
-        this.clearToken();
-      }
-      const errorData = await response.json().catch(() => ({}));
-      throw new Error(errorData.detail || `API Error: ${response.status} ${response.statusText}`);
-    }
+  // Hero image upload endpoint
+  async uploadHeroImage(file: File, title?: string, subtitle?: string, altText?: string): Promise<{ hero_image: any; message: string }> {
+    const fields: Record<string, string> = {
+      alt_text: altText || 'Hero image',
+      order: '0',
+    };
+    if (title) fields.title = title;
+    if (subtitle) fields.subtitle = subtitle;
 
-    return response.json();
+    return this.uploadMedia('/homepage/hero-images', file, fields);
   }
 
   // Update hero image endpoint
@@ -382,6 +606,14 @@ class ApiClient {
     });
   }
 
+  // Reorder hero images; order follows the position of each id
+  async reorderHeroImages(heroIds: string[]): Promise<{ hero_images: { id: string; order: number }[]; message: string }> {
+    return this.request('/homepage/hero-images/order', {
+      method: 'PUT',
+      body: JSON.stringify({ ids: heroIds }),
+    });
+  }
+
   // Delete hero image endpoint
   async deleteHeroImage(heroId: string): Promise<{ message: string }> {
     return this.request(`/homepage/hero-images/${heroId}`, {
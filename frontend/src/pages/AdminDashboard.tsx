@@ -16,7 +16,7 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from
 import { ImageGallery, ImageCarousel } from "../components/ui/image-gallery"
 import { LitterInfoStep, ParentInfoStep, PuppyInfoStep, ReviewStep } from '../components/LitterCreationSteps'
 import { useAuth, withAuth } from "../contexts/AuthContext"
-import { api, type Litter, type Puppy } from "../lib/api"
+import { api, type ContactInquirySummary, type Litter, type Puppy, type SearchHit } from "../lib/api"
 import { toast } from 'sonner'
 import { 
   Home, 
@@ -33,22 +33,11 @@ import {
   ChevronRight,
   Menu,
   X,
-  Upload
+  Upload,
+  Search
 } from "lucide-react"
 
-interface ContactInquiry {
-  id: string
-  name: string
-  email: string
-  phone: string
-  message: string
-  puppy_name?: string
-  litter_name?: string
-  subject?: string
-  submitted_at: string
-  responded: boolean
-  notes?: string
-}
+type ContactInquiry = ContactInquirySummary
 
 interface HeroImage {
   id: string
@@ -75,6 +64,8 @@ interface HomepageContent {
   sections: HomepageSection[]
   meta_title?: string
   meta_description?: string
+  published_version?: number
+  has_unpublished_changes?: boolean
 }
 
 type NavigationItem = 'overview' | 'homepage' | 'litters' | 'inquiries' | 'create-litter' | 'edit-litter'
@@ -82,6 +73,7 @@ type NavigationItem = 'overview' | 'homepage' | 'litters' | 'inquiries' | 'creat
 function AdminDashboardComponent() {
   const [litters, setLitters] = useState<Litter[]>([])
   const [inquiries, setInquiries] = useState<ContactInquiry[]>([])
+  const [unrespondedCount, setUnrespondedCount] = useState(0)
   const [homepageContent, setHomepageContent] = useState<HomepageContent>({
     hero_images: [],
     sections: []
@@ -93,6 +85,7 @@ function AdminDashboardComponent() {
   const [mobileMenuOpen, setMobileMenuOpen] = useState(false)
   const [isMobile, setIsMobile] = useState(false)
   const [editingLitter, setEditingLitter] = useState<Litter | null>(null)
+  const [inquiryQuery, setInquiryQuery] = useState('')
   
   // Delete confirmation modal state
   const [showDeleteModal, setShowDeleteModal] = useState(false)
@@ -128,11 +121,12 @@ function AdminDashboardComponent() {
     try {
       const [litterData, inquiryData, homepageData] = await Promise.all([
         api.getLitters(),
-        api.getContactInquiries(),
+        api.getContactInquiries({ limit: 3 }),
         fetchHomepageContent()
       ])
       setLitters(litterData)
-      setInquiries(inquiryData)
+      setInquiries(inquiryData.inquiries)
+      setUnrespondedCount(inquiryData.unresponded_count)
       setHomepageContent(homepageData)
     } catch (error) {
       console.error("Failed to fetch data:", error)
@@ -143,7 +137,7 @@ function AdminDashboardComponent() {
 
   const fetchHomepageContent = async (): Promise<HomepageContent> => {
     try {
-      return await api.getHomepageContent()
+      return await api.getHomepageDraft()
     } catch (error) {
       console.error("Failed to fetch homepage content:", error)
       return { hero_images: [], sections: [] }
@@ -249,6 +243,7 @@ function AdminDashboardComponent() {
       await api.markInquiryResponded(inquiryId)
       await fetchData()
       toast.success('Inquiry marked as responded')
+      return true
     } catch (error) {
       console.error("Failed to mark inquiry as responded:", error)
       toast.error(
@@ -257,14 +252,31 @@ function AdminDashboardComponent() {
           description: error instanceof Error ? error.message : "Please try again"
         }
       )
+      return false
     }
   }
 
+  const openSearchHit = (hit: SearchHit) => {
+    if (hit.type === 'inquiry') {
+      setSelectedLitter(null)
+      setInquiryQuery(hit.email || hit.title)
+      setActiveNav('inquiries')
+      return
+    }
+    const litter = litters.find(l => l.id === hit.litter_id)
+    if (!litter) {
+      toast.error("That litter is no longer available")
+      return
+    }
+    setSelectedLitter(litter)
+    setActiveNav('litters')
+  }
+
   const navigationItems = [
     { id: 'overview', label: 'Overview', icon: Home },
     { id: 'homepage', label: 'Homepage', icon: Camera },
     { id: 'litters', label: 'Litters', icon: Heart, count: litters.length },
-    { id: 'inquiries', label: 'Inquiries', icon: Mail, count: inquiries.filter(i => !i.responded).length }
+    { id: 'inquiries', label: 'Inquiries', icon: Mail, count: unrespondedCount }
   ]
 
   if (loading) {
@@ -358,6 +370,7 @@ function AdminDashboardComponent() {
                   }`}
                   onClick={() => {
                     setActiveNav(item.id as NavigationItem)
+                    setInquiryQuery('')
                     if (item.id !== 'litters') {
                       setSelectedLitter(null)
                     }
@@ -428,8 +441,10 @@ function AdminDashboardComponent() {
               <OverviewContent 
                 litters={litters}
                 inquiries={inquiries}
+                unrespondedCount={unrespondedCount}
                 formatDate={formatDate}
                 getAvailableCount={getAvailableCount}
+                onOpenHit={openSearchHit}
               />
             )}
 
@@ -494,7 +509,7 @@ function AdminDashboardComponent() {
 
             {activeNav === 'inquiries' && (
               <InquiriesManagement 
-                inquiries={inquiries}
+                initialQuery={inquiryQuery}
                 onMarkResponded={handleMarkInquiryResponded}
                 formatDate={formatDate}
               />
@@ -543,11 +558,13 @@ function AdminDashboardComponent() {
 }
 
 // Overview Content Component
-function OverviewContent({ litters, inquiries, formatDate, getAvailableCount }: {
+function OverviewContent({ litters, inquiries, unrespondedCount, formatDate, getAvailableCount, onOpenHit }: {
   litters: Litter[];
   inquiries: ContactInquiry[];
+  unrespondedCount: number;
   formatDate: (date: string) => string;
   getAvailableCount: (puppies: Puppy[]) => number;
+  onOpenHit: (hit: SearchHit) => void;
 }) {
   return (
     <div className="space-y-4 sm:space-y-6 md:space-y-8">
@@ -556,6 +573,8 @@ function OverviewContent({ litters, inquiries, formatDate, getAvailableCount }:
         <p className="text-sm md:text-base text-muted-foreground">Your breeding business at a glance</p>
       </div>
 
+      <AdminSearch onOpenHit={onOpenHit} formatDate={formatDate} />
+
       {/* Stats Cards */}
       <div className="grid grid-cols-1 sm:grid-cols-2 xl:grid-cols-4 gap-3 sm:gap-4 md:gap-6">
         <Card className="breeder-card">
@@ -608,7 +627,7 @@ function OverviewContent({ litters, inquiries, formatDate, getAvailableCount }:
           </CardHeader>
           <CardContent>
             <div className="text-2xl font-bold">
-              {inquiries.filter(i => !i.responded).length}
+              {unrespondedCount}
             </div>
             <p className="text-xs text-muted-foreground">
               Awaiting response
@@ -700,6 +719,115 @@ function OverviewContent({ litters, inquiries, formatDate, getAvailableCount }:
   )
 }
 
+// Admin Search Component
+const SEARCH_PAGE_SIZE = 20
+
+const HIT_LABELS: Record<SearchHit['type'], string> = {
+  litter: 'Litter',
+  parent: 'Parent',
+  puppy: 'Puppy',
+  inquiry: 'Inquiry'
+}
+
+function AdminSearch({ onOpenHit, formatDate }: {
+  onOpenHit: (hit: SearchHit) => void;
+  formatDate: (date: string) => string;
+}) {
+  const [searchInput, setSearchInput] = useState('')
+  const [query, setQuery] = useState('')
+  const [hits, setHits] = useState<SearchHit[]>([])
+  const [hasMore, setHasMore] = useState(false)
+  const [searching, setSearching] = useState(false)
+
+  const runSearch = async (q: string, skip: number = 0) => {
+    setSearching(true)
+    try {
+      const result = await api.search(q, [], skip, SEARCH_PAGE_SIZE)
+      setHits(previous => skip ? [...previous, ...result.hits] : result.hits)
+      setHasMore(result.has_more)
+      setQuery(q)
+    } catch (error) {
+      console.error("Search failed:", error)
+      toast.error("Search failed")
+    } finally {
+      setSearching(false)
+    }
+  }
+
+  return (
+    <Card className="breeder-card">
+      <CardContent className="pt-6 space-y-4">
+        <form
+          className="flex gap-2"
+          onSubmit={(e) => {
+            e.preventDefault()
+            const q = searchInput.trim()
+            if (q) {
+              runSearch(q)
+            } else {
+              setQuery('')
+              setHits([])
+              setHasMore(false)
+            }
+          }}
+        >
+          <Input
+            value={searchInput}
+            onChange={(e) => setSearchInput(e.target.value)}
+            placeholder="Search litters, parents, puppies and inquiries"
+          />
+          <Button type="submit" variant="outline" size="sm" className="gap-2" disabled={searching}>
+            <Search className="h-4 w-4" />
+            Search
+          </Button>
+        </form>
+
+        {query && (
+          <div className="space-y-2">
+            {hits.map((hit) => (
+              <button
+                key={`${hit.type}:${hit.id}`}
+                className="w-full text-left p-3 glass-button rounded-lg space-y-1"
+                onClick={() => onOpenHit(hit)}
+              >
+                <div className="flex items-center gap-2 min-w-0">
+                  <Badge variant="outline" className="text-xs flex-shrink-0">{HIT_LABELS[hit.type]}</Badge>
+                  <span className="font-medium text-sm truncate">{hit.title}</span>
+                  {hit.type === 'inquiry' && hit.submitted_at && (
+                    <span className="text-xs text-muted-foreground ml-auto flex-shrink-0">{formatDate(hit.submitted_at)}</span>
+                  )}
+                </div>
+                {Object.entries(hit.highlights).map(([field, snippet]) => (
+                  // Snippets arrive HTML-escaped from the server with only <mark> tags added
+                  <p
+                    key={field}
+                    className="text-xs text-muted-foreground truncate"
+                    dangerouslySetInnerHTML={{ __html: snippet }}
+                  />
+                ))}
+              </button>
+            ))}
+            {hits.length === 0 && !searching && (
+              <p className="text-center text-muted-foreground py-4 text-sm">No results for "{query}"</p>
+            )}
+            {hasMore && (
+              <Button
+                variant="outline"
+                size="sm"
+                className="w-full"
+                onClick={() => runSearch(query, hits.length)}
+                disabled={searching}
+              >
+                {searching ? 'Loading...' : 'Load more'}
+              </Button>
+            )}
+          </div>
+        )}
+      </CardContent>
+    </Card>
+  )
+}
+
 // Litters Overview Component
 function LittersOverview({ litters, onSelectLitter, onCreateLitter, formatDate, getAvailableCount, getLitterImagesWithPuppyNames }: {
   litters: Litter[];
@@ -1819,6 +1947,24 @@ function HomepageManagement({ content, onUpdate }: {
     }
   }
 
+  const handlePublish = async () => {
+    const toastId = toast.loading('Publishing homepage...')
+    try {
+      const result = await api.publishHomepage()
+      onUpdate()
+      toast.success(`Homepage version ${result.version} published!`, { id: toastId })
+    } catch (error) {
+      console.error('Failed to publish homepage:', error)
+      toast.error(
+        'Failed to publish homepage',
+        {
+          id: toastId,
+          description: error instanceof Error ? error.message : 'Please try again'
+        }
+      )
+    }
+  }
+
   const handleEditHeroImage = (image: HeroImage) => {
     setEditingHeroImage(image)
     setShowEditDialog(true)
@@ -1851,6 +1997,26 @@ function HomepageManagement({ content, onUpdate }: {
         <p className="text-sm sm:text-base text-muted-foreground">Manage your website's homepage content and images</p>
       </div>
 
+      {/* Publish Status */}
+      <Card className="breeder-card">
+        <CardContent className="flex flex-col sm:flex-row sm:items-center justify-between gap-3 pt-6">
+          <div className="text-sm text-muted-foreground">
+            {content.has_unpublished_changes
+              ? 'You have unpublished changes. Visitors still see the last published version.'
+              : 'The live homepage is up to date.'}
+            {content.published_version ? ` (Live version ${content.published_version})` : ''}
+          </div>
+          <Button
+            className="glass-button-primary gap-2"
+            onClick={handlePublish}
+            disabled={!content.has_unpublished_changes}
+          >
+            <Check className="h-4 w-4" />
+            Publish Changes
+          </Button>
+        </CardContent>
+      </Card>
+
       {/* Hero Images Section */}
       <Card className="breeder-card">
         <CardHeader>
@@ -2144,16 +2310,63 @@ function HeroImageUploadDialog({
   )
 }
 
-// Inquiries Management Component (keeping the existing one)
+// Inquiries Management Component - pages through the server-side inbox
 function InquiriesManagement({ 
-  inquiries, 
+  initialQuery = '',
   onMarkResponded, 
   formatDate 
 }: {
-  inquiries: ContactInquiry[];
-  onMarkResponded: (id: string) => void;
+  initialQuery?: string;
+  onMarkResponded: (id: string) => Promise<boolean>;
   formatDate: (date: string) => string;
 }) {
+  const [inquiries, setInquiries] = useState<ContactInquiry[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [statusFilter, setStatusFilter] = useState<'all' | 'pending' | 'responded'>(initialQuery ? 'all' : 'pending')
+  const [searchInput, setSearchInput] = useState(initialQuery)
+  const [searchQuery, setSearchQuery] = useState(initialQuery)
+  const [loadingInquiries, setLoadingInquiries] = useState(false)
+  const [messages, setMessages] = useState<Record<string, string>>({})
+
+  const loadInquiries = async (cursor?: string) => {
+    setLoadingInquiries(true)
+    try {
+      const page = await api.getContactInquiries({
+        responded: statusFilter === 'all' ? undefined : statusFilter === 'responded',
+        q: searchQuery || undefined,
+        cursor
+      })
+      setInquiries(previous => cursor ? [...previous, ...page.inquiries] : page.inquiries)
+      setNextCursor(page.next_cursor || null)
+    } catch (error) {
+      console.error("Failed to load inquiries:", error)
+      toast.error("Failed to load inquiries")
+    } finally {
+      setLoadingInquiries(false)
+    }
+  }
+
+  useEffect(() => {
+    loadInquiries()
+  // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [statusFilter, searchQuery])
+
+  const showFullMessage = async (inquiryId: string) => {
+    try {
+      const inquiry = await api.getContactInquiry(inquiryId)
+      setMessages(previous => ({ ...previous, [inquiryId]: inquiry.message }))
+    } catch (error) {
+      console.error("Failed to load inquiry:", error)
+    }
+  }
+
+  const handleMarkResponded = async (inquiryId: string) => {
+    if (!(await onMarkResponded(inquiryId))) return
+    setInquiries(previous => statusFilter === 'pending'
+      ? previous.filter(inquiry => inquiry.id !== inquiryId)
+      : previous.map(inquiry => inquiry.id === inquiryId ? { ...inquiry, responded: true } : inquiry))
+  }
+
   return (
     <div className="space-y-4 sm:space-y-6">
       <div>
@@ -2161,6 +2374,38 @@ function InquiriesManagement({
         <p className="text-sm sm:text-base text-muted-foreground">Manage customer inquiries and messages</p>
       </div>
 
+      <div className="flex flex-col sm:flex-row gap-3">
+        <div className="flex gap-2">
+          {(['pending', 'responded', 'all'] as const).map((filter) => (
+            <Button
+              key={filter}
+              variant={statusFilter === filter ? "default" : "outline"}
+              size="sm"
+              onClick={() => setStatusFilter(filter)}
+            >
+              {filter === 'pending' ? 'Pending' : filter === 'responded' ? 'Responded' : 'All'}
+            </Button>
+          ))}
+        </div>
+        <form
+          className="flex flex-1 gap-2"
+          onSubmit={(e) => {
+            e.preventDefault()
+            setSearchQuery(searchInput.trim())
+          }}
+        >
+          <Input
+            value={searchInput}
+            onChange={(e) => setSearchInput(e.target.value)}
+            placeholder="Search name, email, puppy or message"
+          />
+          <Button type="submit" variant="outline" size="sm" className="gap-2">
+            <Search className="h-4 w-4" />
+            Search
+          </Button>
+        </form>
+      </div>
+
       <div className="grid gap-3 sm:gap-4">
         {inquiries.map((inquiry) => (
           <Card key={inquiry.id} className="breeder-card">
@@ -2188,11 +2433,19 @@ function InquiriesManagement({
                 </p>
               )}
               <div className="bg-secondary/30 p-3 rounded-lg mb-4">
-                <p className="text-sm">{inquiry.message}</p>
+                <p className="text-sm whitespace-pre-wrap">{messages[inquiry.id] ?? inquiry.preview}</p>
+                {!messages[inquiry.id] && (
+                  <button
+                    className="text-xs text-primary mt-2 hover:underline"
+                    onClick={() => showFullMessage(inquiry.id)}
+                  >
+                    Show full message
+                  </button>
+                )}
               </div>
               {!inquiry.responded && (
                 <Button 
-                  onClick={() => onMarkResponded(inquiry.id)}
+                  onClick={() => handleMarkResponded(inquiry.id)}
                   className="glass-button-primary gap-2"
                 >
                   <Mail className="h-4 w-4" />
@@ -2202,14 +2455,23 @@ function InquiriesManagement({
             </CardContent>
           </Card>
         ))}
-        {inquiries.length === 0 && (
+        {inquiries.length === 0 && !loadingInquiries && (
           <Card className="breeder-card">
             <CardContent className="text-center py-8">
               <Mail className="h-12 w-12 text-muted-foreground mx-auto mb-4" />
-              <p className="text-muted-foreground">No inquiries yet</p>
+              <p className="text-muted-foreground">No inquiries found</p>
             </CardContent>
           </Card>
         )}
+        {nextCursor && (
+          <Button
+            variant="outline"
+            onClick={() => loadInquiries(nextCursor)}
+            disabled={loadingInquiries}
+          >
+            {loadingInquiries ? 'Loading...' : 'Load more'}
+          </Button>
+        )}
       </div>
     </div>
   )
@@ -3003,7 +3265,7 @@ function PuppyForm({ puppy, onChange, onSave, onCancel, isNew, isEdit }: {
       const toastId = toast.loading(`Deleting ${imageName}...`)
       
       console.log('Deleting image at index:', index, 'for puppy:', puppy.id)
-      await api.deletePuppyImage(puppy.id, index)
+      await api.deletePuppyImage(puppy.id, imageUrl)
       
       const newExistingImages = puppy.existing_images.filter((_: string, i: number) => i !== index)
       console.log('Images after deletion:', newExistingImages)
@@ -3394,7 +3656,7 @@ function PuppyEditForm({ puppy, onSave, onCancel, onUpdate }: {
     
     try {
       setUploading(true)
-      await api.deletePuppyImage(puppy.id, imageIndex)
+      await api.deletePuppyImage(puppy.id, puppy.existing_images[imageIndex])
       
       toast.success('Image deleted successfully!')
       
@@ -9,12 +9,13 @@ import {
 import { Badge } from "../components/ui/badge"
 import { ImageGallery } from "../components/ui/image-gallery"
 import { HeroImageGallery } from "../components/ui/hero-image-gallery"
-import { api, type Litter } from "../lib/api"
+import { api, type ImageMetadata, type Litter } from "../lib/api"
 import { Heart, Dog, Star, Users, Award, Phone, Mail, MapPin, Plane, Car, User, Truck, Navigation } from "lucide-react"
 
 interface HeroImage {
   id: string
   image_url: string
+  image_meta?: ImageMetadata
   title?: string
   subtitle?: string
   alt_text: string
@@ -43,12 +44,9 @@ export function HomePage() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [litterData, homepageData] = await Promise.all([
-          api.getLitters(),
-          fetchHomepageContent()
-        ])
-        setLitters(litterData.filter((litter: Litter) => litter.is_current))
-        setHomepageContent(homepageData)
+        const bootstrap = await api.getBootstrap()
+        setLitters(bootstrap.current_litters)
+        setHomepageContent(bootstrap.homepage || { hero_images: [], sections: [] })
       } catch (error) {
         console.error("Failed to fetch data:", error)
       } finally {
@@ -59,15 +57,6 @@ export function HomePage() {
     fetchData()
   }, [])
 
-  const fetchHomepageContent = async (): Promise<HomepageContent> => {
-    try {
-      return await api.getHomepageContent()
-    } catch (error) {
-      console.error("Failed to fetch homepage content:", error)
-      return { hero_images: [], sections: [] }
-    }
-  }
-
   const formatDate = (dateString?: string) => {
     if (!dateString) return "Expected Soon"
     return new Date(dateString).toLocaleDateString("en-US", {
@@ -143,6 +132,7 @@ export function HomePage() {
             >
               <HeroImageGallery 
                 images={heroImages.map(img => img.image_url)}
+                placeholders={heroImages.map(img => img.image_meta)}
                 alt="Double Js Doodles Hero"
                 autoplay={true}
                 autoplayInterval={5000}
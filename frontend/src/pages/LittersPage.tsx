@@ -1,5 +1,6 @@
 import * as React from "react"
 import { useState, useEffect } from "react"
+import { useNavigate, useParams } from "react-router-dom"
 import { Button } from "../components/ui/button"
 import {
   Card,
@@ -12,6 +13,9 @@ import { Badge } from "../components/ui/badge"
 import { api, type Litter, type Puppy } from "../lib/api"
 
 export function LittersPage() {
+  // /litters/:litterId shows just that litter
+  const { litterId } = useParams<{ litterId?: string }>()
+  const navigate = useNavigate()
   const [litters, setLitters] = useState<Litter[]>([])
   const [loading, setLoading] = useState(true)
   const [filterStatus, setFilterStatus] = useState<'all' | 'available' | 'reserved' | 'sold'>('all')
@@ -19,7 +23,7 @@ export function LittersPage() {
   useEffect(() => {
     const fetchLitters = async () => {
       try {
-        const litterData = await api.getLitters()
+        const litterData = litterId ? [await api.getLitter(litterId)] : await api.getLitters()
         setLitters(litterData)
       } catch (error) {
         console.error("Failed to fetch litters:", error)
@@ -28,8 +32,9 @@ export function LittersPage() {
       }
     }
 
+    setLoading(true)
     fetchLitters()
-  }, [])
+  }, [litterId])
 
   const formatDate = (dateString?: string) => {
     if (!dateString) return "TBD"
@@ -207,9 +212,14 @@ export function LittersPage() {
                                 {puppy.status === 'reserved' ? 'Reserved' : 'No Longer Available'}
                               </Button>
                             )}
-                            {puppy.images.length > 1 && (
-                              <Button variant="outline" size="sm" className="w-full">
-                                View More Photos ({puppy.images.length})
+                            {puppy.id && (
+                              <Button
+                                variant="outline"
+                                size="sm"
+                                className="w-full"
+                                onClick={() => navigate(`/puppies/${puppy.id}`)}
+                              >
+                                {puppy.images.length > 1 ? `View More Photos (${puppy.images.length})` : 'View Details'}
                               </Button>
                             )}
                           </div>
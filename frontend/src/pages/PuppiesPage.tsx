@@ -0,0 +1,208 @@
+import * as React from "react"
+import { useState, useEffect } from "react"
+import { useNavigate } from "react-router-dom"
+import { Button } from "../components/ui/button"
+import {
+  Card,
+  CardContent,
+  CardDescription,
+  CardHeader,
+  CardTitle,
+} from "../components/ui/card"
+import { Badge } from "../components/ui/badge"
+import { api, type Puppy, type PuppySearchResult } from "../lib/api"
+
+const PAGE_SIZE = 24
+
+type StatusFilter = 'all' | Puppy['status']
+
+export function PuppiesPage() {
+  const navigate = useNavigate()
+  const [result, setResult] = useState<PuppySearchResult | null>(null)
+  const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [filterStatus, setFilterStatus] = useState<StatusFilter>('all')
+  const [breed, setBreed] = useState<string | null>(null)
+
+  // Filtering, counting and paging all happen server side; each facet's counts ignore its own filter
+  useEffect(() => {
+    const fetchPuppies = async () => {
+      setLoading(true)
+      try {
+        setResult(await api.searchPuppies({
+          status: filterStatus === 'all' ? undefined : [filterStatus],
+          breed: breed ? [breed] : undefined,
+          limit: PAGE_SIZE,
+        }))
+      } catch (error) {
+        console.error("Failed to fetch puppies:", error)
+      } finally {
+        setLoading(false)
+      }
+    }
+
+    fetchPuppies()
+  }, [filterStatus, breed])
+
+  const loadMore = async () => {
+    if (!result) return
+    setLoadingMore(true)
+    try {
+      const next = await api.searchPuppies({
+        status: filterStatus === 'all' ? undefined : [filterStatus],
+        breed: breed ? [breed] : undefined,
+        skip: result.puppies.length,
+        limit: PAGE_SIZE,
+      })
+      setResult({ ...next, puppies: [...result.puppies, ...next.puppies] })
+    } catch (error) {
+      console.error("Failed to load more puppies:", error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const formatDate = (dateString?: string) => {
+    if (!dateString) return "TBD"
+    return new Date(dateString).toLocaleDateString("en-US", {
+      month: "long",
+      day: "numeric",
+      year: "numeric",
+    })
+  }
+
+  const getStatusColor = (status: string) => {
+    switch (status) {
+      case 'available':
+        return 'glass-button-primary text-white'
+      default:
+        return 'glass-button text-muted-foreground'
+    }
+  }
+
+  const facetCount = (facet: 'status' | 'breed', value: string) =>
+    result?.facets[facet]?.find((entry) => entry.value === value)?.count
+
+  return (
+    <div className="container mx-auto px-4 py-8">
+      {/* Header */}
+      <section className="text-center mb-12">
+        <h1 className="text-4xl md:text-6xl font-bold mb-6">Our Puppies</h1>
+        <p className="text-xl text-muted-foreground max-w-3xl mx-auto">
+          Browse every puppy across our litters and find the one that fits your family.
+        </p>
+      </section>
+
+      {/* Filter Buttons */}
+      <div className="flex flex-wrap justify-center gap-2 mb-4">
+        {(['all', 'available', 'reserved', 'sold'] as const).map((status) => (
+          <Button
+            key={status}
+            variant={filterStatus === status ? "default" : "outline"}
+            size="sm"
+            onClick={() => setFilterStatus(status)}
+            className={`capitalize ${filterStatus === status ? 'glass-button-primary' : 'glass-button'}`}
+          >
+            {status === 'all' ? 'All Puppies' : `${status} Puppies`}
+            {status !== 'all' && ` (${facetCount('status', status) ?? 0})`}
+          </Button>
+        ))}
+      </div>
+      {result && (breed !== null || result.facets.breed.length > 1) && (
+        <div className="flex flex-wrap justify-center gap-2 mb-8">
+          <Button
+            variant={breed === null ? "default" : "outline"}
+            size="sm"
+            onClick={() => setBreed(null)}
+            className={breed === null ? 'glass-button-primary' : 'glass-button'}
+          >
+            All Breeds
+          </Button>
+          {result.facets.breed.map((entry) => (
+            <Button
+              key={entry.value}
+              variant={breed === entry.value ? "default" : "outline"}
+              size="sm"
+              onClick={() => setBreed(entry.value)}
+              className={breed === entry.value ? 'glass-button-primary' : 'glass-button'}
+            >
+              {entry.value} ({entry.count})
+            </Button>
+          ))}
+        </div>
+      )}
+
+      {loading ? (
+        <div className="flex justify-center items-center py-20">
+          <div className="w-16 h-16 border-4 border-blue-600 border-t-transparent rounded-full animate-spin"></div>
+        </div>
+      ) : result && result.puppies.length > 0 ? (
+        <>
+          <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
+            {result.puppies.map((puppy) => (
+              <Card key={puppy.id} className="overflow-hidden hover:shadow-lg transition-shadow">
+                <div className="h-48 bg-gradient-to-br from-yellow-100 to-orange-100 flex items-center justify-center">
+                  {puppy.images.length > 0 ? (
+                    <img
+                      src={puppy.images[0]}
+                      alt={puppy.name}
+                      loading="lazy"
+                      className="w-full h-full object-cover"
+                    />
+                  ) : (
+                    <p className="text-muted-foreground">Photo Coming Soon</p>
+                  )}
+                </div>
+                <CardHeader>
+                  <div className="flex items-center justify-between">
+                    <CardTitle className="text-lg">{puppy.name}</CardTitle>
+                    <Badge className={getStatusColor(puppy.status)}>
+                      {puppy.status}
+                    </Badge>
+                  </div>
+                  <CardDescription>
+                    {puppy.gender} • {puppy.color} • {puppy.litter.generation} {puppy.litter.breed}
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <p className="text-sm">
+                    <strong>Born:</strong> {formatDate(puppy.birth_date)}
+                  </p>
+                  <Button
+                    variant="outline"
+                    size="sm"
+                    className="w-full mt-4"
+                    onClick={() => navigate(`/puppies/${puppy.id}`)}
+                  >
+                    View Details
+                  </Button>
+                </CardContent>
+              </Card>
+            ))}
+          </div>
+          {result.puppies.length < result.total && (
+            <div className="flex justify-center mt-8">
+              <Button variant="outline" onClick={loadMore} disabled={loadingMore} className="glass-button">
+                {loadingMore ? 'Loading...' : `Show More (${result.total - result.puppies.length} more)`}
+              </Button>
+            </div>
+          )}
+        </>
+      ) : (
+        <Card className="breeder-card shadow-glass text-center py-16">
+          <CardHeader>
+            <CardTitle className="text-2xl text-muted-foreground">No Puppies Found</CardTitle>
+            <CardDescription>
+              No {filterStatus === 'all' ? '' : filterStatus} puppies right now. Check back soon for updates!
+            </CardDescription>
+          </CardHeader>
+          <CardContent>
+            <Button onClick={() => window.location.href = '/contact'} className="glass-button-primary shadow-glass">
+              Join Our Waiting List
+            </Button>
+          </CardContent>
+        </Card>
+      )}
+    </div>
+  )
+}
@@ -1,5 +1,5 @@
 import * as React from "react"
-import { useParams } from "react-router-dom"
+import { useNavigate, useParams } from "react-router-dom"
 import { Button } from "../components/ui/button"
 import {
   Card,
@@ -11,10 +11,12 @@ import {
 import { Badge } from "../components/ui/badge"
 import { CalendarDays, Heart, Mail, Phone, User, Weight } from "lucide-react"
 import { ContactForm } from "../components/ContactForm"
+import { PuppyVideo } from "../components/ui/puppy-video"
 import { api, type Puppy, type Litter } from "../lib/api"
 
 export function PuppyPage() {
-  const { litterId, puppyId } = useParams<{ litterId: string; puppyId: string }>()
+  const { puppyId } = useParams<{ puppyId: string }>()
+  const navigate = useNavigate()
   const [litter, setLitter] = React.useState<Litter | null>(null)
   const [puppy, setPuppy] = React.useState<Puppy | null>(null)
   const [loading, setLoading] = React.useState(true)
@@ -22,10 +24,11 @@ export function PuppyPage() {
 
   React.useEffect(() => {
     const fetchPuppyData = async () => {
-      if (!litterId || !puppyId) return
+      if (!puppyId) return
 
       try {
-        const litterData = await api.getLitter(litterId)
+        const { litter: puppyLitter } = await api.getPuppy(puppyId)
+        const litterData = await api.getLitter(puppyLitter.id)
         const puppyData = litterData.puppies.find(p => p.id === puppyId)
         
         setLitter(litterData)
@@ -38,7 +41,7 @@ export function PuppyPage() {
     }
 
     fetchPuppyData()
-  }, [litterId, puppyId])
+  }, [puppyId])
 
   if (loading) {
     return (
@@ -149,6 +152,20 @@ export function PuppyPage() {
                 )}
               </div>
 
+              {/* Puppy Videos */}
+              {puppy.videos && puppy.videos.length > 0 && (
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-4 mb-6">
+                  {puppy.videos.map((video, index) => (
+                    <PuppyVideo
+                      key={video}
+                      src={video}
+                      asset={puppy.video_assets?.find(asset => asset.source_url === video)}
+                      title={`${puppy.name} - Video ${index + 1}`}
+                    />
+                  ))}
+                </div>
+              )}
+
               {/* Puppy Details */}
               <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
                 <div className="flex items-center gap-2">
@@ -277,7 +294,7 @@ export function PuppyPage() {
                 {litter.puppies.length} puppies in this litter
               </p>
               
-              <Button variant="outline" className="w-full">
+              <Button variant="outline" className="w-full" onClick={() => navigate(`/litters/${litter.id}`)}>
                 View All Litter Mates
               </Button>
             </CardContent>